@@ -1,6 +1,54 @@
-def main():
-    numeros = realizar_inputs()
-    exibir_resultados(numeros)
+import argparse
+import sys
+
+import numpy as np
+
+# Quantidade padrão de números processados por bloco no modo em lote
+TAMANHO_BLOCO = 100_000
+
+# Casas decimais das colunas arredondadas no modo em lote
+CASAS_DECIMAIS = (1, 2)
+
+# Bases numéricas do modo em lote: (nome da coluna, função do Python)
+BASES = (("binario", bin), ("octal", oct), ("hexadecimal", hex))
+
+# Limites (exclusivo no topo) dos valores que cabem em int64
+_MINIMO_INT64 = -2.0 ** 63
+_MAXIMO_INT64 = 2.0 ** 63
+
+
+def main(argv=None):
+    args = interpretar_argumentos(argv)
+    if args.arquivo is None:
+        numeros = realizar_inputs()
+        exibir_resultados(numeros)
+        return
+
+    entrada = sys.stdin if args.arquivo == "-" else open(args.arquivo, encoding="utf-8")
+    saida = sys.stdout if args.saida == "-" else open(args.saida, "w", encoding="utf-8")
+    try:
+        quantidade, soma = processar_em_lote(entrada, saida, args.bloco)
+    finally:
+        for arquivo in (entrada, saida):
+            if arquivo not in (sys.stdin, sys.stdout):
+                arquivo.close()
+    print(f"Números processados: {quantidade}", file=sys.stderr)
+    print(f"Somatório dos números (arredondado para 2 casas decimais): {soma}", file=sys.stderr)
+
+
+def interpretar_argumentos(argv=None):
+    """Lê os argumentos da linha de comando (sem argumentos: modo interativo)."""
+    parser = argparse.ArgumentParser(description="Transformações de uma lista de números.")
+    parser.add_argument("arquivo", nargs="?", default=None,
+                        help="Arquivo com números separados por espaço/linha; '-' para a entrada padrão.")
+    parser.add_argument("--saida", default="-",
+                        help="Arquivo TSV de saída (padrão: saída padrão).")
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO,
+                        help="Quantidade de números processados por bloco.")
+    args = parser.parse_args(argv)
+    if args.bloco <= 0:
+        parser.error("--bloco deve ser um número positivo.")
+    return args
 
 
 def realizar_inputs():
@@ -67,5 +115,99 @@ def exibir_resultados(numeros):
     print("Números convertidos para hexadecimal:", converter_hexadecimal(numeros_int))
 
 
+def ler_numeros_em_blocos(arquivo, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Lê números separados por espaços/quebras de linha de um arquivo aberto
+    (ou sys.stdin), gerando arrays NumPy de até `tamanho_bloco` números.
+    """
+    pendente = ""
+    buffer = []
+    quantidade = 0
+    # Cada número ocupa ao menos 2 caracteres (dígito + separador)
+    for texto in iter(lambda: arquivo.read(2 * tamanho_bloco), ""):
+        tokens = (pendente + texto).split()
+        # O último token pode ter sido cortado no meio pela leitura
+        pendente = tokens.pop() if tokens and not texto[-1].isspace() else ""
+        buffer.append(tokens)
+        quantidade += len(tokens)
+        if quantidade >= tamanho_bloco:
+            yield np.array([t for parte in buffer for t in parte], dtype=np.float64)
+            buffer, quantidade = [], 0
+    if pendente:
+        buffer.append([pendente])
+        quantidade += 1
+    if quantidade:
+        yield np.array([t for parte in buffer for t in parte], dtype=np.float64)
+
+
+def calcular_visoes_lote(numeros, deslocamento=0):
+    """
+    Calcula todas as transformações de um bloco de números de uma só vez.
+
+    `deslocamento` é a posição do primeiro número do bloco na sequência
+    completa, para que a paridade das posições continue correta entre blocos.
+    Os inteiros usam np.rint (meio para o par, como round()). As casas
+    decimais usam np.round, que arredonda x * 10**casas em ponto flutuante e
+    pode diferir de round() no último dígito de valores sem representação
+    binária exata (ex.: 2.675 -> 2.68).
+    Retorna um dicionário de arrays.
+    Levanta ValueError para NaN e OverflowError para infinitos (como round())
+    e para valores fora do intervalo de int64.
+    """
+    numeros = np.asarray(numeros, dtype=np.float64)
+    inicio_par = deslocamento % 2
+    arredondados = np.rint(numeros)
+    validos = (arredondados >= _MINIMO_INT64) & (arredondados < _MAXIMO_INT64)
+    if not validos.all():
+        invalido = float(numeros[np.argmin(validos)])
+        if np.isnan(invalido):
+            raise ValueError("cannot convert float NaN to integer")
+        if np.isinf(invalido):
+            raise OverflowError("cannot convert float infinity to integer")
+        raise OverflowError(f"{invalido!r} está fora do intervalo de inteiros de 64 bits")
+
+    visoes = {
+        "pares": numeros[inicio_par::2],
+        "impares": numeros[1 - inicio_par::2],
+        "soma": numeros.sum(),
+        "inteiros": arredondados.astype(np.int64),
+    }
+    for casas in CASAS_DECIMAIS:
+        visoes[f"arredondados_{casas}"] = np.round(numeros, casas)
+    return visoes
+
+
+def processar_em_lote(entrada, saida, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Lê os números de `entrada` em blocos e grava em `saida` (TSV) uma linha
+    por número com todas as transformações, sem manter a sequência inteira
+    em memória. Retorna (quantidade de números, somatório com 2 casas).
+    """
+    colunas = (["posicao", "paridade", "valor"]
+               + [f"arredondado_{casas}" for casas in CASAS_DECIMAIS]
+               + ["inteiro"] + [nome for nome, _ in BASES])
+    saida.write("\t".join(colunas) + "\n")
+
+    quantidade = 0
+    soma = 0.0
+    for numeros in ler_numeros_em_blocos(entrada, tamanho_bloco):
+        # Os cálculos são vetorizados; já a formatação do texto usa repr/bin/
+        # oct/hex sobre listas, que gasta menos memória e tempo do que os
+        # arrays de texto de largura fixa do NumPy
+        visoes = calcular_visoes_lote(numeros, quantidade)
+        inteiros = visoes["inteiros"].tolist()
+        paridade = ("par", "impar") if quantidade % 2 == 0 else ("impar", "par")
+        campos = ([map(str, range(quantidade, quantidade + numeros.size)),
+                   (paridade[i % 2] for i in range(numeros.size)),
+                   map(repr, numeros.tolist())]
+                  + [map(repr, visoes[f"arredondados_{casas}"].tolist()) for casas in CASAS_DECIMAIS]
+                  + [map(str, inteiros)] + [map(funcao, inteiros) for _, funcao in BASES])
+        saida.write("".join("\t".join(linha) + "\n" for linha in zip(*campos)))
+
+        quantidade += numeros.size
+        soma += visoes["soma"]
+    return quantidade, round(soma, 2)
+
+
 if __name__ == "__main__":
     main()
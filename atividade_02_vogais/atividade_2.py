@@ -1,11 +1,66 @@
+import argparse
+import codecs
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
 # Conjunto imutável de vogais (garante que não será modificado)
 VOGAIS = frozenset(['a', 'e', 'i', 'o', 'u'])
 
+# Ordem fixa das vogais nos resultados por vogal
+ORDEM_VOGAIS = ('a', 'e', 'i', 'o', 'u')
+
+# Vogais acentuadas (e maiúsculas) e a vogal base em que são contadas
+VOGAIS_EQUIVALENTES = {
+    'a': 'aáàâãäAÁÀÂÃÄ',
+    'e': 'eéèêëEÉÈÊË',
+    'i': 'iíìîïIÍÌÎÏ',
+    'o': 'oóòôõöOÓÒÔÕÖ',
+    'u': 'uúùûüUÚÙÛÜ',
+}
+
+# Tabela para str.translate: converte cada variante na vogal base
+TABELA_VOGAIS = str.maketrans({
+    variante: base
+    for base, variantes in VOGAIS_EQUIVALENTES.items()
+    for variante in variantes
+})
+
+# Tamanho padrão dos blocos lidos no modo streaming (1 MiB)
+TAMANHO_BLOCO = 1024 * 1024
+
 
-def main():
-    texto = capturar_texto()
-    total_vogais = contar_vogais(texto)
-    mostrar_resultado(total_vogais)
+def main(argv=None):
+    args = interpretar_argumentos(argv)
+    if args.arquivo is None:
+        texto = capturar_texto()
+        total_vogais = contar_vogais(texto)
+        mostrar_resultado(total_vogais)
+        return
+
+    if args.arquivo == "-":
+        contagem = contar_vogais_stream(sys.stdin, args.bloco)
+    else:
+        contagem = contar_vogais_arquivo(args.arquivo, args.processos, args.bloco)
+    mostrar_resultado_por_vogal(contagem)
+
+
+def interpretar_argumentos(argv=None):
+    """
+    Lê os argumentos da linha de comando.
+    Sem argumentos, o programa usa o modo interativo original.
+    """
+    parser = argparse.ArgumentParser(description="Contagem de vogais em texto.")
+    parser.add_argument("arquivo", nargs="?", default=None,
+                        help="Arquivo de texto (UTF-8) a ser lido; use '-' para a entrada padrão.")
+    parser.add_argument("--processos", type=int, default=1,
+                        help="Processos usados para dividir o arquivo (padrão: 1).")
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO,
+                        help="Tamanho dos blocos lidos, em bytes/caracteres.")
+    args = parser.parse_args(argv)
+    if args.bloco <= 0:
+        parser.error("--bloco deve ser um número positivo.")
+    return args
 
 
 def capturar_texto():
@@ -27,7 +82,52 @@ def contar_vogais(texto):
     """
     Conta o total de vogais no texto e retorna um inteiro.
     """
-    return sum(1 for caractere in texto.lower() if caractere in VOGAIS)
+    texto = texto.lower()
+    return sum(texto.count(vogal) for vogal in VOGAIS)
+
+
+def contar_vogais_por_tipo(texto):
+    """
+    Conta cada vogal no texto, incluindo as acentuadas (á, ã, ê, ...).
+    A contagem usa operações em bloco (str.translate e str.count).
+    Retorna um dicionário {vogal: quantidade}.
+    """
+    normalizado = texto.translate(TABELA_VOGAIS)
+    return {vogal: normalizado.count(vogal) for vogal in ORDEM_VOGAIS}
+
+
+def contar_vogais_stream(arquivo, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Conta as vogais de um arquivo de texto aberto (ou sys.stdin) lendo-o em
+    blocos de tamanho fixo, com uso de memória constante.
+    Retorna um dicionário {vogal: quantidade}.
+    """
+    contagem = dict.fromkeys(ORDEM_VOGAIS, 0)
+    for bloco in iter(lambda: arquivo.read(tamanho_bloco), ""):
+        _somar_contagem(contagem, contar_vogais_por_tipo(bloco))
+    return contagem
+
+
+def contar_vogais_arquivo(caminho, processos=1, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Conta as vogais de um arquivo UTF-8 em blocos, opcionalmente dividindo-o
+    em faixas de bytes processadas em paralelo por um pool de processos.
+    Retorna um dicionário {vogal: quantidade}.
+    """
+    tamanho = os.path.getsize(caminho)
+    if processos <= 1 or tamanho < 2 * tamanho_bloco:
+        return _contar_faixa(caminho, 0, tamanho, tamanho_bloco)
+
+    limites = _dividir_em_faixas(caminho, tamanho, processos)
+    contagem = dict.fromkeys(ORDEM_VOGAIS, 0)
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        parciais = executor.map(
+            _contar_faixa,
+            [caminho] * processos, limites[:-1], limites[1:], [tamanho_bloco] * processos
+        )
+        for parcial in parciais:
+            _somar_contagem(contagem, parcial)
+    return contagem
 
 
 def mostrar_resultado(total):
@@ -38,5 +138,53 @@ def mostrar_resultado(total):
     print(f"TOTAL DE VOGAIS: {total}")
 
 
+def mostrar_resultado_por_vogal(contagem):
+    """
+    Exibe a quantidade de cada vogal e o total.
+    """
+    print("\n=== Resultado da Contagem de Vogais ===")
+    for vogal in ORDEM_VOGAIS:
+        print(f"{vogal.upper()}: {contagem[vogal]}")
+    print(f"TOTAL DE VOGAIS: {sum(contagem.values())}")
+
+
+def _contar_faixa(caminho, inicio, fim, tamanho_bloco):
+    # Decodificador incremental: um caractere acentuado (2 bytes em UTF-8)
+    # dividido entre dois blocos é montado corretamente.
+    decodificador = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    contagem = dict.fromkeys(ORDEM_VOGAIS, 0)
+    with open(caminho, mode="rb") as arquivo:
+        arquivo.seek(inicio)
+        restante = fim - inicio
+        while restante > 0:
+            dados = arquivo.read(min(tamanho_bloco, restante))
+            if not dados:
+                break
+            restante -= len(dados)
+            _somar_contagem(contagem, contar_vogais_por_tipo(decodificador.decode(dados)))
+    _somar_contagem(contagem, contar_vogais_por_tipo(decodificador.decode(b"", final=True)))
+    return contagem
+
+
+def _dividir_em_faixas(caminho, tamanho, partes):
+    # Ajusta cada limite para o início de um caractere UTF-8 (bytes de
+    # continuação têm a forma 0b10xxxxxx), para nenhuma faixa cortar um.
+    limites = [0]
+    with open(caminho, mode="rb") as arquivo:
+        for i in range(1, partes):
+            posicao = max(tamanho * i // partes, limites[-1])
+            arquivo.seek(posicao)
+            while posicao < tamanho and (arquivo.read(1)[0] & 0xC0) == 0x80:
+                posicao += 1
+            limites.append(posicao)
+    limites.append(tamanho)
+    return limites
+
+
+def _somar_contagem(total, parcial):
+    for vogal, quantidade in parcial.items():
+        total[vogal] += quantidade
+
+
 if __name__ == "__main__":
     main()
@@ -1,9 +1,24 @@
 # analise_climatica_lib.py
 
-import openpyxl
-import matplotlib.pyplot as plt
+from array import array
 
-def gerar_arquivo_txt_de_excel(arquivo_excel, nome_planilha, nome_arquivo_saida):
+import _caminho  # noqa: F401  (raiz do projeto no sys.path)
+
+from clima_comum import exportacao
+from clima_comum.cache_binario import abrir_cache_binario, eh_cache_binario
+from clima_comum.decimacao import PONTOS_POR_GRAFICO, decimar_serie
+from clima_comum.importacao_tardia import modulo_tardio
+from clima_comum.instrumentacao import instrumentar, medir
+from clima_comum.registro_estacao import TIPO_VALORES, RegistroEstacao
+
+# Importado só no primeiro gráfico: ler TXT ou consultar médias não carrega o matplotlib
+plt = modulo_tardio("matplotlib.pyplot")
+
+# Quantos rótulos de mês aparecem no eixo X de uma série decimada
+ROTULOS_EIXO_X = 12
+
+@instrumentar
+def gerar_arquivo_txt_de_excel(arquivo_excel, nome_planilha, nome_arquivo_saida, formato="txt", incremental=False):
     """
     Lê dados climáticos de uma planilha Excel e os salva em um arquivo de texto (TXT).
 
@@ -12,43 +27,55 @@ def gerar_arquivo_txt_de_excel(arquivo_excel, nome_planilha, nome_arquivo_saida)
     separadas por tabulação no arquivo de saída.
 
     Args:
-        arquivo_excel (str): O caminho para o arquivo .xlsx de entrada.
+        arquivo_excel (str | dict): O caminho para o arquivo .xlsx de entrada
+                                    ou as abas já carregadas por
+                                    carregador.carregar_planilhas_climaticas.
         nome_planilha (str): O nome da aba na planilha que contém os dados.
         nome_arquivo_saida (str): O nome do arquivo .txt a ser gerado.
+        formato (str): "txt" (padrão) ou "binario" para gerar o cache colunar
+                       mapeável em memória, lido sem parsing pelas funções de
+                       carregamento.
+        incremental (bool): Se True, compara a aba com o manifesto da pasta
+                            de saída (ver exportacao.exportar_planilhas) e só
+                            regrava o arquivo (atomicamente) se ele mudou.
+
+    Returns:
+        exportacao.ResultadoExportacao | None: Com incremental=True, o que
+               foi feito com o arquivo (situacao e linhas_gravadas).
     """
-    workbook = openpyxl.load_workbook(arquivo_excel)
-    planilha = workbook[nome_planilha]
-
-    # Extrai os dados das linhas corretas
-    linha_meses = [celula.value for celula in planilha[4][1:]]
-    linha_media = [celula.value for celula in planilha[5][1:]]
-    linha_minima = [celula.value for celula in planilha[6][1:]]
-    linha_maxima = [celula.value for celula in planilha[7][1:]]
-
-    with open(nome_arquivo_saida, mode='w', encoding='utf-8') as arquivo_txt:
-        arquivo_txt.write("Mes\tMinima\tMaxima\tMedia\n")
-        for i in range(len(linha_meses)):
-            mes = linha_meses[i]
-            minima = linha_minima[i]
-            maxima = linha_maxima[i]
-            media = linha_media[i]
-            arquivo_txt.write(f"{mes}\t{minima}\t{maxima}\t{media}\n")
-
-def ler_dados_climaticos_de_txt(caminho_arquivo_txt):
+    return exportacao.exportar_planilha(arquivo_excel, nome_planilha, nome_arquivo_saida, formato, incremental)
+
+@instrumentar
+def ler_dados_climaticos_de_txt(caminho_arquivo_txt, compacto=False):
     """
     Lê o arquivo de texto com dados climáticos e retorna listas com os dados.
 
+    Arquivos no formato de cache binário (formato="binario" na geração) são
+    detectados pela assinatura e lidos via memory map, sem parsing de texto.
+
     Args:
-        caminho_arquivo_txt (str): O caminho para o arquivo .txt de entrada.
+        caminho_arquivo_txt (str): O caminho para o arquivo .txt (ou cache
+                                   binário) de entrada.
+        compacto (bool): Se True, retorna um RegistroEstacao (colunas float32
+                         e meses internados), que ocupa bem menos memória e
+                         desempacota nas mesmas quatro colunas. Indicado para
+                         manter muitas estações em memória.
 
     Returns:
-        tuple: Uma tupla contendo quatro listas: (meses, temperaturas_minima,
-               temperaturas_maxima, temperaturas_media).
+        tuple | RegistroEstacao: Uma tupla contendo quatro listas: (meses,
+               temperaturas_minima, temperaturas_maxima, temperaturas_media).
     """
+    if eh_cache_binario(caminho_arquivo_txt):
+        meses, _, valores = abrir_cache_binario(caminho_arquivo_txt)
+        if compacto:
+            return RegistroEstacao(meses, *valores.T)
+        minimas, maximas, medias = valores.T.tolist()
+        return meses, minimas, maximas, medias
+
     meses = []
-    temperaturas_minima = []
-    temperaturas_maxima = []
-    temperaturas_media = []
+    # No modo compacto os valores já vão direto para colunas float32
+    colunas = [array(TIPO_VALORES) for _ in range(3)] if compacto else [[], [], []]
+    temperaturas_minima, temperaturas_maxima, temperaturas_media = colunas
 
     with open(caminho_arquivo_txt, mode='r', encoding='utf-8') as arquivo:
         next(arquivo)  # Pula o cabeçalho
@@ -58,9 +85,12 @@ def ler_dados_climaticos_de_txt(caminho_arquivo_txt):
             temperaturas_minima.append(float(partes[1]))
             temperaturas_maxima.append(float(partes[2]))
             temperaturas_media.append(float(partes[3]))
-            
+
+    if compacto:
+        return RegistroEstacao(meses, temperaturas_minima, temperaturas_maxima, temperaturas_media)
     return meses, temperaturas_minima, temperaturas_maxima, temperaturas_media
 
+@instrumentar
 def criar_dicionario_climatico(meses, minimas, maximas, medias):
     """
     Cria um dicionário de dados climáticos a partir de listas.
@@ -72,7 +102,10 @@ def criar_dicionario_climatico(meses, minimas, maximas, medias):
         medias (list): Lista com as temperaturas médias.
 
     Returns:
-        dict: Um dicionário contendo os dados climáticos organizados.
+        dict: Um dicionário contendo os dados climáticos organizados. Para
+              muitas estações, prefira RegistroEstacao (ver
+              ler_dados_climaticos_de_txt(compacto=True)), que aceita as
+              mesmas chaves.
     """
     dados_climaticos_dict = {
         "mes": meses,
@@ -82,13 +115,22 @@ def criar_dicionario_climatico(meses, minimas, maximas, medias):
     }
     return dados_climaticos_dict
 
+@instrumentar
 def obter_temp_media_mes(meses, medias, mes_desejado):
     """
     Obtém a temperatura média de um mês específico.
 
+    Para muitas consultas, monte uma vez um IndiceMensal
+    (IndiceMensal.de_listas(meses, minimas, maximas, medias)) e passe-o no
+    lugar de `meses`: a busca passa a ser O(1) e aceita nomes, números ou
+    datas, em vez de percorrer a lista a cada chamada.
+
     Args:
-        meses (list): Lista com os nomes dos meses.
-        medias (list): Lista com as temperaturas médias.
+        meses (list | IndiceMensal | RegistroEstacao): Lista com os nomes dos
+                                     meses, um índice já montado ou o
+                                     registro compacto da estação.
+        medias (list): Lista com as temperaturas médias (ignorada quando
+                       `meses` é um IndiceMensal ou RegistroEstacao).
         mes_desejado (str): O nome do mês para o qual a temperatura é desejada.
 
     Returns:
@@ -97,32 +139,68 @@ def obter_temp_media_mes(meses, medias, mes_desejado):
     Raises:
         ValueError: Se o mês não for encontrado nos dados.
     """
+    if hasattr(meses, "consultar"):  # IndiceMensal ou RegistroEstacao
+        return meses.consultar(mes_desejado)
     try:
         indice = meses.index(mes_desejado)
         return medias[indice]
     except ValueError:
         raise ValueError(f"O mês de '{mes_desejado}' não foi encontrado nos dados.")
 
-def plotar_grafico_temperaturas(meses, minimas, maximas, medias):
+@instrumentar
+def plotar_grafico_temperaturas(meses, minimas, maximas, medias, caminho_saida=None, mostrar=True,
+                                pontos_max=PONTOS_POR_GRAFICO, metodo_decimacao="minmax"):
     """
     Gera e exibe um gráfico cartesiano das temperaturas mensais.
 
+    As colunas podem ser listas ou arrays; um RegistroEstacao é passado
+    desempacotado: plotar_grafico_temperaturas(*registro).
+
+    Séries com mais de `pontos_max` meses (ex.: décadas de dados) são
+    decimadas antes de chegar ao matplotlib (ver clima_comum.decimacao) e
+    desenhadas sem marcadores, com as linhas rasterizadas e só alguns
+    rótulos no eixo X, de modo que o tempo de desenho e o tamanho do arquivo
+    não crescem com o comprimento da série.
+
     Args:
         meses (list): Lista com os nomes dos meses para o eixo X.
         minimas (list): Lista com as temperaturas mínimas para plotagem.
         maximas (list): Lista com as temperaturas máximas para plotagem.
         medias (list): Lista com as temperaturas médias para plotagem.
+        caminho_saida (str, optional): Se informado, salva o gráfico neste arquivo.
+        mostrar (bool): Se True, exibe o gráfico com plt.show(); em ambos os
+                        casos a figura é fechada no final para liberar memória.
+        pontos_max (int): O número máximo de pontos desenhados por linha.
+        metodo_decimacao (str): "minmax" (preserva os extremos) ou "lttb".
     """
-    plt.figure(figsize=(12, 7))
-    plt.plot(meses, minimas, marker='o', linestyle='-', label='Temperatura Mínima (°C)')
-    plt.plot(meses, maximas, marker='o', linestyle='-', label='Temperatura Máxima (°C)')
-    plt.plot(meses, medias, marker='o', linestyle='--', label='Temperatura Média (°C)')
+    series = (
+        (minimas, '-', 'Temperatura Mínima (°C)'),
+        (maximas, '-', 'Temperatura Máxima (°C)'),
+        (medias, '--', 'Temperatura Média (°C)'),
+    )
+    fig = plt.figure(figsize=(12, 7))
+    if len(meses) <= pontos_max:
+        for valores, estilo, rotulo in series:
+            plt.plot(meses, valores, marker='o', linestyle=estilo, label=rotulo)
+        plt.xticks(rotation=45)
+    else:
+        # O eixo X passa a ser a posição do mês, com ROTULOS_EIXO_X rótulos
+        for valores, estilo, rotulo in series:
+            posicoes, decimados = decimar_serie(range(len(meses)), valores, pontos_max, metodo_decimacao)
+            plt.plot(posicoes, decimados, linestyle=estilo, linewidth=1, label=rotulo, rasterized=True)
+        passo = -(-len(meses) // ROTULOS_EIXO_X)
+        plt.xticks(range(0, len(meses), passo), list(meses)[::passo], rotation=45)
 
     plt.title('Variação de Temperatura Mensal em Macaé', fontsize=16)
     plt.xlabel('Mês', fontsize=12)
     plt.ylabel('Temperatura (°C)', fontsize=12)
-    plt.xticks(rotation=45)
     plt.grid(True, linestyle='--', alpha=0.6)
     plt.legend()
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+
+    if caminho_saida:
+        with medir("savefig"):
+            fig.savefig(caminho_saida, dpi=300)
+    if mostrar:
+        plt.show()
+    plt.close(fig)
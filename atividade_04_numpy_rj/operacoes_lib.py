@@ -1,8 +1,16 @@
 # numpy_operacoes_lib.py
-import openpyxl
-import numpy as np
+import _caminho  # noqa: F401  (raiz do projeto no sys.path)
 
-def gerar_arquivo_txt_com_mes(arquivo_excel, nome_planilha, nome_arquivo_saida):
+from clima_comum import exportacao
+from clima_comum.cache_binario import abrir_cache_binario, eh_cache_binario
+from clima_comum.estatisticas import resumir_metricas
+from clima_comum.importacao_tardia import modulo_tardio
+from clima_comum.instrumentacao import instrumentar, medir
+
+np = modulo_tardio("numpy")
+
+@instrumentar
+def gerar_arquivo_txt_com_mes(arquivo_excel, nome_planilha, nome_arquivo_saida, formato="txt", incremental=False):
     """
     Lê dados climáticos (incluindo meses) de uma planilha e os salva em um arquivo TXT.
 
@@ -10,59 +18,68 @@ def gerar_arquivo_txt_com_mes(arquivo_excel, nome_planilha, nome_arquivo_saida):
     para listas e depois as escreve em um arquivo de texto de 4 colunas.
 
     Args:
-        arquivo_excel (str): O caminho para o arquivo .xlsx de entrada.
+        arquivo_excel (str | dict): O caminho para o arquivo .xlsx de entrada
+                                    ou as abas já carregadas por
+                                    carregador.carregar_planilhas_climaticas.
         nome_planilha (str): O nome da aba na planilha que contém os dados.
         nome_arquivo_saida (str): O nome do arquivo .txt a ser gerado.
-    """
-    workbook = openpyxl.load_workbook(arquivo_excel)
-    planilha = workbook[nome_planilha]
-
-    # Extrai os dados para listas, incluindo os meses
-    linha_meses = [celula.value for celula in planilha[4][1:]]
-    linha_media = [celula.value for celula in planilha[5][1:]]
-    linha_minima = [celula.value for celula in planilha[6][1:]]
-    linha_maxima = [celula.value for celula in planilha[7][1:]]
+        formato (str): "txt" (padrão) ou "binario" para gerar o cache colunar
+                       mapeável em memória, lido sem parsing pelas funções de
+                       carregamento.
+        incremental (bool): Se True, compara a aba com o manifesto da pasta
+                            de saída (ver exportacao.exportar_planilhas) e só
+                            regrava o arquivo (atomicamente) se ele mudou.
 
-    with open(nome_arquivo_saida, mode='w', encoding='utf-8') as arquivo_txt:
-        arquivo_txt.write("Mes\tMinima\tMaxima\tMedia\n")
-        for i in range(len(linha_meses)):
-            mes = linha_meses[i]
-            minima = linha_minima[i]
-            maxima = linha_maxima[i]
-            media = linha_media[i]
-            arquivo_txt.write(f"{mes}\t{minima}\t{maxima}\t{media}\n")
+    Returns:
+        exportacao.ResultadoExportacao | None: Com incremental=True, o que
+               foi feito com o arquivo (situacao e linhas_gravadas).
+    """
+    return exportacao.exportar_planilha(arquivo_excel, nome_planilha, nome_arquivo_saida, formato, incremental)
 
+@instrumentar
 def carregar_dados_climaticos_numpy(caminho_arquivo_txt):
     """
     Carrega os dados climáticos de um arquivo de texto para um array NumPy.
 
     Replica a lógica original do notebook, usando np.loadtxt para carregar
     apenas as colunas numéricas, desempacotá-las e depois transpor o resultado
-    para obter o shape (12, 3).
+    para obter o shape (12, 3). Se o arquivo for um cache binário, os dados
+    são mapeados em memória (somente leitura) sem cópia nem parsing.
 
     Args:
-        caminho_arquivo_txt (str): O caminho para o arquivo .txt de entrada.
+        caminho_arquivo_txt (str): O caminho para o arquivo .txt (ou cache
+                                   binário) de entrada.
 
     Returns:
         numpy.ndarray: Um array NumPy com shape (12, 3) contendo as
                        temperaturas [minima, maxima, media].
     """
-    array = np.loadtxt(caminho_arquivo_txt, skiprows=1, usecols=(1, 2, 3), unpack=True)
+    if eh_cache_binario(caminho_arquivo_txt):
+        return abrir_cache_binario(caminho_arquivo_txt)[2]
+
+    with medir("numpy.loadtxt"):
+        array = np.loadtxt(caminho_arquivo_txt, skiprows=1, usecols=(1, 2, 3), unpack=True)
     array_transposed = array.T
     return array_transposed
 
+@instrumentar
 def analisar_temperatura_media(array_dados):
     """
     Encontra a ocorrência do máximo e mínimo valor na coluna de temperatura média.
 
+    Os extremos das três colunas saem de uma única redução
+    (estatisticas.resumir_metricas); valores ausentes (NaN) são ignorados.
+
     Args:
-        array_dados (numpy.ndarray): O array NumPy (12, 3) com os dados climáticos.
-                                     Espera-se que a coluna de índice 2 seja a de médias.
+        array_dados (numpy.ndarray | RegistroEstacao): O array NumPy (12, 3) com
+                                     os dados climáticos (ou o registro
+                                     compacto da estação). Espera-se que a
+                                     coluna de índice 2 seja a de médias.
 
     Returns:
         tuple: Uma tupla contendo (maior_media, menor_media).
     """
-    coluna_medias = array_dados[:, 2] # A coluna de médias é a de índice 2
-    maior_media = np.max(coluna_medias)
-    menor_media = np.min(coluna_medias)
-    return maior_media, menor_media
\ No newline at end of file
+    resumo = resumir_metricas(array_dados) # A coluna de médias é a de índice 2
+    maior_media = resumo.maximo[2]
+    menor_media = resumo.minimo[2]
+    return maior_media, menor_media
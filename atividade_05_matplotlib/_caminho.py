@@ -0,0 +1,19 @@
+# _caminho.py
+"""
+Torna o pacote compartilhado `clima_comum` (na raiz do projeto) importável
+quando os módulos desta pasta são usados diretamente (notebooks e CLIs).
+
+Cada módulo que importa `clima_comum` importa este antes, de forma explícita:
+
+    import _caminho  # noqa: F401
+
+Com a raiz do projeto no PYTHONPATH, ele não altera nada.
+"""
+
+import os
+import sys
+
+RAIZ_PROJETO = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+if RAIZ_PROJETO not in sys.path:
+    sys.path.insert(0, RAIZ_PROJETO)
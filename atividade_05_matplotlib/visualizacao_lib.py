@@ -1,14 +1,33 @@
 # matplotlib_visualizacao_lib.py
 
-import matplotlib.pyplot as plt
-import numpy as np
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 
+import _caminho  # noqa: F401  (raiz do projeto no sys.path)
+
+from clima_comum.arquivos import gravar_atomicamente
+from clima_comum.cache_binario import abrir_cache_binario, eh_cache_binario
+from clima_comum.decimacao import PONTOS_POR_GRAFICO, decimar_serie
+from clima_comum.importacao_tardia import modulo_tardio
+from clima_comum.instrumentacao import instrumentar, medir
+
+# NumPy e matplotlib só são importados no primeiro uso
+np = modulo_tardio("numpy")
+plt = modulo_tardio("matplotlib.pyplot")
+
+# Arquivo com a assinatura dos dados de cada gráfico já gerado
+MANIFESTO_GRAFICOS = ".manifesto_graficos.json"
+
+@instrumentar
 def carregar_dados_climaticos_txt(caminho_macae, caminho_rio):
     """
     Carrega os dados climáticos de dois arquivos de texto para arrays NumPy.
 
     Utiliza a função numpy.loadtxt para carregar as colunas de temperatura,
-    ignorando o cabeçalho e a primeira coluna de texto (meses).
+    ignorando o cabeçalho e a primeira coluna de texto (meses). Caches
+    binários (gerados com formato="binario") são mapeados em memória sem cópia.
 
     Args:
         caminho_macae (str): O caminho para o arquivo .txt de Macaé.
@@ -18,55 +37,80 @@ def carregar_dados_climaticos_txt(caminho_macae, caminho_rio):
         tuple: Uma tupla contendo dois arrays NumPy (dados_macae, dados_rio),
                cada um com shape (12, 3).
     """
-    df_macae = np.loadtxt(caminho_macae, skiprows=1, usecols=[1, 2, 3])
-    df_rio = np.loadtxt(caminho_rio, skiprows=1, usecols=[1, 2, 3])
+    df_macae = _carregar_temperaturas(caminho_macae)
+    df_rio = _carregar_temperaturas(caminho_rio)
     return df_macae, df_rio
 
-def plotar_grafico_temperaturas_cidade(meses, dados_cidade, nome_cidade):
+def _carregar_temperaturas(caminho):
+    if eh_cache_binario(caminho):
+        return abrir_cache_binario(caminho)[2]
+    with medir("numpy.loadtxt"):
+        return np.loadtxt(caminho, skiprows=1, usecols=[1, 2, 3])
+
+@instrumentar
+def plotar_grafico_temperaturas_cidade(meses, dados_cidade, nome_cidade, diretorio_saida=".", mostrar=True,
+                                       pontos_max=PONTOS_POR_GRAFICO, metodo_decimacao="minmax"):
     """
     Cria e salva um gráfico de linhas 2D das temperaturas de uma cidade.
 
     Plota as temperaturas mínima, máxima e média ao longo dos meses,
     com estilos de linha e marcadores específicos, e salva a figura em PNG.
+    Séries com mais de `pontos_max` pontos (ex.: décadas de dados diários,
+    com datas no eixo X) são decimadas antes de chegar ao matplotlib (ver
+    clima_comum.decimacao) e desenhadas sem marcadores, com as linhas
+    rasterizadas.
 
     Args:
         meses (numpy.ndarray): Um array com os meses (eixo X).
-        dados_cidade (numpy.ndarray): Array (12, 3) com as temperaturas
-                                      [min, max, media].
+        dados_cidade (numpy.ndarray | RegistroEstacao): Array (12, 3) com as
+                                      temperaturas [min, max, media] ou o
+                                      registro compacto da cidade.
         nome_cidade (str): O nome da cidade, usado no título e no nome do arquivo.
+        diretorio_saida (str): A pasta onde o PNG é salvo.
+        mostrar (bool): Se True, exibe o gráfico com plt.show(); em ambos os
+                        casos a figura é fechada no final para liberar memória.
+        pontos_max (int): O número máximo de pontos desenhados por linha.
+        metodo_decimacao (str): "minmax" (preserva os extremos) ou "lttb".
+
+    Returns:
+        str: O caminho do arquivo PNG gerado.
     """
-    plt.figure(figsize=(8, 5))
-    plt.plot(meses, dados_cidade[:, 0], marker="o", linestyle="-", label="Mínima")
-    plt.plot(meses, dados_cidade[:, 1], marker="s", linestyle="-", label="Máxima")
-    plt.plot(meses, dados_cidade[:, 2], marker="^", linestyle="None", label="Média")
-    plt.title(f"Temperaturas - {nome_cidade}")
-    plt.xlabel("Meses")
-    plt.ylabel("Temperatura (°C)")
-    plt.xticks(meses) # Garante que todos os meses (1-12) sejam mostrados
-    plt.legend()
-    plt.grid(True)
-    
+    dados_cidade = np.asarray(dados_cidade)
+    fig = plt.figure(figsize=(8, 5))
+    _desenhar_temperaturas_cidade(fig.gca(), meses, dados_cidade, nome_cidade, pontos_max, metodo_decimacao)
+
     # Gera nome do arquivo dinamicamente
-    nome_arquivo = f"temperaturas_{nome_cidade.lower().replace(' ', '_')}.png"
-    plt.savefig(nome_arquivo, dpi=300)
-    
-    plt.show()
+    caminho = os.path.join(diretorio_saida, nome_arquivo_grafico_cidade(nome_cidade))
+    with medir("savefig"):
+        fig.savefig(caminho, dpi=300)
 
-def plotar_comparativo_medias(meses, dados_macae, dados_rio):
+    if mostrar:
+        plt.show()
+    plt.close(fig)
+    return caminho
+
+@instrumentar
+def plotar_comparativo_medias(meses, dados_macae, dados_rio, diretorio_saida=".", mostrar=True):
     """
     Cria e salva um gráfico de barras agrupadas comparando as temperaturas médias.
 
     Args:
         meses (numpy.ndarray): Um array com os meses (eixo X).
-        dados_macae (numpy.ndarray): Array (12, 3) com os dados de Macaé.
-        dados_rio (numpy.ndarray): Array (12, 3) com os dados do Rio de Janeiro.
+        dados_macae (numpy.ndarray | RegistroEstacao): Array (12, 3) com os dados de Macaé.
+        dados_rio (numpy.ndarray | RegistroEstacao): Array (12, 3) com os dados do Rio de Janeiro.
+        diretorio_saida (str): A pasta onde o PNG é salvo.
+        mostrar (bool): Se True, exibe o gráfico com plt.show(); em ambos os
+                        casos a figura é fechada no final para liberar memória.
+
+    Returns:
+        str: O caminho do arquivo PNG gerado.
     """
-    media_macae = dados_macae[:, 2]
-    media_rio = dados_rio[:, 2]
+    media_macae = np.asarray(dados_macae)[:, 2]
+    media_rio = np.asarray(dados_rio)[:, 2]
 
     largura = 0.35  # Largura das barras
-    
-    plt.figure(figsize=(10, 6))
+
+    fig = plt.figure(figsize=(10, 6))
     plt.bar(meses - largura/2, media_macae, largura, label="Macaé")
     plt.bar(meses + largura/2, media_rio, largura, label="Rio de Janeiro")
 
@@ -77,5 +121,140 @@ def plotar_comparativo_medias(meses, dados_macae, dados_rio):
     plt.legend()
     plt.grid(axis="y", linestyle="--", alpha=0.7)
 
-    plt.savefig("comparacao_medias.png", dpi=300)
-    plt.show()
\ No newline at end of file
+    caminho = os.path.join(diretorio_saida, "comparacao_medias.png")
+    with medir("savefig"):
+        fig.savefig(caminho, dpi=300)
+
+    if mostrar:
+        plt.show()
+    plt.close(fig)
+    return caminho
+
+@instrumentar
+def renderizar_graficos_cidades(meses, dados_cidades, diretorio_saida, processos=1,
+                                pular_inalterados=True, dpi=300,
+                                pontos_max=PONTOS_POR_GRAFICO, metodo_decimacao="minmax"):
+    """
+    Gera, sem interface gráfica, o gráfico de temperaturas de várias cidades.
+
+    Usa Figure/FigureCanvasAgg diretamente (sem pyplot): cada processo cria
+    uma única figura e apenas atualiza os dados das linhas e o título de uma
+    cidade para a outra, de modo que o uso de memória não cresce com o número
+    de cidades. Os gráficos são idênticos aos de plotar_grafico_temperaturas_cidade.
+
+    Args:
+        meses (numpy.ndarray): Um array com os meses (eixo X).
+        dados_cidades (dict): Dicionário {nome_cidade: array (12, 3) ou RegistroEstacao}.
+        diretorio_saida (str): A pasta onde os PNGs são salvos.
+        processos (int): Número de processos usados para renderizar em paralelo.
+        pular_inalterados (bool): Se True, não regera os gráficos cujos dados
+                                  não mudaram desde a última execução (controle
+                                  feito pelo arquivo MANIFESTO_GRAFICOS da pasta).
+        dpi (int): A resolução dos PNGs.
+        pontos_max (int): O número máximo de pontos desenhados por linha
+                          (ver plotar_grafico_temperaturas_cidade).
+        metodo_decimacao (str): "minmax" (preserva os extremos) ou "lttb".
+
+    Returns:
+        dict: Dicionário {nome_cidade: caminho do PNG}.
+    """
+    os.makedirs(diretorio_saida, exist_ok=True)
+    meses = np.asarray(meses)
+    caminho_manifesto = os.path.join(diretorio_saida, MANIFESTO_GRAFICOS)
+    manifesto = _ler_manifesto(caminho_manifesto) if pular_inalterados else {}
+
+    caminhos = {}
+    pendentes = []
+    assinaturas = {}
+    for nome_cidade, dados in dados_cidades.items():
+        nome_arquivo = nome_arquivo_grafico_cidade(nome_cidade)
+        caminhos[nome_cidade] = os.path.join(diretorio_saida, nome_arquivo)
+        assinaturas[nome_arquivo] = _assinatura_grafico(meses, dados, nome_cidade, dpi, pontos_max, metodo_decimacao)
+        if manifesto.get(nome_arquivo) == assinaturas[nome_arquivo] and os.path.exists(caminhos[nome_cidade]):
+            continue
+        pendentes.append((nome_cidade, np.asarray(dados), caminhos[nome_cidade]))
+
+    decimacao = (pontos_max, metodo_decimacao)
+    if processos > 1 and len(pendentes) > 1:
+        grupos = [pendentes[i::processos] for i in range(processos)]
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            list(executor.map(_renderizar_grupo, [meses] * len(grupos), grupos,
+                              [dpi] * len(grupos), [decimacao] * len(grupos)))
+    elif pendentes:
+        _renderizar_grupo(meses, pendentes, dpi, decimacao)
+
+    if pular_inalterados:
+        manifesto.update(assinaturas)
+        # Atômico: uma execução interrompida não deixa o manifesto pela metade
+        gravar_atomicamente(caminho_manifesto,
+                            json.dumps(manifesto, ensure_ascii=False, indent=2).encode("utf-8"))
+    return caminhos
+
+@instrumentar
+def nome_arquivo_grafico_cidade(nome_cidade):
+    """
+    Retorna o nome do PNG do gráfico de uma cidade (ex.: "temperaturas_macaé.png").
+
+    Args:
+        nome_cidade (str): O nome da cidade.
+
+    Returns:
+        str: O nome do arquivo.
+    """
+    return f"temperaturas_{nome_cidade.lower().replace(' ', '_')}.png"
+
+def _desenhar_temperaturas_cidade(ax, meses, dados_cidade, nome_cidade,
+                                  pontos_max=PONTOS_POR_GRAFICO, metodo_decimacao="minmax"):
+    if len(dados_cidade) <= pontos_max:
+        ax.plot(meses, dados_cidade[:, 0], marker="o", linestyle="-", label="Mínima")
+        ax.plot(meses, dados_cidade[:, 1], marker="s", linestyle="-", label="Máxima")
+        ax.plot(meses, dados_cidade[:, 2], marker="^", linestyle="None", label="Média")
+        ax.set_xticks(meses) # Garante que todos os meses (1-12) sejam mostrados
+    else:
+        # Série longa: a média vira linha (marcadores isolados somem entre os
+        # extremos) e os ticks do eixo X ficam com o localizador padrão
+        for coluna, (estilo, rotulo) in enumerate((("-", "Mínima"), ("-", "Máxima"), (":", "Média"))):
+            eixo_x, valores = decimar_serie(meses, dados_cidade[:, coluna], pontos_max, metodo_decimacao)
+            ax.plot(eixo_x, valores, linestyle=estilo, linewidth=1, label=rotulo, rasterized=True)
+    ax.set_title(f"Temperaturas - {nome_cidade}")
+    ax.set_xlabel("Meses")
+    ax.set_ylabel("Temperatura (°C)")
+    ax.legend()
+    ax.grid(True)
+
+def _renderizar_grupo(meses, itens, dpi, decimacao=(PONTOS_POR_GRAFICO, "minmax")):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    # Uma figura por processo, reaproveitada para todas as cidades do grupo
+    fig = Figure(figsize=(8, 5))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    for nome_cidade, dados, caminho in itens:
+        if ax.lines and (len(dados) > decimacao[0] or len(ax.lines[0].get_ydata()) != len(dados)):
+            # Séries decimadas têm pontos diferentes por linha: redesenha
+            ax.clear()
+        if not ax.lines:
+            _desenhar_temperaturas_cidade(ax, meses, dados, nome_cidade, *decimacao)
+        else:
+            for coluna, linha in enumerate(ax.lines):
+                linha.set_ydata(dados[:, coluna])
+            ax.set_title(f"Temperaturas - {nome_cidade}")
+            ax.relim()
+            ax.autoscale_view()
+        with medir("savefig"):
+            fig.savefig(caminho, dpi=dpi)
+
+def _assinatura_grafico(meses, dados, nome_cidade, dpi, pontos_max, metodo_decimacao):
+    # Os meses entram como texto: podem ser números, datas ou rótulos
+    resumo = hashlib.sha256(f"{nome_cidade}|{dpi}|{pontos_max}|{metodo_decimacao}".encode("utf-8"))
+    resumo.update("\x1f".join(np.asarray(meses).astype(str).ravel().tolist()).encode("utf-8"))
+    resumo.update(np.ascontiguousarray(dados, dtype=np.float64).tobytes())
+    return resumo.hexdigest()
+
+def _ler_manifesto(caminho):
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
@@ -1,56 +1,329 @@
 # pandas_analise_climatica_lib.py
 
-import pandas as pd
+import os
 
+import _caminho  # noqa: F401  (raiz do projeto no sys.path)
+
+from clima_comum import carregador, estatisticas
+from clima_comum.agregacao import TAMANHO_BLOCO, agregar_blocos, iterar_blocos_planilhas
+from clima_comum.cache_derivacoes import memorizar_em_disco
+from clima_comum.climatologia import Climatologia
+from clima_comum.estatisticas import SEM_POSICAO, resumir_metricas
+from clima_comum.importacao_tardia import modulo_tardio
+from clima_comum.instrumentacao import instrumentar, registrar_linhas
+from clima_comum.relatorio import EscritorRelatorio
+
+# O pandas (e o NumPy) só são importados na primeira análise
+np = modulo_tardio("numpy")
+pd = modulo_tardio("pandas")
+
+# Nomes dos níveis do índice do DataFrame empilhado de várias cidades
+NIVEL_CIDADE = "cidade"
+NIVEL_MES = "mes"
+
+COLUNAS_TEMPERATURA = ["Media_Temp_C", "Minima_Temp_C", "Maxima_Temp_C"]
+
+# Colunas usadas por analisar_cidades, na ordem do array reduzido
+COLUNAS_ANALISE = ["Maxima_Temp_C", "Minima_Temp_C", "Chuva (mm)", "Umidade(%)"]
+
+# Nomes padronizados das colunas (na ordem das linhas da planilha)
+COLUNAS_CLIMATICAS = [
+    "Media_Temp_C", "Minima_Temp_C", "Maxima_Temp_C",
+    "Chuva (mm)", "Umidade(%)", "Dias chuvosos (d)"
+]
+
+@instrumentar
+@memorizar_em_disco(argumentos_entrada=("caminho_arquivo_excel",), dependencias=(carregador,))
 def carregar_e_preparar_dados_climaticos(caminho_arquivo_excel):
     """
     Lê os dados climáticos de Macaé e Rio de Janeiro de um arquivo Excel.
 
-    A função carrega as abas especificadas, pula as linhas de cabeçalho,
-    seleciona as linhas de dados relevantes, transpõe os DataFrames e
-    renomeia as colunas para um formato padronizado.
+    O arquivo é lido uma única vez pelo carregador compartilhado, que já
+    entrega as linhas de dados de cada aba; aqui elas são transpostas
+    (meses como índice) e as colunas renomeadas para um formato padronizado.
 
     Args:
-        caminho_arquivo_excel (str): O caminho para o arquivo .xlsx de entrada.
+        caminho_arquivo_excel (str | dict): O caminho para o arquivo .xlsx de
+                                            entrada ou as abas já carregadas
+                                            por carregador.carregar_planilhas_climaticas.
 
     Returns:
         tuple: Uma tupla contendo os dois DataFrames processados e prontos
                para análise (df_macae, df_rio).
     """
-    # Carrega os dados de Macaé
-    df_macae = pd.read_excel(
-        caminho_arquivo_excel,
-        sheet_name="Historico_Clima_Macae",
-        skiprows=3,
-        index_col=0,
-        engine="openpyxl"
+    df_macae = montar_dataframe_climatico(
+        carregador.obter_planilha(caminho_arquivo_excel, "Historico_Clima_Macae")
     )
+    df_rio = montar_dataframe_climatico(
+        carregador.obter_planilha(caminho_arquivo_excel, "Historico_Clima_Rio_de_Janeiro")
+    )
+    return df_macae, df_rio
+
+@instrumentar
+def carregar_dados_cidades(caminho_arquivo_excel):
+    """
+    Lê todas as abas Historico_Clima_* de um arquivo Excel em um único DataFrame.
+
+    O nome de cada cidade vem de carregador.nome_estacao
+    (ex.: "Historico_Clima_Rio_de_Janeiro" -> "Rio de Janeiro",
+    "Historico_Clima_Macae" -> "Macaé").
+
+    Args:
+        caminho_arquivo_excel (str | dict): O caminho para o arquivo .xlsx de
+                                            entrada ou as abas já carregadas
+                                            por carregador.carregar_planilhas_climaticas.
 
-    # Carrega os dados do Rio de Janeiro
-    df_rio = pd.read_excel(
-        caminho_arquivo_excel,
-        sheet_name="Historico_Clima_Rio_de_Janeiro",
-        skiprows=3,
-        index_col=0,
-        engine="openpyxl"
+    Returns:
+        pd.DataFrame: DataFrame empilhado (ver empilhar_cidades).
+    """
+    planilhas = caminho_arquivo_excel
+    if not isinstance(planilhas, dict):
+        planilhas = carregador.carregar_planilhas_climaticas(caminho_arquivo_excel)
+    return empilhar_cidades({
+        carregador.nome_estacao(nome): montar_dataframe_climatico(dados)
+        for nome, dados in planilhas.items()
+    })
+
+@instrumentar
+def montar_dataframe_climatico(dados_planilha):
+    """
+    Converte os dados de uma aba climática em um DataFrame (meses x métricas).
+
+    Seleciona as 6 primeiras linhas de métricas, transpõe e renomeia as colunas.
+
+    Args:
+        dados_planilha (carregador.DadosPlanilha): Os dados de uma aba.
+
+    Returns:
+        pd.DataFrame: DataFrame com os meses como índice e as colunas padronizadas.
+    """
+    return pd.DataFrame(
+        dados_planilha.valores[:len(COLUNAS_CLIMATICAS)].T,
+        index=pd.Index(dados_planilha.meses),
+        columns=COLUNAS_CLIMATICAS,
+        copy=True,  # os valores do carregador são somente leitura
     )
 
-    # Seleciona as 6 primeiras linhas de dados e transpõe
-    df_macae = df_macae.iloc[:6, :]
-    df_rio = df_rio.iloc[:6, :]
-    df_macae = df_macae.T
-    df_rio = df_rio.T
-
-    # Renomeia as colunas
-    colunas = [
-        "Media_Temp_C", "Minima_Temp_C", "Maxima_Temp_C",
-        "Chuva (mm)", "Umidade(%)", "Dias chuvosos (d)"
-    ]
-    df_macae.columns = colunas
-    df_rio.columns = colunas
-    
-    return df_macae, df_rio
+@instrumentar
+def empilhar_cidades(dfs_cidades):
+    """
+    Empilha os DataFrames de várias cidades em um único DataFrame longo.
+
+    Args:
+        dfs_cidades (dict): Dicionário {nome_cidade: DataFrame} no formato de
+                            carregar_e_preparar_dados_climaticos (meses x colunas).
+
+    Returns:
+        pd.DataFrame: DataFrame com MultiIndex (cidade, mes) e as colunas
+                      padronizadas, na ordem do dicionário.
+    """
+    return pd.concat(dfs_cidades, names=[NIVEL_CIDADE, NIVEL_MES])
+
+@instrumentar
+def montar_dataframe_cidades(valores, cidades, meses, colunas=COLUNAS_CLIMATICAS):
+    """
+    Converte um array 3-D (cidades x meses x métricas) no DataFrame empilhado.
+
+    Args:
+        valores (numpy.ndarray): Array com shape (len(cidades), len(meses), len(colunas)).
+        cidades (sequence): Os nomes das cidades.
+        meses (sequence): Os rótulos dos meses.
+        colunas (sequence): Os nomes das métricas.
+
+    Returns:
+        pd.DataFrame: DataFrame com MultiIndex (cidade, mes).
+    """
+    indice = pd.MultiIndex.from_product([cidades, meses], names=[NIVEL_CIDADE, NIVEL_MES])
+    return pd.DataFrame(valores.reshape(len(indice), len(colunas)), index=indice, columns=list(colunas))
+
+@instrumentar
+def calcular_medias_anuais_cidades(df_cidades):
+    """
+    Calcula a média anual das temperaturas de todas as cidades de uma vez.
+
+    Args:
+        df_cidades (pd.DataFrame): DataFrame empilhado (ver empilhar_cidades).
+
+    Returns:
+        pd.DataFrame: Uma linha por cidade com as médias de temperatura.
+    """
+    agrupado = df_cidades[COLUNAS_TEMPERATURA].groupby(level=NIVEL_CIDADE, sort=False)
+    return agrupado.mean().round(2)
+
+@instrumentar
+def analisar_cidades(df_cidades):
+    """
+    Encontra os extremos de temperatura e chuva de todas as cidades de uma vez.
+
+    Quando todas as cidades têm os mesmos meses (o caso das abas
+    Historico_Clima_*), os indicadores saem de uma única redução
+    (estatisticas.resumir_metricas) sobre o array cidades x meses x métricas,
+    em vez de um idxmax/idxmin/sum/mean agrupado por coluna. Caso contrário,
+    cada indicador é calculado com uma operação agrupada do pandas.
 
+    Args:
+        df_cidades (pd.DataFrame): DataFrame empilhado (ver empilhar_cidades).
+
+    Returns:
+        pd.DataFrame: Uma linha por cidade com as colunas mes_maior_temp,
+                      mes_menor_temp, mes_mais_chuvoso, mes_menos_chuvoso,
+                      chuva_anual e umidade_media.
+    """
+    cubo = _cubo_cidades(df_cidades, COLUNAS_ANALISE)
+    if cubo is None:
+        return _analisar_cidades_agrupado(df_cidades)
+
+    cidades, meses, valores = cubo
+    resumo = resumir_metricas(valores)
+    maxima, minima, chuva, umidade = range(len(COLUNAS_ANALISE))
+    return pd.DataFrame({
+        'mes_maior_temp': _mes_na_posicao(meses, resumo.posicao_maximo[:, maxima]),
+        'mes_menor_temp': _mes_na_posicao(meses, resumo.posicao_minimo[:, minima]),
+        'mes_mais_chuvoso': _mes_na_posicao(meses, resumo.posicao_maximo[:, chuva]),
+        'mes_menos_chuvoso': _mes_na_posicao(meses, resumo.posicao_minimo[:, chuva]),
+        'chuva_anual': resumo.soma[:, chuva],
+        'umidade_media': resumo.media[:, umidade]
+    }, index=pd.Index(cidades, name=NIVEL_CIDADE))
+
+def _analisar_cidades_agrupado(df_cidades):
+    agrupado = df_cidades.groupby(level=NIVEL_CIDADE, sort=False)
+    return pd.DataFrame({
+        'mes_maior_temp': _mes_do_extremo(agrupado["Maxima_Temp_C"].idxmax()),
+        'mes_menor_temp': _mes_do_extremo(agrupado["Minima_Temp_C"].idxmin()),
+        'mes_mais_chuvoso': _mes_do_extremo(agrupado["Chuva (mm)"].idxmax()),
+        'mes_menos_chuvoso': _mes_do_extremo(agrupado["Chuva (mm)"].idxmin()),
+        'chuva_anual': agrupado["Chuva (mm)"].sum(),
+        'umidade_media': agrupado["Umidade(%)"].mean()
+    })
+
+@instrumentar
+def analisar_arquivos_em_blocos(caminhos_excel, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Calcula médias e análise de todas as cidades sem carregar os arquivos inteiros.
+
+    Equivale a carregar_dados_cidades + calcular_medias_anuais_cidades +
+    analisar_cidades (e, para Macaé e Rio, a carregar_e_preparar_dados_climaticos
+    + realizar_analise_detalhada_clima), mas lê uma aba por vez e a reduz em
+    blocos de `tamanho_bloco` meses, guardando apenas mínimo, máximo, soma e
+    contagem de cada métrica (clima_comum.agregacao). A memória usada depende
+    do número de cidades, não do tamanho do acervo. Abas de mesmo nome em
+    arquivos diferentes são tratadas como continuação da mesma cidade.
+
+    Args:
+        caminhos_excel (iterable): Os caminhos dos arquivos .xlsx, em ordem cronológica.
+        tamanho_bloco (int): Quantos meses são reduzidos de cada vez.
+
+    Returns:
+        tuple: (medias_cidades, analise_cidades), nos formatos de
+               calcular_medias_anuais_cidades e analisar_cidades.
+    """
+    if isinstance(caminhos_excel, (str, os.PathLike)):
+        caminhos_excel = [caminhos_excel]
+    blocos = iterar_blocos_planilhas(caminhos_excel, tamanho_bloco, n_metricas=len(COLUNAS_CLIMATICAS))
+    agregados = agregar_blocos(blocos)
+
+    cidades = pd.Index(list(agregados), name=NIVEL_CIDADE)
+    coluna = {nome: i for i, nome in enumerate(COLUNAS_CLIMATICAS)}
+    medias = pd.DataFrame([a.media for a in agregados.values()], index=cidades,
+                          columns=COLUNAS_CLIMATICAS)
+    medias = medias[COLUNAS_TEMPERATURA].round(2)
+    analise = pd.DataFrame({
+        'mes_maior_temp': [a.rotulo_maximo[coluna["Maxima_Temp_C"]] for a in agregados.values()],
+        'mes_menor_temp': [a.rotulo_minimo[coluna["Minima_Temp_C"]] for a in agregados.values()],
+        'mes_mais_chuvoso': [a.rotulo_maximo[coluna["Chuva (mm)"]] for a in agregados.values()],
+        'mes_menos_chuvoso': [a.rotulo_minimo[coluna["Chuva (mm)"]] for a in agregados.values()],
+        'chuva_anual': [a.soma[coluna["Chuva (mm)"]] for a in agregados.values()],
+        'umidade_media': [a.media[coluna["Umidade(%)"]] for a in agregados.values()]
+    }, index=cidades)
+    return medias, analise
+
+@instrumentar
+def cidade_mais_umida(analise_cidades):
+    """
+    Retorna a cidade com a maior umidade média.
+
+    Args:
+        analise_cidades (pd.DataFrame): O resultado de analisar_cidades.
+
+    Returns:
+        str: O nome da cidade mais úmida.
+    """
+    return analise_cidades["umidade_media"].idxmax()
+
+@instrumentar
+def calcular_climatologia_cidades(df_cidades, colunas=COLUNAS_CLIMATICAS):
+    """
+    Calcula as normais mensais de todas as cidades (ver clima_comum.climatologia).
+
+    Os meses podem ser nomes ("Julho") ou rótulos "Mês AAAA"; com vários anos
+    por cidade, as normais têm média e desvio padrão de cada mês do ano.
+
+    Args:
+        df_cidades (pd.DataFrame): DataFrame empilhado (ver empilhar_cidades)
+                                   com o histórico.
+        colunas (sequence): As colunas com normais.
+
+    Returns:
+        Climatologia: As normais, que podem ser salvas e reaproveitadas.
+    """
+    return Climatologia.de_observacoes(
+        df_cidades.index.get_level_values(NIVEL_CIDADE),
+        df_cidades.index.get_level_values(NIVEL_MES),
+        df_cidades[list(colunas)].to_numpy(dtype=np.float64),
+        colunas
+    )
+
+@instrumentar
+def calcular_anomalias_cidades(df_cidades, climatologia, escore_z=False):
+    """
+    Compara dados novos de várias cidades com as normais, em um único lote.
+
+    Args:
+        df_cidades (pd.DataFrame): DataFrame empilhado com os dados novos.
+        climatologia (Climatologia): As normais (ver calcular_climatologia_cidades).
+        escore_z (bool): Se True, retorna os escores z em vez das anomalias.
+
+    Returns:
+        pd.DataFrame: Mesmo índice de df_cidades, com as colunas que têm normais.
+    """
+    colunas = [coluna for coluna in df_cidades.columns if coluna in climatologia.colunas]
+    comparar = climatologia.escores_z if escore_z else climatologia.anomalias
+    resultado = comparar(
+        df_cidades.index.get_level_values(NIVEL_MES),
+        df_cidades[colunas].to_numpy(dtype=np.float64),
+        estacoes=df_cidades.index.get_level_values(NIVEL_CIDADE),
+        colunas=colunas
+    )
+    return pd.DataFrame(resultado, index=df_cidades.index, columns=colunas)
+
+@instrumentar
+def ranquear_anomalias_cidades(df_cidades, climatologia, coluna="Umidade(%)", limite=None):
+    """
+    Ordena as cidades da mais para a menos anômala em relação às normais.
+
+    Generaliza cidade_mais_umida: em vez de comparar médias brutas, compara
+    cada cidade com o próprio histórico (escore z médio dos meses novos).
+
+    Args:
+        df_cidades (pd.DataFrame): DataFrame empilhado com os dados novos.
+        climatologia (Climatologia): As normais (ver calcular_climatologia_cidades).
+        coluna (str): A coluna comparada.
+        limite (int, optional): Quantas cidades retornar (padrão: todas).
+
+    Returns:
+        pd.Series: O escore z médio de cada cidade, da mais anômala para a
+                   menos (em valor absoluto).
+    """
+    cidades, escores = climatologia.ranquear(
+        df_cidades.index.get_level_values(NIVEL_MES),
+        df_cidades[coluna].to_numpy(dtype=np.float64),
+        coluna,
+        estacoes=df_cidades.index.get_level_values(NIVEL_CIDADE),
+        limite=limite
+    )
+    return pd.Series(escores, index=pd.Index(cidades, name=NIVEL_CIDADE), name="escore_z")
+
+@instrumentar
 def calcular_medias_anuais_temperatura(df_macae, df_rio):
     """
     Calcula a média anual das temperaturas para cada cidade.
@@ -63,10 +336,13 @@ def calcular_medias_anuais_temperatura(df_macae, df_rio):
         tuple: Uma tupla contendo duas Series com as médias de temperatura
                para cada cidade (media_macae, media_rio).
     """
-    media_macae = df_macae[["Media_Temp_C", "Minima_Temp_C", "Maxima_Temp_C"]].mean().round(2)
-    media_rio = df_rio[["Media_Temp_C", "Minima_Temp_C", "Maxima_Temp_C"]].mean().round(2)
+    medias = calcular_medias_anuais_cidades(empilhar_cidades({"Macaé": df_macae, "Rio de Janeiro": df_rio}))
+    media_macae = medias.loc["Macaé"].rename(None)
+    media_rio = medias.loc["Rio de Janeiro"].rename(None)
     return media_macae, media_rio
 
+@instrumentar
+@memorizar_em_disco(dependencias=(estatisticas,))
 def realizar_analise_detalhada_clima(df_macae, df_rio):
     """
     Executa análises detalhadas para encontrar extremos de temperatura e chuva.
@@ -80,31 +356,16 @@ def realizar_analise_detalhada_clima(df_macae, df_rio):
                para cada cidade e uma string indicando a cidade mais úmida
                (analise_macae, analise_rio, cidade_mais_umida).
     """
-    # Análise para Macaé
-    analise_macae = {
-        'mes_maior_temp': df_macae["Maxima_Temp_C"].idxmax(),
-        'mes_menor_temp': df_macae["Minima_Temp_C"].idxmin(),
-        'mes_mais_chuvoso': df_macae["Chuva (mm)"].idxmax(),
-        'mes_menos_chuvoso': df_macae["Chuva (mm)"].idxmin(),
-        'chuva_anual': df_macae["Chuva (mm)"].sum(),
-        'umidade_media': df_macae["Umidade(%)"].mean()
-    }
-    
-    # Análise para o Rio de Janeiro
-    analise_rio = {
-        'mes_maior_temp': df_rio["Maxima_Temp_C"].idxmax(),
-        'mes_menor_temp': df_rio["Minima_Temp_C"].idxmin(),
-        'mes_mais_chuvoso': df_rio["Chuva (mm)"].idxmax(),
-        'mes_menos_chuvoso': df_rio["Chuva (mm)"].idxmin(),
-        'chuva_anual': df_rio["Chuva (mm)"].sum(),
-        'umidade_media': df_rio["Umidade(%)"].mean()
-    }
+    analise = analisar_cidades(empilhar_cidades({"Macaé": df_macae, "Rio de Janeiro": df_rio}))
+    analise_macae = analise.loc["Macaé"].to_dict()
+    analise_rio = analise.loc["Rio de Janeiro"].to_dict()
 
     # Comparação de umidade
     cidade_mais_umida = "Macaé" if analise_macae['umidade_media'] > analise_rio['umidade_media'] else "Rio de Janeiro"
 
     return analise_macae, analise_rio, cidade_mais_umida
 
+@instrumentar
 def gerar_relatorio_excel(caminho_saida, df_macae, df_rio, medias_macae, medias_rio, analise_macae, analise_rio, cidade_umida):
     """
     Gera um arquivo Excel com o relatório completo da análise climática.
@@ -119,29 +380,72 @@ def gerar_relatorio_excel(caminho_saida, df_macae, df_rio, medias_macae, medias_
         analise_rio (dict): Dicionário com os resultados da análise do Rio de Janeiro.
         cidade_umida (str): O nome da cidade mais úmida.
     """
-    # Prepara o DataFrame de resumo das análises
-    relatorio_analises = pd.DataFrame({
-        "Cidade": ["Macaé", "Rio de Janeiro"],
-        "Mês maior temp.": [analise_macae['mes_maior_temp'], analise_rio['mes_maior_temp']],
-        "Mês menor temp.": [analise_macae['mes_menor_temp'], analise_rio['mes_menor_temp']],
-        "Mês mais chuvoso": [analise_macae['mes_mais_chuvoso'], analise_rio['mes_mais_chuvoso']],
-        "Mês menos chuvoso": [analise_macae['mes_menos_chuvoso'], analise_rio['mes_menos_chuvoso']],
-        "Chuva anual (mm)": [analise_macae['chuva_anual'], analise_rio['chuva_anual']],
-        "Umidade média (%)": [analise_macae['umidade_media'], analise_rio['umidade_media']],
-        "Cidade mais úmida": [cidade_umida, cidade_umida] # Repete o resultado para ambas as linhas
-    })
+    cidades = ["Macaé", "Rio de Janeiro"]
+    gerar_relatorio_excel_cidades(
+        caminho_saida,
+        empilhar_cidades(dict(zip(cidades, [df_macae, df_rio]))),
+        pd.DataFrame([medias_macae, medias_rio], index=cidades),
+        pd.DataFrame([analise_macae, analise_rio], index=cidades),
+        cidade_umida
+    )
 
-    # Prepara o DataFrame de médias de temperatura
-    relatorio_temperaturas = pd.DataFrame({
-        "Cidade": ["Macaé", "Rio de Janeiro"],
-        "Média Temp. (°C)": [medias_macae["Media_Temp_C"], medias_rio["Media_Temp_C"]],
-        "Mínima Temp. (°C)": [medias_macae["Minima_Temp_C"], medias_rio["Minima_Temp_C"]],
-        "Máxima Temp. (°C)": [medias_macae["Maxima_Temp_C"], medias_rio["Maxima_Temp_C"]]
-    })
+@instrumentar
+def gerar_relatorio_excel_cidades(caminho_saida, df_cidades, medias_cidades, analise_cidades,
+                                  cidade_umida=None, formato="xlsx"):
+    """
+    Gera o relatório da análise climática para qualquer número de cidades.
+
+    As linhas são gravadas diretamente (openpyxl em modo write-only), sem
+    DataFrames intermediários; ver clima_comum.relatorio.EscritorRelatorio para
+    gravar cidade a cidade à medida que as análises ficam prontas.
+
+    Args:
+        caminho_saida (str): O caminho para o arquivo .xlsx de saída (ou a
+                             pasta de saída, para "csv" e "parquet").
+        df_cidades (pd.DataFrame): DataFrame empilhado (ver empilhar_cidades).
+        medias_cidades (pd.DataFrame): O resultado de calcular_medias_anuais_cidades.
+        analise_cidades (pd.DataFrame): O resultado de analisar_cidades.
+        cidade_umida (str, optional): O nome da cidade mais úmida; se omitido,
+                                      é calculado a partir da análise.
+        formato (str): "xlsx" (padrão), "csv" ou "parquet".
+    """
+    if cidade_umida is None:
+        cidade_umida = cidade_mais_umida(analise_cidades)
+
+    with EscritorRelatorio(caminho_saida, formato) as escritor:
+        for cidade, df_cidade in df_cidades.groupby(level=NIVEL_CIDADE, sort=False):
+            escritor.adicionar_cidade(
+                cidade,
+                df_cidade.droplevel(NIVEL_CIDADE),
+                medias_cidades.loc[cidade],
+                analise_cidades.loc[cidade]
+            )
+        escritor.fechar(cidade_umida)
+    registrar_linhas(len(df_cidades))
+
+def _mes_do_extremo(rotulos):
+    # idxmax/idxmin agrupados devolvem tuplas (cidade, mes); fica só o mês
+    return pd.Series(
+        pd.MultiIndex.from_tuples(rotulos.to_numpy()).get_level_values(1),
+        index=rotulos.index
+    )
+
+def _cubo_cidades(df_cidades, colunas):
+    # (cidades, meses, valores) com valores em um array contíguo
+    # (cidades x meses x colunas), ou None se as cidades não estiverem em
+    # blocos consecutivos do mesmo tamanho
+    codigos, cidades = pd.factorize(df_cidades.index.get_level_values(NIVEL_CIDADE))
+    if len(cidades) == 0 or len(df_cidades) % len(cidades):
+        return None
+    n_meses = len(df_cidades) // len(cidades)
+    if not np.array_equal(codigos, np.repeat(np.arange(len(cidades)), n_meses)):
+        return None
+    valores = df_cidades[colunas].to_numpy(dtype=np.float64).reshape(len(cidades), n_meses, len(colunas))
+    meses = df_cidades.index.get_level_values(NIVEL_MES).to_numpy().reshape(len(cidades), n_meses)
+    return cidades, meses, valores
 
-    # Escreve todas as abas no arquivo de saída
-    with pd.ExcelWriter(caminho_saida, engine="openpyxl") as writer:
-        relatorio_analises.to_excel(writer, sheet_name="Resumo_Analises", index=False)
-        relatorio_temperaturas.to_excel(writer, sheet_name="Medias_Temperaturas", index=False)
-        df_macae.to_excel(writer, sheet_name="Dados_Macae")
-        df_rio.to_excel(writer, sheet_name="Dados_Rio_de_Janeiro")
\ No newline at end of file
+def _mes_na_posicao(meses, posicoes):
+    # Rótulo do mês de cada cidade; NaN quando a métrica não tem valores
+    rotulos = meses[np.arange(len(posicoes)), posicoes].astype(object)
+    rotulos[posicoes == SEM_POSICAO] = np.nan
+    return rotulos
@@ -0,0 +1,239 @@
+# processar_lote.py
+
+"""
+Processa em lote um diretório de planilhas climáticas.
+
+Cada planilha é carregada e analisada em um processo separado; os resumos
+de todas as planilhas são consolidados em um único arquivo e o tempo (ou o
+erro) de cada uma é informado ao final.
+
+Uso:
+    python processar_lote.py DIRETORIO [--padrao "*.xlsx"] [--processos N]
+                             [--saida resumo_lote.xlsx] [--relatorios PASTA]
+                             [--em-blocos]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+import _caminho  # noqa: F401  (raiz do projeto no sys.path)
+import analise_lib as palib
+
+
+def main(argv=None):
+    args = interpretar_argumentos(argv)
+    arquivos = listar_planilhas(args.diretorio, args.padrao)
+    if not arquivos:
+        print(f"Nenhuma planilha '{args.padrao}' encontrada em '{args.diretorio}'.")
+        return 1
+
+    inicio = time.perf_counter()
+    resultados = processar_planilhas(arquivos, args.processos, args.relatorios, args.em_blocos)
+    duracao = time.perf_counter() - inicio
+
+    falhas = [r for r in resultados if not r["sucesso"]]
+    if len(falhas) < len(resultados):
+        salvar_consolidado(args.saida, resultados)
+        print(f"\nResumo consolidado salvo em '{args.saida}'.")
+    mostrar_resultado(resultados, duracao)
+    return 1 if falhas else 0
+
+
+def interpretar_argumentos(argv=None):
+    """Lê os argumentos da linha de comando."""
+    parser = argparse.ArgumentParser(description="Análise climática em lote de planilhas .xlsx.")
+    parser.add_argument("diretorio", help="Pasta com as planilhas a processar.")
+    parser.add_argument("--padrao", default="*.xlsx", help="Padrão dos arquivos (padrão: *.xlsx).")
+    parser.add_argument("--processos", type=int, default=os.cpu_count(),
+                        help="Número de processos de trabalho (padrão: número de CPUs).")
+    parser.add_argument("--saida", default="resumo_lote.xlsx",
+                        help="Arquivo consolidado (.xlsx ou .csv).")
+    parser.add_argument("--relatorios", default=None,
+                        help="Pasta para gravar também o relatório de cada planilha.")
+    parser.add_argument("--em-blocos", action="store_true",
+                        help="Lê uma aba por vez e agrega em blocos (memória limitada; sem --relatorios).")
+    args = parser.parse_args(argv)
+    if args.processos is not None and args.processos <= 0:
+        parser.error("--processos deve ser um número positivo.")
+    if args.em_blocos and args.relatorios:
+        parser.error("--relatorios precisa dos dados completos e não pode ser usado com --em-blocos.")
+    return args
+
+
+def listar_planilhas(diretorio, padrao="*.xlsx"):
+    """
+    Lista as planilhas de um diretório, ignorando arquivos temporários do Excel.
+
+    Args:
+        diretorio (str): A pasta a ser varrida.
+        padrao (str): O padrão glob dos arquivos.
+
+    Returns:
+        list: Os caminhos encontrados, em ordem alfabética.
+    """
+    caminhos = glob.glob(os.path.join(diretorio, padrao))
+    return sorted(c for c in caminhos if not os.path.basename(c).startswith("~$"))
+
+
+def processar_planilhas(arquivos, processos=None, diretorio_relatorios=None, em_blocos=False):
+    """
+    Distribui as planilhas entre um pool de processos.
+
+    Args:
+        arquivos (list): Os caminhos das planilhas.
+        processos (int, optional): O número de processos; 1 executa tudo no
+                                   processo atual.
+        diretorio_relatorios (str, optional): Pasta para os relatórios individuais.
+        em_blocos (bool): Se True, analisa cada planilha com
+                          analise_lib.analisar_arquivos_em_blocos.
+
+    Returns:
+        list: Um dicionário por planilha (ver processar_planilha), na ordem
+              de `arquivos`.
+    """
+    if diretorio_relatorios:
+        os.makedirs(diretorio_relatorios, exist_ok=True)
+
+    if processos == 1 or len(arquivos) == 1:
+        resultados = []
+        for arquivo in arquivos:
+            resultados.append(processar_planilha(arquivo, diretorio_relatorios, em_blocos))
+            mostrar_progresso(resultados[-1])
+        return resultados
+
+    resultados = {}
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = {
+            executor.submit(processar_planilha, arquivo, diretorio_relatorios, em_blocos): arquivo
+            for arquivo in arquivos
+        }
+        for futuro in as_completed(futuros):
+            try:
+                resultado = futuro.result()
+            except Exception as erro:
+                # O processo morreu (ex.: BrokenProcessPool por falta de
+                # memória): a planilha entra como falha e o lote continua
+                resultado = {"arquivo": futuros[futuro], "sucesso": False,
+                             "erro": f"{type(erro).__name__}: {erro}", "medias": None,
+                             "analise": None, "segundos": time.perf_counter() - inicio}
+            mostrar_progresso(resultado)
+            resultados[futuros[futuro]] = resultado
+    return [resultados[arquivo] for arquivo in arquivos]
+
+
+def processar_planilha(caminho_arquivo_excel, diretorio_relatorios=None, em_blocos=False):
+    """
+    Carrega e analisa uma planilha, capturando erros e medindo o tempo.
+
+    Args:
+        caminho_arquivo_excel (str): O caminho da planilha.
+        diretorio_relatorios (str, optional): Pasta para gravar o relatório
+                                              Excel desta planilha.
+        em_blocos (bool): Se True, a planilha é lida uma aba por vez e
+                          reduzida em blocos, sem montar o DataFrame completo
+                          (não grava relatório).
+
+    Returns:
+        dict: Dicionário com as chaves arquivo, sucesso, segundos, erro,
+              medias e analise (DataFrames por cidade, ou None em caso de erro).
+    """
+    inicio = time.perf_counter()
+    resultado = {"arquivo": caminho_arquivo_excel, "sucesso": False, "erro": None,
+                 "medias": None, "analise": None}
+    try:
+        if em_blocos:
+            medias, analise = palib.analisar_arquivos_em_blocos(caminho_arquivo_excel)
+            if analise.empty:
+                raise ValueError("nenhuma aba Historico_Clima_* encontrada")
+        else:
+            df_cidades = palib.carregar_dados_cidades(caminho_arquivo_excel)
+            if df_cidades.empty:
+                raise ValueError("nenhuma aba Historico_Clima_* encontrada")
+            medias = palib.calcular_medias_anuais_cidades(df_cidades)
+            analise = palib.analisar_cidades(df_cidades)
+
+            if diretorio_relatorios:
+                nome = os.path.splitext(os.path.basename(caminho_arquivo_excel))[0]
+                caminho_relatorio = os.path.join(diretorio_relatorios, f"Relatorio_{nome}.xlsx")
+                palib.gerar_relatorio_excel_cidades(caminho_relatorio, df_cidades, medias, analise)
+
+        resultado.update(sucesso=True, medias=medias, analise=analise)
+    except Exception as erro:
+        resultado["erro"] = f"{type(erro).__name__}: {erro}"
+    resultado["segundos"] = time.perf_counter() - inicio
+    return resultado
+
+
+def consolidar_resultados(resultados):
+    """
+    Junta os resumos das planilhas processadas com sucesso.
+
+    Args:
+        resultados (list): Os dicionários retornados por processar_planilha.
+
+    Returns:
+        pd.DataFrame: Uma linha por (arquivo, cidade) com as médias de
+                      temperatura e os indicadores da análise.
+    """
+    partes = {
+        os.path.basename(r["arquivo"]): r["analise"].join(r["medias"])
+        for r in resultados if r["sucesso"]
+    }
+    return pd.concat(partes, names=["arquivo", palib.NIVEL_CIDADE])
+
+
+def salvar_consolidado(caminho_saida, resultados):
+    """
+    Salva o resumo consolidado e a tabela de execução (tempo/erro por arquivo).
+
+    Arquivos .csv recebem apenas o resumo; arquivos .xlsx recebem as abas
+    "Resumo" e "Execucao".
+
+    Args:
+        caminho_saida (str): O caminho do arquivo consolidado.
+        resultados (list): Os dicionários retornados por processar_planilha.
+    """
+    consolidado = consolidar_resultados(resultados)
+    if caminho_saida.lower().endswith(".csv"):
+        consolidado.to_csv(caminho_saida, encoding="utf-8")
+        return
+
+    execucao = pd.DataFrame(
+        [(os.path.basename(r["arquivo"]), r["sucesso"], round(r["segundos"], 3), r["erro"])
+         for r in resultados],
+        columns=["Arquivo", "Sucesso", "Tempo (s)", "Erro"]
+    )
+    with pd.ExcelWriter(caminho_saida, engine="openpyxl") as writer:
+        consolidado.to_excel(writer, sheet_name="Resumo")
+        execucao.to_excel(writer, sheet_name="Execucao", index=False)
+
+
+def mostrar_progresso(resultado):
+    """Exibe uma linha com o status de uma planilha assim que ela termina."""
+    nome = os.path.basename(resultado["arquivo"])
+    if resultado["sucesso"]:
+        print(f"[ok]    {nome} ({resultado['segundos']:.2f} s)")
+    else:
+        print(f"[falha] {nome} ({resultado['segundos']:.2f} s): {resultado['erro']}")
+
+
+def mostrar_resultado(resultados, duracao):
+    """Exibe o resumo da execução do lote."""
+    falhas = [r for r in resultados if not r["sucesso"]]
+    tempo_total = sum(r["segundos"] for r in resultados)
+    print("\n=== Resultado do Processamento em Lote ===")
+    print(f"Planilhas processadas: {len(resultados) - len(falhas)}/{len(resultados)}")
+    print(f"Tempo total: {duracao:.2f} s (soma dos tempos por planilha: {tempo_total:.2f} s)")
+    for falha in falhas:
+        print(f"Falha em {os.path.basename(falha['arquivo'])}: {falha['erro']}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+# servico_http.py
+
+"""
+Serviço HTTP local (asyncio) com as análises climáticas em JSON.
+
+As planilhas são carregadas e analisadas uma única vez na inicialização (ou
+em /recarregar), em um pool de processos, de modo que o loop de eventos
+nunca fica bloqueado por parsing. As respostas de sucesso ficam em cache
+(TTL + LRU).
+
+Rotas (GET, exceto /recarregar):
+    /arquivos                              planilhas carregadas e suas cidades
+    /medias?arquivo=X                      médias anuais de temperatura por cidade
+    /analise?arquivo=X                     extremos, chuva anual, umidade e cidade mais úmida
+    /temperatura?arquivo=X&estacao=Y&mes=Z[&ano=A][&coluna=Media]
+                                           temperatura de um mês (obter_temp_media_mes)
+    /recarregar?arquivo=X                  relê a planilha (somente POST)
+
+O parâmetro `arquivo` (nome do arquivo) pode ser omitido quando há um só;
+`estacao` pode ser omitido quando a planilha tem uma só cidade.
+
+Uso:
+    python servico_http.py ../data/Dados_climaticos_historicos.xlsx --porta 8080
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import numbers
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import _caminho  # noqa: F401  (raiz do projeto no sys.path)
+import analise_lib as palib
+from clima_comum.indice_mensal import IndiceMensal
+
+_MENSAGENS_STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                     500: "Internal Server Error"}
+
+
+class CacheRespostas:
+    """
+    Cache de respostas com expiração (TTL) e descarte do menos usado (LRU).
+    """
+
+    def __init__(self, tamanho_maximo=1024, ttl=60.0):
+        """
+        Args:
+            tamanho_maximo (int): Quantidade máxima de respostas guardadas.
+            ttl (float): Tempo de vida de cada resposta, em segundos.
+        """
+        self.tamanho_maximo = tamanho_maximo
+        self.ttl = ttl
+        self._itens = OrderedDict()
+
+    def obter(self, chave):
+        """Retorna a resposta guardada (ou None, se ausente ou expirada)."""
+        item = self._itens.get(chave)
+        if item is None:
+            return None
+        expira_em, valor = item
+        if expira_em < time.monotonic():
+            del self._itens[chave]
+            return None
+        self._itens.move_to_end(chave)
+        return valor
+
+    def guardar(self, chave, valor):
+        """Guarda uma resposta, descartando a usada há mais tempo se necessário."""
+        self._itens[chave] = (time.monotonic() + self.ttl, valor)
+        self._itens.move_to_end(chave)
+        while len(self._itens) > self.tamanho_maximo:
+            self._itens.popitem(last=False)
+
+    def limpar(self):
+        """Remove todas as respostas."""
+        self._itens.clear()
+
+
+class ServicoClimatico:
+    """
+    Mantém as análises das planilhas em memória e responde às rotas HTTP.
+    """
+
+    def __init__(self, caminhos, processos=None, ttl=60.0, tamanho_cache=1024):
+        """
+        Args:
+            caminhos (list): Os caminhos das planilhas .xlsx.
+            processos (int, optional): Processos do pool de carregamento.
+            ttl (float): Tempo de vida das respostas em cache, em segundos.
+            tamanho_cache (int): Quantidade máxima de respostas em cache.
+        """
+        self.caminhos = {os.path.basename(c): os.path.abspath(c) for c in caminhos}
+        self.dados = {}
+        self.cache = CacheRespostas(tamanho_cache, ttl)
+        self._executor = ProcessPoolExecutor(max_workers=processos)
+        self._rotas = {
+            "/arquivos": self._rota_arquivos,
+            "/medias": self._rota_medias,
+            "/analise": self._rota_analise,
+            "/temperatura": self._rota_temperatura,
+        }
+
+    async def carregar(self, nomes=None):
+        """Carrega (em paralelo, no pool) as planilhas indicadas ou todas."""
+        loop = asyncio.get_running_loop()
+        nomes = list(self.caminhos) if nomes is None else nomes
+        resultados = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, preparar_planilha, self.caminhos[nome]) for nome in nomes
+        ))
+        self.dados.update(zip(nomes, resultados))
+        self.cache.limpar()
+
+    def fechar(self):
+        """Encerra o pool de processos."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def responder(self, metodo, alvo):
+        """
+        Processa uma requisição e retorna (status, corpo JSON em bytes).
+
+        Args:
+            metodo (str): O método HTTP.
+            alvo (str): O caminho com a query string.
+        """
+        url = urlsplit(alvo)
+        parametros = {chave: valores[-1] for chave, valores in parse_qs(url.query).items()}
+
+        if url.path == "/recarregar":
+            if metodo != "POST":
+                return 405, _json({"erro": "Use POST."})
+            try:
+                nome = self._nome_arquivo(parametros)
+            except ValueError as erro:
+                return 404, _json({"erro": str(erro)})
+            await self.carregar([nome])
+            return 200, _json({"recarregado": nome})
+
+        if metodo != "GET":
+            return 405, _json({"erro": "Use GET."})
+        rota = self._rotas.get(url.path)
+        if rota is None:
+            return 404, _json({"erro": f"Rota '{url.path}' não encontrada."})
+
+        chave = (url.path, tuple(sorted(parametros.items())))
+        resposta = self.cache.obter(chave)
+        if resposta is None:
+            try:
+                resposta = 200, _json(rota(parametros))
+            except (KeyError, ValueError) as erro:
+                # Erros não vão para o cache: uma planilha recarregada pode corrigi-los
+                return 400, _json({"erro": str(erro).strip("'\"")})
+            self.cache.guardar(chave, resposta)
+        return resposta
+
+    def _nome_arquivo(self, parametros):
+        nome = parametros.get("arquivo")
+        if nome is None:
+            if len(self.caminhos) == 1:
+                return next(iter(self.caminhos))
+            raise ValueError("Informe o parâmetro 'arquivo': há mais de uma planilha carregada.")
+        if nome not in self.caminhos:
+            raise ValueError(f"A planilha '{nome}' não está carregada.")
+        return nome
+
+    def _dados_arquivo(self, parametros):
+        return self.dados[self._nome_arquivo(parametros)]
+
+    def _rota_arquivos(self, parametros):
+        return {nome: list(dados["medias"]) for nome, dados in self.dados.items()}
+
+    def _rota_medias(self, parametros):
+        return self._dados_arquivo(parametros)["medias"]
+
+    def _rota_analise(self, parametros):
+        dados = self._dados_arquivo(parametros)
+        return {"cidades": dados["analise"], "cidade_mais_umida": dados["cidade_mais_umida"]}
+
+    def _rota_temperatura(self, parametros):
+        if "mes" not in parametros:
+            raise ValueError("Informe o parâmetro 'mes'.")
+        indice = self._dados_arquivo(parametros)["indice"]
+        ano = int(parametros["ano"]) if "ano" in parametros else None
+        coluna = parametros.get("coluna", "Media")
+        mes = parametros["mes"]
+        valor = indice.consultar(mes, parametros.get("estacao"), ano, coluna)
+        return {"mes": mes, "estacao": parametros.get("estacao"), "ano": ano, "coluna": coluna, "valor": valor}
+
+
+def preparar_planilha(caminho_arquivo_excel):
+    """
+    Carrega e analisa uma planilha (executada nos processos do pool).
+
+    Args:
+        caminho_arquivo_excel (str): O caminho da planilha.
+
+    Returns:
+        dict: Médias e análise por cidade (já em tipos JSON), a cidade mais
+              úmida e o IndiceMensal das temperaturas.
+    """
+    df_cidades = palib.carregar_dados_cidades(caminho_arquivo_excel)
+    analise = palib.analisar_cidades(df_cidades)
+    return {
+        "medias": palib.calcular_medias_anuais_cidades(df_cidades).to_dict(orient="index"),
+        "analise": analise.to_dict(orient="index"),
+        "cidade_mais_umida": palib.cidade_mais_umida(analise),
+        "indice": IndiceMensal.de_planilhas(caminho_arquivo_excel),
+    }
+
+
+async def atender_conexao(servico, leitor, escritor):
+    """Atende as requisições HTTP/1.1 de uma conexão (com keep-alive)."""
+    try:
+        while True:
+            linha = await leitor.readline()
+            if not linha:
+                break
+            try:
+                metodo, alvo, versao = linha.decode("latin-1").split()
+            except ValueError:
+                await _enviar(escritor, 400, _json({"erro": "Requisição inválida."}), False)
+                break
+
+            cabecalhos = {}
+            while (linha := await leitor.readline()) not in (b"\r\n", b"\n", b""):
+                nome, _, valor = linha.decode("latin-1").partition(":")
+                cabecalhos[nome.strip().lower()] = valor.strip()
+            tamanho_corpo = cabecalhos.get("content-length", "0") or "0"
+            if not tamanho_corpo.isdigit():
+                # Sem um tamanho válido não há como achar o fim do corpo
+                await _enviar(escritor, 400, _json({"erro": "Content-Length inválido."}), False)
+                break
+            if int(tamanho_corpo):
+                await leitor.readexactly(int(tamanho_corpo))
+
+            manter = (versao == "HTTP/1.1" and cabecalhos.get("connection", "").lower() != "close")
+            try:
+                status, corpo = await servico.responder(metodo, alvo)
+            except Exception as erro:  # não derruba a conexão por um erro inesperado
+                status, corpo = 500, _json({"erro": f"{type(erro).__name__}: {erro}"})
+            await _enviar(escritor, status, corpo, manter)
+            if not manter:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    except (ValueError, asyncio.LimitOverrunError):
+        # Linha maior que o limite do StreamReader (readline levanta ValueError)
+        try:
+            await _enviar(escritor, 400, _json({"erro": "Requisição muito longa."}), False)
+        except ConnectionError:
+            pass
+    finally:
+        escritor.close()
+
+
+async def executar_servico(caminhos, host="127.0.0.1", porta=8080, processos=None, ttl=60.0, tamanho_cache=1024):
+    """Carrega as planilhas e atende até ser interrompido."""
+    servico = ServicoClimatico(caminhos, processos, ttl, tamanho_cache)
+    try:
+        await servico.carregar()
+        servidor = await asyncio.start_server(
+            lambda leitor, escritor: atender_conexao(servico, leitor, escritor), host, porta
+        )
+        print(f"Serviço climático em http://{host}:{porta} ({len(servico.dados)} planilha(s)).")
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        servico.fechar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP local das análises climáticas.")
+    parser.add_argument("planilhas", nargs="+", help="Planilhas .xlsx a carregar.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8080)
+    parser.add_argument("--processos", type=int, default=None,
+                        help="Processos usados para carregar as planilhas.")
+    parser.add_argument("--ttl", type=float, default=60.0, help="Validade das respostas em cache (s).")
+    parser.add_argument("--cache", type=int, default=1024, help="Quantidade máxima de respostas em cache.")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(executar_servico(args.planilhas, args.host, args.porta, args.processos, args.ttl, args.cache))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+async def _enviar(escritor, status, corpo, manter_conexao):
+    cabecalho = (
+        f"HTTP/1.1 {status} {_MENSAGENS_STATUS.get(status, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(corpo)}\r\n"
+        f"Connection: {'keep-alive' if manter_conexao else 'close'}\r\n\r\n"
+    )
+    escritor.write(cabecalho.encode("latin-1") + corpo)
+    await escritor.drain()
+
+
+def _json(dados):
+    return json.dumps(_sem_nan(dados), ensure_ascii=False, default=_valor_json).encode("utf-8")
+
+
+def _valor_json(valor):
+    # Escalares NumPy (np.int64, np.bool_, ...) viram tipos nativos
+    if hasattr(valor, "item"):
+        return valor.item()
+    raise TypeError(f"Tipo {type(valor).__name__} não serializável em JSON.")
+
+
+def _sem_nan(dados):
+    # NaN não é JSON válido: vira null (float do Python ou escalar NumPy)
+    if isinstance(dados, numbers.Real) and not isinstance(dados, numbers.Integral) \
+            and math.isnan(float(dados)):
+        return None
+    if isinstance(dados, dict):
+        return {k: _sem_nan(v) for k, v in dados.items()}
+    if isinstance(dados, (list, tuple)):
+        return [_sem_nan(v) for v in dados]
+    return dados
+
+
+if __name__ == "__main__":
+    sys.exit(main())
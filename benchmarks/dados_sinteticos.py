@@ -0,0 +1,108 @@
+# dados_sinteticos.py
+
+import random
+
+import numpy as np
+import openpyxl
+
+MESES = [
+    "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
+]
+
+METRICAS = [
+    "Temperatura média (°C)", "Temperatura mínima (°C)", "Temperatura máxima (°C)",
+    "Chuva (mm)", "Umidade(%)", "Dias chuvosos (d)", "Horas de sol (h)"
+]
+
+# As duas primeiras abas têm os nomes esperados por carregar_e_preparar_dados_climaticos
+CIDADES_FIXAS = ["Macae", "Rio_de_Janeiro"]
+
+
+def gerar_planilha_sintetica(caminho, n_estacoes=2, n_anos=1, semente=0):
+    """
+    Gera uma planilha com o mesmo layout das abas Historico_Clima_*.
+
+    Linhas 1-2: título e referência; linha 4: meses (com o ano quando há mais
+    de um); linhas 5-11: métricas. Como na planilha original, parte dos
+    números é gravada como texto.
+
+    Args:
+        caminho (str): O caminho do arquivo .xlsx a ser gerado.
+        n_estacoes (int): Quantidade de abas (estações); mínimo 2.
+        n_anos (int): Quantidade de anos (blocos de 12 colunas) por aba.
+        semente (int): Semente dos números aleatórios.
+
+    Returns:
+        list: Os nomes das abas geradas.
+    """
+    gerador = np.random.default_rng(semente)
+    aleatorio = random.Random(semente)
+    workbook = openpyxl.Workbook(write_only=True)
+
+    nomes = CIDADES_FIXAS + [f"Estacao_{i:05d}" for i in range(max(0, n_estacoes - 2))]
+    if n_anos == 1:
+        cabecalho = list(MESES)
+    else:
+        cabecalho = [f"{mes} {1991 + ano}" for ano in range(n_anos) for mes in MESES]
+    n_colunas = len(cabecalho)
+
+    for nome in nomes:
+        planilha = workbook.create_sheet(f"Historico_Clima_{nome}")
+        planilha.append([f"DADOS CLIMATOLÓGICOS SINTÉTICOS PARA {nome.upper()}"])
+        planilha.append(["Referência: gerado por benchmarks/dados_sinteticos.py"])
+        planilha.append([])
+        planilha.append([None] + cabecalho)
+
+        sazonal = np.cos(np.arange(n_colunas) * 2 * np.pi / 12)
+        media = 23 + 3 * sazonal + gerador.normal(0, 0.5, n_colunas)
+        linhas = [
+            media,
+            media - 3 - gerador.random(n_colunas),
+            media + 3 + gerador.random(n_colunas),
+            np.round(100 + 60 * sazonal + gerador.normal(0, 20, n_colunas)).clip(0),
+            np.round(0.8 + gerador.normal(0, 0.02, n_colunas), 2),
+            np.round(9 + 3 * sazonal).clip(0),
+            np.round(8 + sazonal, 1),
+        ]
+        for rotulo, valores in zip(METRICAS, linhas):
+            celulas = [round(float(v), 1) if rotulo != "Umidade(%)" else float(v) for v in valores]
+            # Imita a planilha original: alguns números gravados como texto
+            celulas = [str(v) if aleatorio.random() < 0.5 else v for v in celulas]
+            planilha.append([rotulo] + celulas)
+        planilha.append([])
+        planilha.append(["Obs.: dados sintéticos para benchmark."])
+
+    workbook.save(caminho)
+    return [f"Historico_Clima_{nome}" for nome in nomes]
+
+
+def gerar_texto_sintetico(caminho, n_caracteres, semente=0):
+    """
+    Gera um arquivo de texto UTF-8 com vogais acentuadas (entrada da atividade 2).
+
+    Args:
+        caminho (str): O caminho do arquivo a ser gerado.
+        n_caracteres (int): Quantidade aproximada de caracteres.
+        semente (int): Semente dos números aleatórios.
+    """
+    aleatorio = random.Random(semente)
+    palavras = ["ação", "clima", "Macaé", "chuva", "umidade", "TEMPERATURA", "média",
+                "máxima", "mínima", "estação", "você", "pôr", "útil", "rio", "janeiro"]
+    linha = " ".join(aleatorio.choice(palavras) for _ in range(2000)) + "\n"
+    with open(caminho, mode="w", encoding="utf-8") as arquivo:
+        for _ in range(max(1, n_caracteres // len(linha))):
+            arquivo.write(linha)
+
+
+def gerar_numeros_sinteticos(caminho, n_numeros, semente=0):
+    """
+    Gera um arquivo com números reais separados por espaço (entrada da atividade 1).
+
+    Args:
+        caminho (str): O caminho do arquivo a ser gerado.
+        n_numeros (int): Quantidade de números.
+        semente (int): Semente dos números aleatórios.
+    """
+    numeros = np.random.default_rng(semente).uniform(-1e6, 1e6, n_numeros)
+    np.savetxt(caminho, numeros.reshape(-1, 1), fmt="%.3f")
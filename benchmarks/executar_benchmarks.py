@@ -0,0 +1,343 @@
+# executar_benchmarks.py
+
+"""
+Mede tempo e pico de memória das funções das seis atividades.
+
+Gera planilhas sintéticas (escalando em estações e anos) e entradas grandes
+para as atividades 1 e 2, executa cada função e grava os resultados em JSON.
+Com --comparar, mostra a razão entre os tempos atuais e os de um JSON anterior.
+
+Uso:
+    python benchmarks/executar_benchmarks.py [--estacoes 2,50] [--anos 1,10]
+        [--dias 10950] [--repeticoes 3] [--saida resultados.json] [--comparar anterior.json]
+"""
+
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use("Agg")  # sem janelas: plt.show() não bloqueia
+
+import numpy as np
+
+RAIZ_PROJETO = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+for _pasta in ("atividade_01_num_list", "atividade_02_vogais", "atividade_03_macae",
+               "atividade_04_numpy_rj", "atividade_05_matplotlib", "atividade_06_pandas"):
+    sys.path.insert(0, os.path.join(RAIZ_PROJETO, _pasta))
+sys.path.insert(0, RAIZ_PROJETO)
+
+import analise_climatica_lib as aclib
+import analise_lib as palib
+import atividade_1
+import atividade_2
+import operacoes_lib as nplib
+import visualizacao_lib as mplotlib
+from clima_comum import cache_derivacoes, carregador
+from clima_comum.registro_estacao import RegistroEstacao
+
+import dados_sinteticos
+
+# Razão de tempo a partir da qual a comparação aponta uma regressão
+LIMIAR_REGRESSAO = 1.2
+
+
+def main(argv=None):
+    args = interpretar_argumentos(argv)
+    # Mede o trabalho real: sem reaproveitar resultados do cache em disco
+    cache_derivacoes.configurar_cache(ativo=False)
+
+    with tempfile.TemporaryDirectory(prefix="bench_clima_") as pasta:
+        resultados = []
+        for n_estacoes in args.estacoes:
+            for n_anos in args.anos:
+                resultados += medir_planilha(pasta, n_estacoes, n_anos, args.repeticoes)
+        resultados += medir_atividades_texto(pasta, args.numeros, args.caracteres, args.repeticoes)
+        resultados += medir_memoria_registros(args.registros)
+        resultados += medir_graficos_longos(pasta, args.dias, args.repeticoes)
+
+    relatorio = {"metadados": coletar_metadados(), "resultados": resultados}
+    with open(args.saida, mode="w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+    print(f"\nResultados salvos em '{args.saida}'.")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            anterior = json.load(arquivo)
+        regressoes = comparar_resultados(anterior["resultados"], resultados, args.limiar)
+        return 1 if regressoes else 0
+    return 0
+
+
+def interpretar_argumentos(argv=None):
+    """Lê os argumentos da linha de comando."""
+    def lista_inteiros(texto):
+        return [int(valor) for valor in texto.split(",")]
+
+    parser = argparse.ArgumentParser(description="Benchmarks das bibliotecas climáticas.")
+    parser.add_argument("--estacoes", type=lista_inteiros, default=[2, 50],
+                        help="Quantidades de estações (abas) das planilhas sintéticas.")
+    parser.add_argument("--anos", type=lista_inteiros, default=[1, 10],
+                        help="Quantidades de anos (blocos de 12 meses) por aba.")
+    parser.add_argument("--numeros", type=int, default=1_000_000,
+                        help="Quantidade de números da entrada da atividade 1.")
+    parser.add_argument("--caracteres", type=int, default=20_000_000,
+                        help="Tamanho aproximado do texto da atividade 2.")
+    parser.add_argument("--registros", type=int, default=10_000,
+                        help="Estações mantidas em memória na comparação de formatos.")
+    parser.add_argument("--dias", type=int, default=365 * 30,
+                        help="Dias da série diária dos gráficos longos (decimados).")
+    parser.add_argument("--repeticoes", type=int, default=3,
+                        help="Repetições de cada medida (vale o menor tempo).")
+    parser.add_argument("--saida", default="resultados_benchmark.json")
+    parser.add_argument("--comparar", default=None,
+                        help="JSON de uma execução anterior para comparação.")
+    parser.add_argument("--limiar", type=float, default=LIMIAR_REGRESSAO,
+                        help="Razão de tempo considerada regressão.")
+    return parser.parse_args(argv)
+
+
+def medir(nome, caso, funcao, repeticoes, preparar=None):
+    """
+    Mede uma função: menor tempo entre as repetições e pico de memória.
+
+    Args:
+        nome (str): O nome da função medida.
+        caso (str): A descrição da entrada (ex.: "50 estações x 10 anos").
+        funcao (callable): A função, sem argumentos.
+        repeticoes (int): Quantas vezes medir o tempo.
+        preparar (callable, optional): Executado antes de cada medida, fora
+                                       do tempo (ex.: limpar caches).
+
+    Returns:
+        dict: Dicionário com nome, caso, segundos e pico_memoria_bytes.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    if preparar:
+        preparar()
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    resultado = {"nome": nome, "caso": caso, "segundos": min(tempos), "pico_memoria_bytes": pico}
+    print(f"{nome:<45} {caso:<28} {resultado['segundos'] * 1000:10.2f} ms {pico / 1024 ** 2:9.2f} MiB")
+    return resultado
+
+
+def medir_planilha(pasta, n_estacoes, n_anos, repeticoes):
+    """Mede as funções das atividades 3 a 6 sobre uma planilha sintética."""
+    caso = f"{n_estacoes} estações x {n_anos} anos"
+    excel = os.path.join(pasta, f"sintetica_{n_estacoes}_{n_anos}.xlsx")
+    dados_sinteticos.gerar_planilha_sintetica(excel, n_estacoes, n_anos)
+    txt = os.path.join(pasta, "macae.txt")
+    binario = os.path.join(pasta, "macae.climabin")
+    planilha = "Historico_Clima_Macae"
+    limpar = carregador._carregar_planilhas.cache_clear  # mede a leitura a frio
+
+    resultados = [
+        medir("gerar_arquivo_txt_de_excel", caso,
+              lambda: aclib.gerar_arquivo_txt_de_excel(excel, planilha, txt), repeticoes, limpar),
+        medir("gerar_arquivo_txt_de_excel[binario]", caso,
+              lambda: aclib.gerar_arquivo_txt_de_excel(excel, planilha, binario, "binario"), repeticoes, limpar),
+        medir("carregar_dados_climaticos_numpy", caso,
+              lambda: nplib.carregar_dados_climaticos_numpy(txt), repeticoes),
+        medir("carregar_dados_climaticos_numpy[binario]", caso,
+              lambda: nplib.carregar_dados_climaticos_numpy(binario), repeticoes),
+        medir("carregar_e_preparar_dados_climaticos", caso,
+              lambda: palib.carregar_e_preparar_dados_climaticos(excel), repeticoes, limpar),
+    ]
+
+    df_macae, df_rio = palib.carregar_e_preparar_dados_climaticos(excel)
+    medias = palib.calcular_medias_anuais_temperatura(df_macae, df_rio)
+    analise = palib.realizar_analise_detalhada_clima(df_macae, df_rio)
+    df_cidades = palib.carregar_dados_cidades(excel)
+    relatorio = os.path.join(pasta, "relatorio.xlsx")
+    resultados += [
+        medir("realizar_analise_detalhada_clima", caso,
+              lambda: palib.realizar_analise_detalhada_clima(df_macae, df_rio), repeticoes),
+        medir("analisar_cidades", caso,
+              lambda: palib.analisar_cidades(df_cidades), repeticoes),
+        medir("gerar_relatorio_excel", caso,
+              lambda: palib.gerar_relatorio_excel(relatorio, df_macae, df_rio, *medias, *analise), repeticoes),
+    ]
+
+    # Gráficos: um ano basta (o custo é dominado pelo savefig)
+    if n_anos == 1:
+        meses, minimas, maximas, medias_temp = aclib.ler_dados_climaticos_de_txt(txt)
+        dados = nplib.carregar_dados_climaticos_numpy(txt)
+        eixo = np.arange(1, len(meses) + 1)
+        graficos = os.path.join(pasta, "graficos")
+        os.makedirs(graficos, exist_ok=True)
+        dados_cidades = {
+            nome: df[["Minima_Temp_C", "Maxima_Temp_C", "Media_Temp_C"]].to_numpy()
+            for nome, df in df_cidades.groupby(level=palib.NIVEL_CIDADE, sort=False)
+        }
+        resultados += [
+            medir("plotar_grafico_temperaturas", caso,
+                  lambda: aclib.plotar_grafico_temperaturas(
+                      meses, minimas, maximas, medias_temp, os.path.join(graficos, "a3.png"), mostrar=False),
+                  repeticoes),
+            medir("plotar_grafico_temperaturas_cidade", caso,
+                  lambda: mplotlib.plotar_grafico_temperaturas_cidade(eixo, dados, "Macaé", graficos, mostrar=False),
+                  repeticoes),
+            medir("plotar_comparativo_medias", caso,
+                  lambda: mplotlib.plotar_comparativo_medias(eixo, dados, dados, graficos, mostrar=False),
+                  repeticoes),
+            medir("renderizar_graficos_cidades", caso,
+                  lambda: mplotlib.renderizar_graficos_cidades(
+                      eixo, dados_cidades, graficos, pular_inalterados=False),
+                  1),
+        ]
+    return resultados
+
+
+def medir_atividades_texto(pasta, n_numeros, n_caracteres, repeticoes):
+    """Mede os modos em lote das atividades 1 e 2."""
+    numeros = os.path.join(pasta, "numeros.txt")
+    texto = os.path.join(pasta, "texto.txt")
+    dados_sinteticos.gerar_numeros_sinteticos(numeros, n_numeros)
+    dados_sinteticos.gerar_texto_sintetico(texto, n_caracteres)
+
+    def atividade_1_lote():
+        with open(numeros, encoding="utf-8") as entrada:
+            atividade_1.processar_em_lote(entrada, io.StringIO())
+
+    return [
+        medir("atividade_1.processar_em_lote", f"{n_numeros} números", atividade_1_lote, repeticoes),
+        medir("atividade_2.contar_vogais_arquivo", f"{n_caracteres} caracteres",
+              lambda: atividade_2.contar_vogais_arquivo(texto), repeticoes),
+    ]
+
+
+def medir_memoria_registros(n_estacoes, n_meses=12):
+    """
+    Compara a memória retida por muitas estações em cada formato de dados.
+
+    Os formatos são as listas de ler_dados_climaticos_de_txt, o dicionário de
+    criar_dicionario_climatico e o RegistroEstacao. Como na leitura de arquivos
+    reais, cada estação recebe seus próprios floats e strings de meses.
+    """
+    caso = f"{n_estacoes} estações x {n_meses} meses"
+    gerador = np.random.default_rng(0)
+    # Textos como os lidos do TXT: cada estação gera seus próprios floats e strings
+    temperaturas = [[[f"{valor:.1f}" for valor in coluna] for coluna in estacao]
+                    for estacao in gerador.uniform(15, 35, size=(n_estacoes, 3, n_meses))]
+    nomes_meses = [f"Mes {i + 1:02d}".encode() for i in range(n_meses)]
+
+    def listas(i):
+        minimas, maximas, medias = temperaturas[i]
+        return ([nome.decode() for nome in nomes_meses], [float(v) for v in minimas],
+                [float(v) for v in maximas], [float(v) for v in medias])
+
+    formatos = {
+        "listas": listas,
+        "dicionario": lambda i: aclib.criar_dicionario_climatico(*listas(i)),
+        "RegistroEstacao": lambda i: RegistroEstacao(*listas(i)),
+    }
+    resultados = []
+    for formato, montar in formatos.items():
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        estacoes = [montar(i) for i in range(n_estacoes)]
+        segundos = time.perf_counter() - inicio
+        retida, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del estacoes
+        resultados.append({"nome": f"memoria.{formato}", "caso": caso, "segundos": segundos,
+                           "pico_memoria_bytes": pico, "memoria_retida_bytes": retida})
+        print(f"{'memoria.' + formato:<45} {caso:<28} {segundos * 1000:10.2f} ms "
+              f"{retida / 1024 ** 2:9.2f} MiB retidos")
+    return resultados
+
+
+def medir_graficos_longos(pasta, n_dias, repeticoes):
+    """
+    Mede os gráficos de temperatura com uma série diária de vários anos.
+
+    As séries passam do limite de pontos por gráfico e são decimadas
+    (clima_comum.decimacao) antes do matplotlib; o tempo deve ficar próximo
+    ao dos gráficos de 12 meses, qualquer que seja o número de dias.
+    """
+    caso = f"{n_dias} dias"
+    gerador = np.random.default_rng(0)
+    dias = np.datetime64("1990-01-01") + np.arange(n_dias)
+    sazonal = 25 + 5 * np.sin(np.arange(n_dias) * 2 * np.pi / 365.25)
+    medias = sazonal + gerador.normal(0, 1, n_dias)
+    dados = np.column_stack([medias - 4, medias + 4, medias])
+    rotulos = [str(dia) for dia in dias]
+    graficos = os.path.join(pasta, "graficos_longos")
+    os.makedirs(graficos, exist_ok=True)
+    return [
+        medir("plotar_grafico_temperaturas", caso,
+              lambda: aclib.plotar_grafico_temperaturas(
+                  rotulos, dados[:, 0], dados[:, 1], dados[:, 2], os.path.join(graficos, "a3.png"), mostrar=False),
+              repeticoes),
+        medir("plotar_grafico_temperaturas_cidade", caso,
+              lambda: mplotlib.plotar_grafico_temperaturas_cidade(dias, dados, "Macaé", graficos, mostrar=False),
+              repeticoes),
+    ]
+
+
+def comparar_resultados(anteriores, atuais, limiar=LIMIAR_REGRESSAO):
+    """
+    Mostra a razão entre os tempos atuais e anteriores de cada medida.
+
+    Args:
+        anteriores (list): Os resultados de uma execução anterior.
+        atuais (list): Os resultados desta execução.
+        limiar (float): Razão a partir da qual a medida é uma regressão.
+
+    Returns:
+        list: As medidas (nome, caso) que regrediram.
+    """
+    indice = {(r["nome"], r["caso"]): r for r in anteriores}
+    regressoes = []
+    print("\n=== Comparação com a execução anterior ===")
+    for atual in atuais:
+        anterior = indice.get((atual["nome"], atual["caso"]))
+        if anterior is None or anterior["segundos"] == 0:
+            continue
+        razao = atual["segundos"] / anterior["segundos"]
+        marcador = "  <-- regressão" if razao >= limiar else ""
+        print(f"{atual['nome']:<45} {atual['caso']:<28} {razao:6.2f}x{marcador}")
+        if razao >= limiar:
+            regressoes.append((atual["nome"], atual["caso"]))
+    return regressoes
+
+
+def coletar_metadados():
+    """Retorna informações do ambiente para acompanhar os resultados."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ_PROJETO,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "data": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+    }
+
+
+if __name__ == "__main__":
+    sys.exit(main())
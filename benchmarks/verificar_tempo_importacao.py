@@ -0,0 +1,98 @@
+# verificar_tempo_importacao.py
+
+"""
+Verifica o custo de importação das bibliotecas climáticas.
+
+Cada biblioteca é importada em um processo Python novo (o cache de módulos
+não interfere); o script mede o tempo da importação, confere que nenhuma
+dependência pesada (NumPy, pandas, matplotlib, openpyxl) foi carregada e
+termina com código 1 se alguma biblioteca estourar o orçamento.
+
+Uso:
+    python benchmarks/verificar_tempo_importacao.py [--orcamento-ms 150] [--repeticoes 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+RAIZ_PROJETO = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+# Orçamento padrão, em milissegundos, para importar uma biblioteca
+ORCAMENTO_MS = 150
+
+# Dependências que só podem ser importadas no primeiro uso
+DEPENDENCIAS_PESADAS = ("numpy", "pandas", "matplotlib", "openpyxl")
+
+# Importações medidas: o pacote compartilhado e as quatro bibliotecas por ele
+IMPORTACOES = {
+    "clima_comum": "import clima_comum",
+    "analise_climatica_lib": "import clima_comum; clima_comum.analise_climatica_lib",
+    "operacoes_lib": "import clima_comum; clima_comum.operacoes_lib",
+    "visualizacao_lib": "import clima_comum; clima_comum.visualizacao_lib",
+    "analise_lib": "import clima_comum; clima_comum.analise_lib",
+}
+
+_SCRIPT_MEDICAO = """
+import json, sys, time
+inicio = time.perf_counter()
+{importacao}
+duracao = time.perf_counter() - inicio
+pesadas = sorted({{nome.split(".")[0] for nome in sys.modules}} & set({pesadas!r}))
+print(json.dumps({{"segundos": duracao, "pesadas": pesadas}}))
+"""
+
+
+def main(argv=None):
+    args = interpretar_argumentos(argv)
+    falhas = 0
+    for nome, importacao in IMPORTACOES.items():
+        segundos, pesadas = medir_importacao(importacao, args.repeticoes)
+        milissegundos = segundos * 1000
+        problemas = []
+        if milissegundos > args.orcamento_ms:
+            problemas.append(f"acima do orçamento de {args.orcamento_ms:g} ms")
+        if pesadas:
+            problemas.append("importou " + ", ".join(pesadas))
+        situacao = "FALHA: " + "; ".join(problemas) if problemas else "ok"
+        print(f"{nome:<24} {milissegundos:8.1f} ms  {situacao}")
+        falhas += bool(problemas)
+    return 1 if falhas else 0
+
+
+def interpretar_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Orçamento de tempo de importação das bibliotecas.")
+    parser.add_argument("--orcamento-ms", type=float, default=ORCAMENTO_MS,
+                        help="tempo máximo de importação de cada biblioteca (ms)")
+    parser.add_argument("--repeticoes", type=int, default=5,
+                        help="processos por biblioteca; vale o menor tempo")
+    return parser.parse_args(argv)
+
+
+def medir_importacao(importacao, repeticoes):
+    """
+    Importa em processos novos e retorna o menor tempo e as dependências pesadas.
+
+    Args:
+        importacao (str): O código Python que faz a importação.
+        repeticoes (int): Quantos processos executar.
+
+    Returns:
+        tuple: (menor tempo em segundos, lista de dependências pesadas carregadas).
+    """
+    script = _SCRIPT_MEDICAO.format(importacao=importacao, pesadas=DEPENDENCIAS_PESADAS)
+    tempos = []
+    pesadas = []
+    for _ in range(max(1, repeticoes)):
+        saida = subprocess.run([sys.executable, "-c", script], cwd=RAIZ_PROJETO,
+                               capture_output=True, text=True, check=True)
+        resultado = json.loads(saida.stdout.strip().splitlines()[-1])
+        tempos.append(resultado["segundos"])
+        pesadas = resultado["pesadas"]
+    return min(tempos), pesadas
+
+
+if __name__ == "__main__":
+    sys.exit(main())
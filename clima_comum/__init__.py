@@ -0,0 +1,42 @@
+# clima_comum/__init__.py
+"""
+Código compartilhado pelas bibliotecas climáticas das atividades 3 a 6.
+
+As quatro bibliotecas também ficam acessíveis pelo pacote, importadas só no
+primeiro acesso (e com as dependências pesadas adiadas até o primeiro uso):
+
+    import clima_comum
+    clima_comum.analise_lib.carregar_dados_cidades("data/Dados_climaticos_historicos.xlsx")
+"""
+
+import importlib
+import os
+import sys
+
+# Biblioteca -> pasta da atividade onde ela fica
+BIBLIOTECAS = {
+    "analise_climatica_lib": "atividade_03_macae",
+    "operacoes_lib": "atividade_04_numpy_rj",
+    "visualizacao_lib": "atividade_05_matplotlib",
+    "analise_lib": "atividade_06_pandas",
+}
+
+_RAIZ_PROJETO = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+
+def __getattr__(nome):
+    pasta = BIBLIOTECAS.get(nome)
+    if pasta is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    # Mesmo nome de módulo usado pelos notebooks/CLIs de cada pasta, para que
+    # a biblioteca não seja carregada duas vezes
+    caminho = os.path.join(_RAIZ_PROJETO, pasta)
+    if caminho not in sys.path:
+        sys.path.append(caminho)
+    modulo = importlib.import_module(nome)
+    globals()[nome] = modulo
+    return modulo
+
+
+def __dir__():
+    return sorted(set(globals()) | set(BIBLIOTECAS))
@@ -0,0 +1,161 @@
+# agregacao.py
+
+from clima_comum import carregador
+from clima_comum.estatisticas import resumir_metricas
+from clima_comum.importacao_tardia import modulo_tardio
+
+np = modulo_tardio("numpy")
+
+# Meses por bloco lidos de cada estação (um ano)
+TAMANHO_BLOCO = 12
+
+
+class AgregadoParcial:
+    """
+    Mínimo, máximo (com o rótulo de onde ocorreram), soma e contagem de cada
+    métrica de uma estação, acumulados bloco a bloco.
+
+    Dois agregados da mesma estação podem ser combinados (ex.: resultados de
+    processos diferentes): o resultado é exatamente o mesmo que se todos os
+    blocos tivessem passado por um único agregado, de modo que médias e
+    extremos não dependem de ter o acervo inteiro em memória. Em empates, vale
+    o primeiro rótulo, como em idxmax/idxmin.
+    """
+
+    __slots__ = ("minimo", "rotulo_minimo", "maximo", "rotulo_maximo", "soma", "contagem")
+
+    def __init__(self, n_metricas):
+        """
+        Args:
+            n_metricas (int): O número de métricas (colunas dos blocos).
+        """
+        self.minimo = np.full(n_metricas, np.inf)
+        self.maximo = np.full(n_metricas, -np.inf)
+        self.rotulo_minimo = np.full(n_metricas, None, dtype=object)
+        self.rotulo_maximo = np.full(n_metricas, None, dtype=object)
+        self.soma = np.zeros(n_metricas)
+        self.contagem = np.zeros(n_metricas, dtype=np.int64)
+
+    @property
+    def media(self):
+        """numpy.ndarray: A média de cada métrica (NaN se não houver valores)."""
+        return np.divide(self.soma, self.contagem, out=np.full(self.soma.shape, np.nan),
+                         where=self.contagem > 0)
+
+    def atualizar(self, rotulos, valores):
+        """
+        Acrescenta um bloco de observações, posterior às já acumuladas.
+
+        Args:
+            rotulos (sequence): O rótulo (mês) de cada linha do bloco.
+            valores (numpy.ndarray): Array (linhas x métricas) do bloco.
+        """
+        resumo = resumir_metricas(valores)
+        rotulos = np.asarray(rotulos, dtype=object)
+        validos = resumo.contagem > 0
+        self._absorver(resumo.minimo, np.where(validos, rotulos[resumo.posicao_minimo], None),
+                       resumo.maximo, np.where(validos, rotulos[resumo.posicao_maximo], None),
+                       resumo.soma, resumo.contagem)
+
+    def combinar(self, outro):
+        """
+        Acrescenta um agregado de blocos posteriores aos deste.
+
+        Args:
+            outro (AgregadoParcial): O agregado a combinar.
+
+        Returns:
+            AgregadoParcial: Este agregado, atualizado.
+        """
+        self._absorver(outro.minimo, outro.rotulo_minimo, outro.maximo, outro.rotulo_maximo,
+                       outro.soma, outro.contagem)
+        return self
+
+    def _absorver(self, minimo, rotulo_minimo, maximo, rotulo_maximo, soma, contagem):
+        # Comparações estritas: em empate fica o rótulo mais antigo
+        menor = minimo < self.minimo
+        self.minimo[menor] = minimo[menor]
+        self.rotulo_minimo[menor] = rotulo_minimo[menor]
+        maior = maximo > self.maximo
+        self.maximo[maior] = maximo[maior]
+        self.rotulo_maximo[maior] = rotulo_maximo[maior]
+        self.soma += soma
+        self.contagem += contagem
+
+
+def iterar_blocos_planilhas(arquivos_excel, tamanho_bloco=TAMANHO_BLOCO, n_metricas=None,
+                            prefixo=carregador.PREFIXO_PLANILHA_CLIMA):
+    """
+    Gera blocos de meses de cada estação de vários arquivos, uma aba por vez.
+
+    Só uma aba fica em memória por vez (ver carregador.iterar_planilhas_climaticas),
+    mas cada aba é lida inteira antes de ser dividida: os meses são colunas e a
+    leitura do openpyxl é por linha. O pico de memória acompanha a maior aba,
+    não o arquivo. O nome da estação vem de carregador.nome_estacao.
+
+    Args:
+        arquivos_excel (iterable): Os caminhos dos arquivos .xlsx.
+        tamanho_bloco (int): Quantos meses (colunas da aba) entram em cada bloco.
+        n_metricas (int, optional): Usa só as primeiras n linhas de métricas.
+        prefixo (str): O prefixo das abas climáticas.
+
+    Yields:
+        tuple: (estacao, meses, valores), com `valores` no formato
+               (meses do bloco x métricas).
+
+    Raises:
+        ValueError: Se uma aba tiver menos de `n_metricas` linhas de métricas.
+    """
+    for arquivo_excel in arquivos_excel:
+        for nome_planilha, dados in carregador.iterar_planilhas_climaticas(arquivo_excel, prefixo):
+            estacao = carregador.nome_estacao(nome_planilha, prefixo)
+            if n_metricas is not None and len(dados.metricas) < n_metricas:
+                raise ValueError(f"A aba '{nome_planilha}' de '{arquivo_excel}' tem "
+                                 f"{len(dados.metricas)} linhas de métricas; esperadas {n_metricas}.")
+            valores = dados.valores[:n_metricas]
+            for inicio in range(0, len(dados.meses), tamanho_bloco):
+                fim = inicio + tamanho_bloco
+                yield estacao, dados.meses[inicio:fim], valores[:, inicio:fim].T
+
+
+def agregar_blocos(blocos):
+    """
+    Acumula uma sequência de blocos (ex.: de iterar_blocos_planilhas) por estação.
+
+    Args:
+        blocos (iterable): Tuplas (estacao, rotulos, valores), com os blocos de
+                           cada estação em ordem cronológica.
+
+    Returns:
+        dict: {estacao: AgregadoParcial}, na ordem em que as estações aparecem.
+    """
+    agregados = {}
+    for estacao, rotulos, valores in blocos:
+        agregado = agregados.get(estacao)
+        if agregado is None:
+            agregado = agregados[estacao] = AgregadoParcial(valores.shape[1])
+        agregado.atualizar(rotulos, valores)
+    return agregados
+
+
+def combinar_agregados(*grupos):
+    """
+    Junta resultados de agregar_blocos (ex.: um por arquivo ou por processo).
+
+    Estações presentes em mais de um grupo são combinadas na ordem dos grupos
+    (o agregado do primeiro grupo em que a estação aparece é atualizado).
+
+    Args:
+        *grupos (dict): Dicionários {estacao: AgregadoParcial}.
+
+    Returns:
+        dict: {estacao: AgregadoParcial} combinado.
+    """
+    combinados = {}
+    for grupo in grupos:
+        for estacao, agregado in grupo.items():
+            if estacao in combinados:
+                combinados[estacao].combinar(agregado)
+            else:
+                combinados[estacao] = agregado
+    return combinados
@@ -0,0 +1,30 @@
+# arquivos.py
+
+import os
+import uuid
+
+
+def gravar_atomicamente(caminho, *blocos):
+    """
+    Grava um arquivo de uma vez só, substituindo o anterior atomicamente.
+
+    Os blocos são gravados em um temporário na mesma pasta, que depois toma o
+    lugar do destino com os.replace: quem lê o arquivo (ou o tem mapeado em
+    memória) nunca vê uma versão pela metade. O temporário é criado com open,
+    respeitando a umask, como uma gravação comum.
+
+    Args:
+        caminho (str): O caminho do arquivo.
+        *blocos (bytes): O conteúdo, em um ou mais pedaços.
+    """
+    pasta, nome = os.path.split(os.path.abspath(caminho))
+    temporario = os.path.join(pasta, f".{nome}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(temporario, mode="wb") as arquivo:
+            for bloco in blocos:
+                arquivo.write(bloco)
+        os.replace(temporario, caminho)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
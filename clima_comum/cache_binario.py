@@ -0,0 +1,103 @@
+# cache_binario.py
+
+import json
+import struct
+
+from clima_comum.arquivos import gravar_atomicamente
+from clima_comum.importacao_tardia import modulo_tardio
+
+np = modulo_tardio("numpy")
+
+# Assinatura no início de todo arquivo de cache binário
+ASSINATURA = b"\x93CLIMA\x01\x00"
+
+# Os dados começam em um deslocamento múltiplo deste valor (permite mmap alinhado)
+ALINHAMENTO = 64
+
+EXTENSAO_CACHE_BINARIO = ".climabin"
+
+_TAMANHO_CABECALHO = struct.Struct("<I")
+
+
+def salvar_cache_binario(caminho, meses, colunas, valores):
+    """
+    Salva uma tabela climática no formato binário colunar.
+
+    O arquivo tem uma assinatura, um cabeçalho JSON (rótulos dos meses,
+    nomes das colunas, dtype e shape) e, a partir de um deslocamento
+    alinhado, os valores em float64 little-endian contíguos (ordem C).
+
+    Args:
+        caminho (str): O caminho do arquivo a ser gerado.
+        meses (sequence): Os rótulos das linhas (meses).
+        colunas (sequence): Os nomes das colunas numéricas.
+        valores (numpy.ndarray): Array com shape (len(meses), len(colunas)).
+
+    Raises:
+        ValueError: Se o shape dos valores não corresponder aos rótulos.
+    """
+    array = np.ascontiguousarray(valores, dtype="<f8")
+    if array.shape != (len(meses), len(colunas)):
+        raise ValueError(
+            f"Shape {array.shape} incompatível com {len(meses)} meses e {len(colunas)} colunas."
+        )
+
+    cabecalho = json.dumps({
+        "meses": [str(mes) for mes in meses],
+        "colunas": [str(coluna) for coluna in colunas],
+        "dtype": array.dtype.str,
+        "shape": list(array.shape),
+    }, ensure_ascii=False).encode("utf-8")
+
+    inicio = len(ASSINATURA) + _TAMANHO_CABECALHO.size + len(cabecalho)
+    cabecalho += b" " * (-inicio % ALINHAMENTO)
+
+    # Troca o arquivo de uma vez: quem estiver com a versão anterior mapeada
+    # em memória continua lendo-a intacta
+    gravar_atomicamente(caminho, ASSINATURA, _TAMANHO_CABECALHO.pack(len(cabecalho)),
+                        cabecalho, array.tobytes())
+
+
+def abrir_cache_binario(caminho):
+    """
+    Abre um cache binário sem copiar os dados (memory map somente leitura).
+
+    Args:
+        caminho (str): O caminho do arquivo de cache.
+
+    Returns:
+        tuple: Uma tupla (meses, colunas, valores), onde valores é um
+               numpy.memmap com shape (len(meses), len(colunas)).
+
+    Raises:
+        ValueError: Se o arquivo não estiver no formato de cache binário.
+    """
+    with open(caminho, mode="rb") as arquivo:
+        if arquivo.read(len(ASSINATURA)) != ASSINATURA:
+            raise ValueError(f"O arquivo '{caminho}' não é um cache binário climático.")
+        (tamanho,) = _TAMANHO_CABECALHO.unpack(arquivo.read(_TAMANHO_CABECALHO.size))
+        cabecalho = json.loads(arquivo.read(tamanho).decode("utf-8"))
+
+    deslocamento = len(ASSINATURA) + _TAMANHO_CABECALHO.size + tamanho
+    shape = tuple(cabecalho["shape"])
+    if 0 in shape:
+        # np.memmap não aceita mapear zero bytes
+        valores = np.empty(shape, dtype=cabecalho["dtype"])
+    else:
+        valores = np.memmap(caminho, dtype=cabecalho["dtype"], mode="r",
+                            offset=deslocamento, shape=shape)
+    return cabecalho["meses"], cabecalho["colunas"], valores
+
+
+def eh_cache_binario(caminho):
+    """
+    Verifica se um arquivo está no formato de cache binário.
+
+    Args:
+        caminho (str): O caminho do arquivo.
+
+    Returns:
+        bool: True se o arquivo começa com a assinatura do cache binário.
+    """
+    with open(caminho, mode="rb") as arquivo:
+        return arquivo.read(len(ASSINATURA)) == ASSINATURA
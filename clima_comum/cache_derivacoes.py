@@ -0,0 +1,295 @@
+# cache_derivacoes.py
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+
+from clima_comum.arquivos import gravar_atomicamente
+from clima_comum.importacao_tardia import ja_importado
+
+# Versão do formato das entradas; faz parte de todas as chaves
+VERSAO_CACHE = 2
+
+# Configuração do cache; pode ser alterada com configurar_cache(). O cache é
+# opcional: só é usado com CLIMA_CACHE_ATIVO=1 ou configurar_cache(ativo=True),
+# já que as entradas são pickles carregados da pasta do cache.
+_CONFIGURACAO = {
+    "diretorio": os.environ.get("CLIMA_CACHE_DIR")
+                 or os.path.join(os.path.expanduser("~"), ".cache", "clima_project"),
+    "tamanho_maximo": 256 * 1024 * 1024,  # bytes
+    "ativo": os.environ.get("CLIMA_CACHE_ATIVO", "") in ("1", "true", "sim"),
+}
+
+# Tamanho total das entradas da pasta do cache, contado na primeira gravação
+# e depois atualizado a cada gravação/remoção (None: ainda não contado)
+_ESTADO = {"tamanho_total": None}
+
+# Hashes de arquivos já calculados: {(caminho, mtime_ns, tamanho): hash}
+_HASHES_ARQUIVOS = {}
+
+_EXTENSAO_ENTRADA = ".pkl"
+
+
+def configurar_cache(diretorio=None, tamanho_maximo=None, ativo=None):
+    """
+    Altera a configuração do cache de derivações.
+
+    Args:
+        diretorio (str, optional): A pasta onde as entradas são gravadas.
+        tamanho_maximo (int, optional): O tamanho máximo do cache em bytes;
+                                        as entradas usadas há mais tempo são
+                                        removidas quando ele é excedido.
+        ativo (bool, optional): True ativa o cache; False o desativa (as
+                                funções sempre são executadas).
+    """
+    if diretorio is not None:
+        _CONFIGURACAO["diretorio"] = diretorio
+        _ESTADO["tamanho_total"] = None
+    if tamanho_maximo is not None:
+        _CONFIGURACAO["tamanho_maximo"] = tamanho_maximo
+    if ativo is not None:
+        _CONFIGURACAO["ativo"] = ativo
+
+
+def limpar_cache():
+    """Remove todas as entradas do cache de derivações."""
+    for caminho, _, _ in _listar_entradas():
+        _remover(caminho)
+    _ESTADO["tamanho_total"] = 0
+
+
+def memorizar_em_disco(argumentos_saida=(), argumentos_entrada=(), dependencias=(), versao=1):
+    """
+    Decorador que memoriza o resultado de uma função em disco.
+
+    A chave de cada entrada combina o nome da função, o código-fonte do
+    módulo dela e das dependências, a versão informada e o conteúdo dos
+    argumentos: os arquivos de `argumentos_entrada` entram pelo hash SHA-256
+    do conteúdo (e não pelo nome ou data), arrays e DataFrames pelo hash dos
+    dados e os demais valores pela sua representação. Assim, se a planilha
+    de origem e o código não mudaram, a função não é executada novamente.
+
+    Args:
+        argumentos_saida (tuple): Nomes dos argumentos que indicam arquivos
+                                  gerados pela função. Eles ficam fora da
+                                  chave; o conteúdo gerado é guardado junto
+                                  com o resultado e regravado no destino
+                                  quando a entrada é reaproveitada.
+        argumentos_entrada (tuple): Nomes dos argumentos que indicam arquivos
+                                    lidos pela função (hash do conteúdo,
+                                    quando são caminhos de arquivos
+                                    existentes). Os demais textos entram na
+                                    chave como texto, mesmo que coincidam
+                                    com o nome de um arquivo.
+        dependencias (tuple): Módulos (ou funções) de fora do módulo da
+                              função cujo código muda o resultado (ex.:
+                              carregador); o código-fonte deles entra na chave.
+        versao (int): Deve ser incrementada quando o resultado mudar por
+                      causa de código que não está no módulo da função nem
+                      nas dependências (ex.: uma atualização do pandas).
+
+    Returns:
+        callable: O decorador.
+    """
+    def decorador(funcao):
+        assinatura = inspect.signature(funcao)
+        nome_funcao = f"{funcao.__module__}.{funcao.__qualname__}"
+        # O código é lido na primeira chamada, não na importação
+        identificacao = []
+
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            if not _CONFIGURACAO["ativo"]:
+                return funcao(*args, **kwargs)
+
+            argumentos = assinatura.bind(*args, **kwargs)
+            argumentos.apply_defaults()
+            saidas = {nome: argumentos.arguments[nome] for nome in argumentos_saida}
+
+            if not identificacao:
+                codigos = [_codigo(inspect.getmodule(funcao) or funcao)]
+                codigos += [_codigo(dependencia) for dependencia in dependencias]
+                identificacao.append("|".join([nome_funcao, str(VERSAO_CACHE), str(versao)] + codigos))
+
+            resumo = hashlib.sha256(identificacao[0].encode("utf-8"))
+            for nome, valor in argumentos.arguments.items():
+                if nome not in saidas:
+                    resumo.update(nome.encode("utf-8"))
+                    _atualizar_resumo(resumo, valor, nome in argumentos_entrada)
+            chave = resumo.hexdigest()
+
+            entrada = _ler_entrada(chave)
+            if entrada is not None:
+                for nome, caminho in saidas.items():
+                    _restaurar_arquivo(caminho, entrada["saidas"][nome])
+                return entrada["resultado"]
+
+            resultado = funcao(*args, **kwargs)
+            conteudos = {}
+            for nome, caminho in saidas.items():
+                with open(caminho, mode="rb") as arquivo:
+                    conteudos[nome] = arquivo.read()
+            _gravar_entrada(chave, {"resultado": resultado, "saidas": conteudos})
+            return resultado
+
+        return envoltorio
+
+    return decorador
+
+
+def hash_arquivo(caminho):
+    """
+    Calcula (ou reaproveita) o hash SHA-256 do conteúdo de um arquivo.
+
+    O hash fica em memória enquanto a data de modificação e o tamanho do
+    arquivo não mudarem.
+
+    Args:
+        caminho (str): O caminho do arquivo.
+
+    Returns:
+        str: O hash em hexadecimal.
+    """
+    caminho = os.path.abspath(caminho)
+    estado = os.stat(caminho)
+    chave = (caminho, estado.st_mtime_ns, estado.st_size)
+    if chave not in _HASHES_ARQUIVOS:
+        resumo = hashlib.sha256()
+        with open(caminho, mode="rb") as arquivo:
+            for bloco in iter(lambda: arquivo.read(1024 * 1024), b""):
+                resumo.update(bloco)
+        _HASHES_ARQUIVOS[chave] = resumo.hexdigest()
+    return _HASHES_ARQUIVOS[chave]
+
+
+def _atualizar_resumo(resumo, valor, eh_entrada=False):
+    if eh_entrada and isinstance(valor, (str, os.PathLike)) and os.path.isfile(valor):
+        resumo.update(b"arquivo:" + hash_arquivo(valor).encode("ascii"))
+    elif _eh_ndarray(valor):
+        resumo.update(f"ndarray:{valor.dtype.str}:{valor.shape}".encode("utf-8"))
+        resumo.update(ja_importado("numpy").ascontiguousarray(valor).tobytes())
+    elif hasattr(valor, "to_numpy") and hasattr(valor, "index"):
+        # DataFrame/Series do pandas: rótulos + hash vetorizado dos dados
+        import pandas as pd
+        resumo.update(repr((type(valor).__name__, list(getattr(valor, "columns", [])),
+                            list(valor.index))).encode("utf-8"))
+        resumo.update(pd.util.hash_pandas_object(valor, index=False).to_numpy().tobytes())
+    elif isinstance(valor, dict):
+        resumo.update(b"dict")
+        for chave in sorted(valor, key=repr):
+            _atualizar_resumo(resumo, chave)
+            _atualizar_resumo(resumo, valor[chave], eh_entrada)
+    elif isinstance(valor, (list, tuple)):
+        resumo.update(f"{type(valor).__name__}:{len(valor)}".encode("utf-8"))
+        for item in valor:
+            _atualizar_resumo(resumo, item, eh_entrada)
+    else:
+        resumo.update(repr(valor).encode("utf-8"))
+
+
+def _codigo(objeto):
+    # Hash do código-fonte; sem ele (ex.: função definida no console), o
+    # bytecode, ou só o nome (módulos compilados)
+    try:
+        codigo = inspect.getsource(objeto).encode("utf-8")
+    except (OSError, TypeError):
+        codigo = getattr(getattr(objeto, "__code__", None), "co_code", None) \
+            or getattr(objeto, "__name__", repr(objeto)).encode("utf-8")
+    return hashlib.sha256(codigo).hexdigest()
+
+
+def _eh_ndarray(valor):
+    # Sem o NumPy carregado, nenhum argumento pode ser um ndarray
+    numpy = ja_importado("numpy")
+    return numpy is not None and isinstance(valor, numpy.ndarray)
+
+
+def _caminho_entrada(chave):
+    return os.path.join(_CONFIGURACAO["diretorio"], chave[:2], chave + _EXTENSAO_ENTRADA)
+
+
+def _ler_entrada(chave):
+    caminho = _caminho_entrada(chave)
+    try:
+        with open(caminho, mode="rb") as arquivo:
+            entrada = pickle.load(arquivo)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        # Entrada corrompida ou de uma versão incompatível: recalcula
+        _remover(caminho)
+        return None
+    os.utime(caminho)  # marca a entrada como usada recentemente (LRU)
+    return entrada
+
+
+def _gravar_entrada(chave, entrada):
+    try:
+        dados = pickle.dumps(entrada, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return  # resultado não serializável: simplesmente não é memorizado
+    if len(dados) > _CONFIGURACAO["tamanho_maximo"]:
+        return
+
+    caminho = _caminho_entrada(chave)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    if _ESTADO["tamanho_total"] is None:
+        _ESTADO["tamanho_total"] = sum(tamanho for _, _, tamanho in _listar_entradas())
+    anterior = _tamanho(caminho)
+    gravar_atomicamente(caminho, dados)
+    _ESTADO["tamanho_total"] += len(dados) - anterior
+    if _ESTADO["tamanho_total"] > _CONFIGURACAO["tamanho_maximo"]:
+        _remover_excedentes()
+
+
+def _restaurar_arquivo(caminho, conteudo):
+    try:
+        with open(caminho, mode="rb") as arquivo:
+            if arquivo.read() == conteudo:
+                return
+    except FileNotFoundError:
+        pass
+    gravar_atomicamente(caminho, conteudo)
+
+
+def _listar_entradas():
+    entradas = []
+    for pasta, _, arquivos in os.walk(_CONFIGURACAO["diretorio"]):
+        for nome in arquivos:
+            if nome.endswith(_EXTENSAO_ENTRADA):
+                caminho = os.path.join(pasta, nome)
+                try:
+                    estado = os.stat(caminho)
+                except FileNotFoundError:
+                    continue
+                entradas.append((caminho, estado.st_mtime, estado.st_size))
+    return entradas
+
+
+def _remover_excedentes():
+    # Só percorre a pasta quando o total passa do limite; a contagem é
+    # refeita aqui porque outros processos podem ter gravado entradas
+    entradas = sorted(_listar_entradas(), key=lambda entrada: entrada[1])
+    total = sum(tamanho for _, _, tamanho in entradas)
+    for caminho, _, tamanho in entradas:
+        if total <= _CONFIGURACAO["tamanho_maximo"]:
+            break
+        _remover(caminho)
+        total -= tamanho
+    _ESTADO["tamanho_total"] = total
+
+
+def _tamanho(caminho):
+    try:
+        return os.path.getsize(caminho)
+    except FileNotFoundError:
+        return 0
+
+
+def _remover(caminho):
+    try:
+        os.remove(caminho)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,188 @@
+# carregador.py
+
+import math
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+from clima_comum.importacao_tardia import modulo_tardio
+from clima_comum.instrumentacao import medir, registrar_linhas
+
+np = modulo_tardio("numpy")
+openpyxl = modulo_tardio("openpyxl")
+
+# Prefixo das abas com dados climáticos de cada cidade/estação
+PREFIXO_PLANILHA_CLIMA = "Historico_Clima_"
+
+# Nomes das estações cujo sufixo da aba perdeu os acentos
+NOMES_ESTACOES = {"Macae": "Macaé"}
+
+# Linha (1-based) onde ficam os nomes dos meses; as métricas vêm logo abaixo
+LINHA_MESES = 4
+
+# Índices das linhas de métricas dentro de DadosPlanilha.valores
+METRICA_MEDIA = 0
+METRICA_MINIMA = 1
+METRICA_MAXIMA = 2
+
+DadosPlanilha = namedtuple("DadosPlanilha", ["meses", "metricas", "valores"])
+DadosPlanilha.__doc__ = """
+Dados de uma aba climática em formato colunar.
+
+Attributes:
+    meses (tuple): Os nomes dos meses (cabeçalho da linha 4).
+    metricas (tuple): Os rótulos das linhas de métricas (coluna A).
+    valores (numpy.ndarray): Array float64 somente leitura com shape
+                             (n_metricas, n_meses).
+"""
+
+
+def carregar_planilhas_climaticas(arquivo_excel, prefixo=PREFIXO_PLANILHA_CLIMA):
+    """
+    Lê todas as abas climáticas de um arquivo Excel em uma única passagem.
+
+    O arquivo é aberto uma só vez, em modo somente leitura (streaming), e
+    cada aba cujo nome começa com o prefixo é convertida para DadosPlanilha.
+    O resultado fica em memória enquanto o arquivo não for modificado, de
+    modo que chamadas repetidas (de qualquer biblioteca) não o relêem.
+
+    Args:
+        arquivo_excel (str): O caminho para o arquivo .xlsx de entrada.
+        prefixo (str): O prefixo dos nomes das abas a serem carregadas.
+
+    Returns:
+        dict: Um dicionário {nome_planilha: DadosPlanilha}.
+    """
+    caminho = os.path.abspath(arquivo_excel)
+    estado = os.stat(caminho)
+    return _carregar_planilhas(caminho, estado.st_mtime_ns, estado.st_size, prefixo)
+
+
+def iterar_planilhas_climaticas(arquivo_excel, prefixo=PREFIXO_PLANILHA_CLIMA):
+    """
+    Percorre as abas climáticas de um arquivo Excel, uma de cada vez.
+
+    Ao contrário de carregar_planilhas_climaticas, nada fica em cache: só a
+    aba corrente está em memória, o que permite processar arquivos com
+    milhares de estações. Cada aba, porém, é lida inteira (os meses são
+    colunas), então o pico de memória acompanha a maior aba.
+
+    Args:
+        arquivo_excel (str): O caminho para o arquivo .xlsx de entrada.
+        prefixo (str): O prefixo dos nomes das abas a serem lidas.
+
+    Yields:
+        tuple: (nome_planilha, DadosPlanilha) de cada aba, na ordem do arquivo.
+    """
+    workbook = openpyxl.load_workbook(arquivo_excel, read_only=True, data_only=True)
+    try:
+        for planilha in workbook.worksheets:
+            if planilha.title.startswith(prefixo):
+                with medir("openpyxl.leitura"):
+                    dados = _extrair_planilha(planilha)
+                    registrar_linhas(len(dados.meses))
+                yield planilha.title, dados
+    finally:
+        workbook.close()
+
+
+def obter_planilha(arquivo_excel, nome_planilha):
+    """
+    Retorna os dados de uma aba climática.
+
+    Args:
+        arquivo_excel (str | dict): O caminho para o arquivo .xlsx ou o
+                                    dicionário já carregado por
+                                    carregar_planilhas_climaticas.
+        nome_planilha (str): O nome da aba desejada.
+
+    Returns:
+        DadosPlanilha: Os dados da aba.
+
+    Raises:
+        KeyError: Se a aba não existir no arquivo.
+    """
+    planilhas = arquivo_excel if isinstance(arquivo_excel, dict) else carregar_planilhas_climaticas(arquivo_excel)
+    try:
+        return planilhas[nome_planilha]
+    except KeyError:
+        raise KeyError(f"A aba '{nome_planilha}' não foi encontrada no arquivo.")
+
+
+def nome_estacao(nome_planilha, prefixo=PREFIXO_PLANILHA_CLIMA):
+    """
+    Obtém o nome da cidade/estação a partir do nome da aba.
+
+    O nome é o sufixo da aba, com "_" trocado por espaço e os acentos de
+    NOMES_ESTACOES restaurados (ex.: "Historico_Clima_Rio_de_Janeiro" ->
+    "Rio de Janeiro", "Historico_Clima_Macae" -> "Macaé").
+
+    Args:
+        nome_planilha (str): O nome da aba.
+        prefixo (str): O prefixo das abas climáticas.
+
+    Returns:
+        str: O nome da estação.
+    """
+    sufixo = nome_planilha[len(prefixo):]
+    return NOMES_ESTACOES.get(sufixo, sufixo.replace("_", " "))
+
+
+def formatar_numero(valor):
+    """
+    Formata um valor numérico como aparece na planilha (26 em vez de 26.0).
+
+    Args:
+        valor (float): O valor a ser formatado.
+
+    Returns:
+        str: O texto do valor.
+    """
+    if math.isfinite(valor) and float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+
+@lru_cache(maxsize=32)
+def _carregar_planilhas(caminho, mtime_ns, tamanho, prefixo):
+    # mtime_ns e tamanho fazem parte da chave do cache: se o arquivo mudar,
+    # ele é lido novamente.
+    with medir("openpyxl.leitura"):
+        workbook = openpyxl.load_workbook(caminho, read_only=True, data_only=True)
+        try:
+            planilhas = {
+                planilha.title: _extrair_planilha(planilha)
+                for planilha in workbook.worksheets
+                if planilha.title.startswith(prefixo)
+            }
+        finally:
+            workbook.close()
+        registrar_linhas(sum(len(dados.meses) for dados in planilhas.values()))
+        return planilhas
+
+
+def _extrair_planilha(planilha):
+    linhas = planilha.iter_rows(min_row=LINHA_MESES, values_only=True)
+    cabecalho = next(linhas, ())
+    meses = tuple(str(mes) for mes in cabecalho[1:] if mes is not None)
+
+    metricas = []
+    valores = []
+    for linha in linhas:
+        # As métricas terminam na primeira linha sem rótulo
+        if not linha or linha[0] is None:
+            break
+        celulas = [_converter_valor(v) for v in linha[1:len(meses) + 1]]
+        celulas.extend([math.nan] * (len(meses) - len(celulas)))
+        metricas.append(str(linha[0]))
+        valores.append(celulas)
+
+    array = np.array(valores, dtype=np.float64).reshape(len(metricas), len(meses))
+    array.setflags(write=False)  # compartilhado entre chamadas via cache
+    return DadosPlanilha(meses, tuple(metricas), array)
+
+
+def _converter_valor(valor):
+    if valor is None or valor == "":
+        return math.nan
+    return float(valor)
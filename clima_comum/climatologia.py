@@ -0,0 +1,376 @@
+# climatologia.py
+
+import os
+
+from clima_comum import carregador
+from clima_comum.cache_binario import abrir_cache_binario, salvar_cache_binario
+from clima_comum.importacao_tardia import modulo_tardio
+from clima_comum.indice_mensal import normalizar_mes
+
+np = modulo_tardio("numpy")
+
+# Estatísticas de cada normal, na ordem em que são salvas no cache binário
+ESTATISTICAS_NORMAIS = ("media", "desvio", "contagem")
+
+# Separador dos rótulos das colunas do cache ("media|1|Umidade(%)")
+_SEPARADOR = "|"
+
+
+class Climatologia:
+    """
+    Normais mensais (média, desvio padrão e contagem) de várias estações.
+
+    As normais são calculadas uma única vez a partir do histórico e ficam em
+    arrays (estações x 12 meses x colunas), endereçados diretamente pelo id
+    da estação e pelo número do mês. Dados novos são comparados com elas em
+    lote: anomalias, escores z e o ranking das estações saem de uma única
+    indexação vetorizada, sem reler nem recalcular o histórico. As normais
+    podem ser salvas em um cache binário (salvar/abrir) e reaproveitadas
+    entre execuções.
+
+    Os meses podem ser informados por nome, número ou data (ver
+    indice_mensal.normalizar_mes).
+    """
+
+    def __init__(self, estacoes, colunas, media, desvio, contagem):
+        """
+        Args:
+            estacoes (sequence): Os nomes das estações.
+            colunas (sequence): Os nomes das colunas (métricas).
+            media (array-like): As médias, com shape (estações x 12 x colunas).
+            desvio (array-like): Os desvios padrão, com o mesmo shape.
+            contagem (array-like): Quantos valores formaram cada normal.
+
+        Raises:
+            ValueError: Se algum array não tiver o shape esperado.
+        """
+        self.estacoes = tuple(estacoes)
+        self.colunas = tuple(colunas)
+        self._ids_estacoes = {estacao: i for i, estacao in enumerate(self.estacoes)}
+        self.media = np.asarray(media, dtype=np.float64)
+        self.desvio = np.asarray(desvio, dtype=np.float64)
+        self.contagem = np.asarray(contagem, dtype=np.int64)
+        shape = (len(self.estacoes), 12, len(self.colunas))
+        for array in (self.media, self.desvio, self.contagem):
+            if array.shape != shape:
+                raise ValueError(f"Esperado um array com shape {shape}, recebido {array.shape}.")
+
+    def __len__(self):
+        return len(self.estacoes)
+
+    def __repr__(self):
+        return f"Climatologia(n_estacoes={len(self.estacoes)}, colunas={self.colunas!r})"
+
+    @classmethod
+    def de_observacoes(cls, estacoes, meses, valores, colunas):
+        """
+        Calcula as normais a partir de observações mensais de várias estações.
+
+        Cada linha é um mês observado (normalmente de anos diferentes); as
+        linhas são agrupadas por (estação, mês do ano) e reduzidas de uma vez,
+        com np.bincount. Valores NaN são ignorados. O desvio é o amostral
+        (ddof=1) e fica NaN quando a normal tem menos de dois valores.
+
+        Args:
+            estacoes (sequence): A estação de cada linha.
+            meses (sequence): O mês de cada linha (ver normalizar_mes).
+            valores (array-like): Array (linhas x len(colunas)).
+            colunas (sequence): Os nomes das colunas.
+
+        Returns:
+            Climatologia: As normais, com as estações na ordem em que aparecem.
+        """
+        nomes, ids = _codificar(estacoes)
+        numeros = _numeros_meses(meses, len(ids))
+        colunas = tuple(colunas)
+        valores = np.asarray(valores, dtype=np.float64).reshape(len(ids), len(colunas))
+
+        # Posição de cada valor no array achatado (estações x 12 x colunas)
+        grupos = ids * 12 + numeros - 1
+        posicoes = (grupos[:, np.newaxis] * len(colunas) + np.arange(len(colunas))).ravel()
+        shape = (len(nomes), 12, len(colunas))
+
+        def somar(pesos):
+            return np.bincount(posicoes, pesos.ravel(), minlength=int(np.prod(shape))).reshape(shape)
+
+        presentes = ~np.isnan(valores)
+        contagem = somar(presentes.astype(np.float64))
+        media = np.divide(somar(np.where(presentes, valores, 0.0)), contagem,
+                          out=np.full(shape, np.nan), where=contagem > 0)
+        # Segunda passagem sobre os desvios (mais estável que a soma dos quadrados)
+        desvios = np.where(presentes, valores - media.reshape(len(nomes) * 12, len(colunas))[grupos], 0.0)
+        variancia = np.divide(somar(desvios * desvios), contagem - 1,
+                              out=np.full(shape, np.nan), where=contagem > 1)
+        return cls(nomes, colunas, media, np.sqrt(variancia), contagem)
+
+    @classmethod
+    def de_planilhas(cls, arquivos_excel, colunas=None, prefixo=carregador.PREFIXO_PLANILHA_CLIMA):
+        """
+        Calcula as normais de todas as abas climáticas de um ou mais arquivos.
+
+        A estação vem de carregador.nome_estacao, como em
+        analise_lib.carregar_dados_cidades; abas de mesmo nome em arquivos
+        diferentes contam como anos diferentes da mesma estação. Os meses
+        podem ser nomes ("Julho") ou rótulos "Mês AAAA".
+
+        Args:
+            arquivos_excel (str | dict | list): O caminho de um .xlsx, uma
+                                                lista de caminhos ou as abas
+                                                já carregadas pelo carregador.
+            colunas (sequence, optional): Nomes para as primeiras
+                                          len(colunas) linhas de métricas;
+                                          por padrão, os rótulos da primeira aba.
+            prefixo (str): O prefixo das abas climáticas.
+
+        Returns:
+            Climatologia: As normais.
+        """
+        if isinstance(arquivos_excel, dict):
+            abas = [arquivos_excel.items()]
+        else:
+            if isinstance(arquivos_excel, (str, os.PathLike)):
+                arquivos_excel = [arquivos_excel]
+            abas = [carregador.iterar_planilhas_climaticas(arquivo, prefixo) for arquivo in arquivos_excel]
+
+        estacoes, meses, valores = [], [], []
+        for nome_planilha, dados in (aba for arquivo in abas for aba in arquivo):
+            if colunas is None:
+                colunas = dados.metricas
+            estacoes += [carregador.nome_estacao(nome_planilha, prefixo)] * len(dados.meses)
+            meses += dados.meses
+            valores.append(dados.valores[:len(colunas)].T)
+        colunas = () if colunas is None else colunas
+        return cls.de_observacoes(estacoes, meses, np.concatenate(valores) if valores
+                                  else np.empty((0, len(colunas))), colunas)
+
+    @classmethod
+    def de_series_diarias(cls, series):
+        """
+        Calcula as normais a partir das médias mensais de séries diárias.
+
+        Args:
+            series (iterable): Objetos serie_temporal.SerieDiaria, um por estação.
+
+        Returns:
+            Climatologia: As normais, com as colunas serie_temporal.METRICAS_DIARIAS.
+        """
+        # serie_temporal importa o NumPy: só é carregado aqui
+        from clima_comum.serie_temporal import METRICAS_DIARIAS
+
+        estacoes, meses, valores = [], [], []
+        for serie in series:
+            mensal = serie.resumo_mensal()
+            estacoes += [serie.estacao] * len(mensal["periodos"])
+            meses.append(mensal["periodos"][:, 1])
+            valores.append(mensal["media"])
+        if not valores:
+            return cls.de_observacoes([], [], np.empty((0, len(METRICAS_DIARIAS))), METRICAS_DIARIAS)
+        return cls.de_observacoes(estacoes, np.concatenate(meses), np.concatenate(valores), METRICAS_DIARIAS)
+
+    @classmethod
+    def abrir(cls, caminho):
+        """
+        Abre normais salvas com salvar (sem copiar médias e desvios).
+
+        Args:
+            caminho (str): O caminho do cache binário.
+
+        Returns:
+            Climatologia: As normais.
+
+        Raises:
+            ValueError: Se o arquivo não tiver o formato de salvar.
+        """
+        estacoes, rotulos, tabela = abrir_cache_binario(caminho)
+        n_colunas, resto = divmod(len(rotulos), len(ESTATISTICAS_NORMAIS) * 12)
+        colunas = [rotulo.split(_SEPARADOR, 2)[-1] for rotulo in rotulos[:n_colunas]]
+        if resto or list(rotulos) != _rotulos_cache(colunas):
+            raise ValueError(f"O arquivo '{caminho}' não contém normais climatológicas.")
+        media, desvio, contagem = (
+            tabela.reshape(len(estacoes), len(ESTATISTICAS_NORMAIS), 12, n_colunas)[:, i]
+            for i in range(len(ESTATISTICAS_NORMAIS))
+        )
+        return cls(estacoes, colunas, media, desvio, contagem)
+
+    def salvar(self, caminho):
+        """
+        Salva as normais em um cache binário (ver cache_binario).
+
+        Cada linha é uma estação; as colunas são rotuladas
+        "estatistica|mes|coluna" (ex.: "media|1|Umidade(%)").
+
+        Args:
+            caminho (str): O caminho do arquivo a ser gerado.
+        """
+        rotulos = _rotulos_cache(self.colunas)
+        tabela = np.stack([self.media, self.desvio, self.contagem], axis=1)
+        salvar_cache_binario(caminho, self.estacoes, rotulos, tabela.reshape(len(self.estacoes), len(rotulos)))
+
+    def normais(self, meses, estacoes=None, colunas=None):
+        """
+        Retorna as médias de referência de vários meses de uma vez.
+
+        Args:
+            meses (sequence | int | str): O mês de cada linha, ou um mês para
+                                          todas (ver normalizar_mes).
+            estacoes (sequence | str, optional): A estação de cada linha, ou
+                                                 uma para todas; por padrão,
+                                                 uma linha por estação, na
+                                                 ordem de `estacoes`.
+            colunas (sequence | str, optional): As colunas desejadas (padrão:
+                                                todas); com um nome só, o
+                                                resultado é 1-D.
+
+        Returns:
+            numpy.ndarray: Array (linhas x colunas), ou (linhas,) para uma coluna.
+        """
+        ids, numeros, indices = self._localizar(meses, estacoes, colunas)
+        return self._selecionar(self.media, ids, numeros, indices, colunas)
+
+    def anomalias(self, meses, valores, estacoes=None, colunas=None):
+        """
+        Calcula a diferença entre os valores e a média de referência.
+
+        Args:
+            meses (sequence | int | str): Ver normais.
+            valores (array-like): Array (linhas x colunas), ou (linhas,)
+                                  quando `colunas` é um nome só.
+            estacoes (sequence | str, optional): Ver normais.
+            colunas (sequence | str, optional): Ver normais.
+
+        Returns:
+            numpy.ndarray: As anomalias, com o shape de `valores`; NaN onde
+                           não há valor ou normal.
+
+        Raises:
+            ValueError: Se uma estação, mês ou coluna não existir.
+        """
+        return self._comparar(meses, valores, estacoes, colunas)[0]
+
+    def escores_z(self, meses, valores, estacoes=None, colunas=None):
+        """
+        Calcula as anomalias em desvios padrão: (valor - média) / desvio.
+
+        Args:
+            meses, valores, estacoes, colunas: Ver anomalias.
+
+        Returns:
+            numpy.ndarray: Os escores z, com o shape de `valores`; NaN onde a
+                           normal não tem desvio (menos de dois valores ou
+                           desvio zero).
+        """
+        anomalias, desvio = self._comparar(meses, valores, estacoes, colunas)
+        return np.divide(anomalias, desvio, out=np.full(anomalias.shape, np.nan),
+                         where=np.isfinite(desvio) & (desvio > 0))
+
+    def ranquear(self, meses, valores, coluna, estacoes=None, limite=None):
+        """
+        Ordena as estações da mais para a menos anômala em uma coluna.
+
+        O escore de cada estação é a média dos escores z das suas linhas (uma
+        estação pode aparecer em vários meses do lote); as estações são
+        ordenadas pelo valor absoluto do escore, e as sem escore ficam de fora.
+
+        Args:
+            meses (sequence | int | str): Ver normais.
+            valores (array-like): Os valores da coluna, um por linha.
+            coluna (str): A coluna comparada.
+            estacoes (sequence | str, optional): Ver normais.
+            limite (int, optional): Quantas estações retornar (padrão: todas).
+
+        Returns:
+            tuple: (lista de estações, numpy.ndarray com os escores), em ordem.
+        """
+        escores = self.escores_z(meses, valores, estacoes, coluna)
+        ids = self._ids(estacoes, len(escores))
+        validos = ~np.isnan(escores)
+        soma = np.bincount(ids[validos], escores[validos], minlength=len(self.estacoes))
+        contagem = np.bincount(ids[validos], minlength=len(self.estacoes))
+        com_escore = np.flatnonzero(contagem)
+        medios = soma[com_escore] / contagem[com_escore]
+        ordem = np.argsort(-np.abs(medios), kind="stable")[:limite]
+        return [self.estacoes[i] for i in com_escore[ordem]], medios[ordem]
+
+    def _comparar(self, meses, valores, estacoes, colunas):
+        ids, numeros, indices = self._localizar(meses, estacoes, colunas, valores)
+        valores = np.asarray(valores, dtype=np.float64)
+        media = self._selecionar(self.media, ids, numeros, indices, colunas)
+        if valores.shape != media.shape:
+            raise ValueError(f"Esperados valores com shape {media.shape}, recebido {valores.shape}.")
+        return valores - media, self._selecionar(self.desvio, ids, numeros, indices, colunas)
+
+    def _localizar(self, meses, estacoes, colunas, valores=None):
+        if valores is not None:
+            n = len(np.asarray(valores))
+        elif estacoes is None:
+            n = len(self.estacoes)
+        elif isinstance(estacoes, str):
+            n = 1 if np.ndim(meses) == 0 else len(meses)
+        else:
+            n = len(estacoes)
+        ids = self._ids(estacoes, n)
+        return ids, _numeros_meses(meses, n), self._indices_colunas(colunas)
+
+    def _ids(self, estacoes, n):
+        if estacoes is None:
+            if n != len(self.estacoes):
+                raise ValueError("Informe as estações: o lote não tem uma linha por estação.")
+            return np.arange(n)
+        if isinstance(estacoes, str):
+            return np.full(n, self._id_estacao(estacoes), dtype=np.int64)
+        unicas, codigos = _codificar(estacoes)
+        return np.array([self._id_estacao(e) for e in unicas], dtype=np.int64)[codigos]
+
+    def _id_estacao(self, estacao):
+        try:
+            return self._ids_estacoes[estacao]
+        except KeyError:
+            raise ValueError(f"A estação '{estacao}' não foi encontrada nas normais.")
+
+    def _indices_colunas(self, colunas):
+        if colunas is None:
+            return np.arange(len(self.colunas))
+        nomes = [colunas] if isinstance(colunas, str) else list(colunas)
+        try:
+            return np.array([self.colunas.index(nome) for nome in nomes], dtype=np.int64)
+        except ValueError:
+            raise ValueError(f"Coluna inválida em {nomes}. Use uma de: {', '.join(self.colunas)}.")
+
+    @staticmethod
+    def _selecionar(normais, ids, numeros, indices, colunas):
+        selecionados = normais[ids[:, np.newaxis], numeros[:, np.newaxis] - 1, indices]
+        return selecionados[:, 0] if isinstance(colunas, str) else selecionados
+
+
+def _codificar(rotulos):
+    # (rótulos distintos na ordem da primeira ocorrência, código de cada linha).
+    # Um dicionário é bem mais rápido que np.unique em arrays de objetos,
+    # que precisa ordenar comparando strings. A conversão para array de objetos
+    # evita iterar elemento a elemento sobre Index/arrays do pandas.
+    codigos = {}
+    rotulos = np.asarray(rotulos, dtype=object).ravel()
+    linhas = np.fromiter((codigos.setdefault(rotulo, len(codigos)) for rotulo in rotulos),
+                         dtype=np.int64, count=len(rotulos))
+    return tuple(codigos), linhas
+
+
+def _numeros_meses(meses, n):
+    # Número (1 a 12) do mês de cada uma das n linhas
+    if np.ndim(meses) == 0:
+        return np.full(n, normalizar_mes(meses)[1], dtype=np.int64)
+    if isinstance(meses, np.ndarray) and np.issubdtype(meses.dtype, np.integer):
+        numeros = meses.astype(np.int64)
+        if numeros.size and (numeros.min() < 1 or numeros.max() > 12):
+            raise ValueError("Os meses devem estar entre 1 e 12.")
+    else:
+        # Poucos rótulos distintos: cada um é interpretado uma só vez
+        rotulos, codigos = _codificar(meses)
+        numeros = np.array([normalizar_mes(mes)[1] for mes in rotulos], dtype=np.int64)[codigos]
+    if len(numeros) != n:
+        raise ValueError(f"Esperados {n} meses, recebidos {len(numeros)}.")
+    return numeros
+
+
+def _rotulos_cache(colunas):
+    return [_SEPARADOR.join((estatistica, str(mes), coluna))
+            for estatistica in ESTATISTICAS_NORMAIS for mes in range(1, 13) for coluna in colunas]
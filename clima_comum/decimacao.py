@@ -0,0 +1,111 @@
+# decimacao.py
+
+from clima_comum.importacao_tardia import modulo_tardio
+
+np = modulo_tardio("numpy")
+
+# Pontos por série entregues ao matplotlib quando o gráfico não informa outro limite
+PONTOS_POR_GRAFICO = 2000
+
+# "minmax": mínimo e máximo de cada balde (preserva picos e extremos);
+# "lttb": Largest-Triangle-Three-Buckets (preserva a forma visual da curva)
+METODOS_DECIMACAO = ("minmax", "lttb")
+
+_PONTOS_MINIMOS = 4
+
+
+def indices_decimados(valores, limite=PONTOS_POR_GRAFICO, metodo="minmax"):
+    """
+    Escolhe no máximo `limite` pontos de uma série para serem plotados.
+
+    Séries com até `limite` pontos são mantidas inteiras. Nas maiores, o
+    primeiro e o último ponto são sempre mantidos e os demais são divididos
+    em baldes consecutivos, dos quais sai um representante (LTTB) ou o mínimo
+    e o máximo (minmax). Assim o custo de desenho e o tamanho do arquivo
+    dependem só do limite, não do comprimento da série. Valores NaN nunca são
+    escolhidos, a não ser quando o balde inteiro é NaN (o que mantém a falha
+    visível no gráfico).
+
+    Args:
+        valores (array-like): Os valores da série (eixo Y), em ordem.
+        limite (int): O número máximo de pontos.
+        metodo (str): Um de METODOS_DECIMACAO.
+
+    Returns:
+        numpy.ndarray: As posições escolhidas, em ordem crescente.
+
+    Raises:
+        ValueError: Se o método for desconhecido ou o limite menor que 4.
+    """
+    if metodo not in METODOS_DECIMACAO:
+        raise ValueError(f"Método '{metodo}' inválido. Use um de: {', '.join(METODOS_DECIMACAO)}.")
+    if limite < _PONTOS_MINIMOS:
+        raise ValueError(f"O limite de pontos deve ser pelo menos {_PONTOS_MINIMOS}.")
+    valores = np.asarray(valores, dtype=np.float64)
+    if len(valores) <= limite:
+        return np.arange(len(valores))
+    if metodo == "lttb":
+        return _lttb(valores, limite)
+    return _minimos_e_maximos(valores, limite)
+
+
+def decimar_serie(eixo_x, valores, limite=PONTOS_POR_GRAFICO, metodo="minmax"):
+    """
+    Reduz uma série (x, y) aos pontos escolhidos por indices_decimados.
+
+    Args:
+        eixo_x (array-like): Os valores do eixo X (números, datas ou rótulos).
+        valores (array-like): Os valores do eixo Y.
+        limite (int): O número máximo de pontos.
+        metodo (str): Um de METODOS_DECIMACAO.
+
+    Returns:
+        tuple: (eixo_x, valores) reduzidos, como arrays NumPy.
+    """
+    indices = indices_decimados(valores, limite, metodo)
+    return np.asarray(eixo_x)[indices], np.asarray(valores, dtype=np.float64)[indices]
+
+
+def _minimos_e_maximos(valores, limite):
+    # Baldes de mesmo tamanho (o último completado com NaN), reduzidos de uma vez
+    n = len(valores)
+    n_baldes = (limite - 2) // 2
+    tamanho = -(-n // n_baldes)
+    baldes = np.full(n_baldes * tamanho, np.nan)
+    baldes[:n] = valores
+    baldes = baldes.reshape(n_baldes, tamanho)
+    ausentes = np.isnan(baldes)
+    inicios = np.arange(n_baldes) * tamanho
+    escolhidos = np.concatenate([
+        [0, n - 1],
+        inicios + np.argmin(np.where(ausentes, np.inf, baldes), axis=1),
+        inicios + np.argmax(np.where(ausentes, -np.inf, baldes), axis=1),
+    ])
+    return np.unique(escolhidos[escolhidos < n])
+
+
+def _lttb(valores, limite):
+    # limite - 2 baldes internos, mais um balde final só com o último ponto
+    n = len(valores)
+    bordas = np.append(np.linspace(1, n - 1, limite - 1).astype(np.int64), n)
+    validos = ~np.isnan(valores)
+    preenchidos = np.where(validos, valores, 0.0)
+    posicoes = np.arange(n, dtype=np.float64)
+
+    # Centro (x, y) de cada balde, usado como terceiro vértice do triângulo
+    contagem = np.add.reduceat(validos, bordas[:-1])
+    centro_x = np.add.reduceat(posicoes, bordas[:-1]) / np.diff(bordas)
+    centro_y = np.divide(np.add.reduceat(preenchidos, bordas[:-1]), contagem,
+                         out=np.full(len(contagem), np.nan), where=contagem > 0)
+
+    escolhidos = np.empty(limite, dtype=np.int64)
+    escolhidos[0], escolhidos[-1] = 0, n - 1
+    anterior = 0
+    for balde in range(limite - 2):
+        inicio, fim = bordas[balde], bordas[balde + 1]
+        areas = np.abs((posicoes[anterior] - centro_x[balde + 1]) * (valores[inicio:fim] - valores[anterior])
+                       - (posicoes[anterior] - posicoes[inicio:fim]) * (centro_y[balde + 1] - valores[anterior]))
+        areas[np.isnan(areas)] = -1.0
+        anterior = inicio + int(np.argmax(areas))
+        escolhidos[balde + 1] = anterior
+    return escolhidos
@@ -0,0 +1,92 @@
+# estatisticas.py
+
+import warnings
+from collections import namedtuple
+
+from clima_comum.importacao_tardia import modulo_tardio
+
+np = modulo_tardio("numpy")
+
+# Resultado de resumir_metricas: cada campo é um array (estações x métricas),
+# ou (métricas,) quando a entrada é uma única estação (meses x métricas).
+# `variancia` e `percentis` ({percentil: array}) só são preenchidos se pedidos.
+ResumoMetricas = namedtuple(
+    "ResumoMetricas",
+    ["minimo", "posicao_minimo", "maximo", "posicao_maximo",
+     "soma", "contagem", "media", "variancia", "percentis"]
+)
+
+# Posição devolvida quando todos os valores de uma métrica são NaN
+SEM_POSICAO = -1
+
+
+def resumir_metricas(valores, variancia=False, percentis=()):
+    """
+    Calcula extremos (com posição), soma, contagem e média de várias métricas.
+
+    Todas as estações e métricas são reduzidas de uma vez, ao longo do eixo
+    dos meses, com uma chamada vetorizada por estatística: o custo não cresce
+    com o número de métricas nem de estações. Valores NaN são ignorados
+    (como no pandas) e, em empate, vale a primeira posição (como idxmax/idxmin).
+
+    Args:
+        valores (numpy.ndarray): Array (estações x meses x métricas) ou
+                                 (meses x métricas), float32 ou float64.
+        variancia (bool): Se True, calcula também a variância populacional.
+        percentis (sequence): Percentis (0 a 100) a calcular, ex.: (25, 50, 75).
+
+    Returns:
+        ResumoMetricas: Os resultados por estação e métrica. As somas e
+                        médias são acumuladas em float64; os extremos mantêm
+                        o tipo da entrada.
+
+    Raises:
+        ValueError: Se o array não tiver 2 ou 3 dimensões.
+    """
+    valores = np.asarray(valores)
+    if valores.ndim not in (2, 3):
+        raise ValueError(f"Esperado um array (meses x métricas) ou (estações x meses x métricas), "
+                         f"recebido shape {valores.shape}.")
+    eixo = valores.ndim - 2  # eixo dos meses
+
+    ausentes = np.isnan(valores)
+    if ausentes.any():
+        contagem = valores.shape[eixo] - ausentes.sum(axis=eixo)
+        posicao_minimo = np.argmin(np.where(ausentes, np.inf, valores), axis=eixo)
+        posicao_maximo = np.argmax(np.where(ausentes, -np.inf, valores), axis=eixo)
+        soma = np.nansum(valores, axis=eixo, dtype=np.float64)
+    else:
+        contagem = np.full(valores.shape[:eixo] + valores.shape[eixo + 1:], valores.shape[eixo])
+        posicao_minimo = np.argmin(valores, axis=eixo)
+        posicao_maximo = np.argmax(valores, axis=eixo)
+        soma = np.sum(valores, axis=eixo, dtype=np.float64)
+
+    # Métricas só com NaN: argmin/argmax apontam para a posição 0, que é NaN
+    vazias = contagem == 0
+    minimo = _valor_na_posicao(valores, posicao_minimo, eixo)
+    maximo = _valor_na_posicao(valores, posicao_maximo, eixo)
+    posicao_minimo[vazias] = SEM_POSICAO
+    posicao_maximo[vazias] = SEM_POSICAO
+
+    media = np.divide(soma, contagem, out=np.full(soma.shape, np.nan), where=~vazias)
+
+    resultado_variancia = None
+    if variancia:
+        desvios = valores - np.expand_dims(media, eixo)
+        quadrados = np.nansum(desvios * desvios, axis=eixo, dtype=np.float64)
+        resultado_variancia = np.divide(quadrados, contagem, out=np.full(soma.shape, np.nan), where=~vazias)
+
+    resultado_percentis = None
+    if len(percentis):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # "All-NaN slice"
+            calculados = np.nanpercentile(valores, list(percentis), axis=eixo)
+        resultado_percentis = dict(zip(percentis, calculados))
+
+    return ResumoMetricas(minimo, posicao_minimo, maximo, posicao_maximo,
+                          soma, contagem, media, resultado_variancia, resultado_percentis)
+
+
+def _valor_na_posicao(valores, posicoes, eixo):
+    extremos = np.take_along_axis(valores, np.expand_dims(posicoes, eixo), axis=eixo)
+    return np.squeeze(extremos, axis=eixo)
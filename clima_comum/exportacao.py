@@ -0,0 +1,272 @@
+# exportacao.py
+
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+from clima_comum import cache_binario, carregador
+from clima_comum.arquivos import gravar_atomicamente
+from clima_comum.cache_binario import EXTENSAO_CACHE_BINARIO, salvar_cache_binario
+from clima_comum.cache_derivacoes import memorizar_em_disco
+from clima_comum.importacao_tardia import modulo_tardio
+from clima_comum.instrumentacao import medir, registrar_linhas
+
+np = modulo_tardio("numpy")
+
+# Colunas numéricas dos arquivos intermediários, na ordem em que são gravadas
+COLUNAS_TEMPERATURA = ("Minima", "Maxima", "Media")
+
+FORMATOS_EXPORTACAO = ("txt", "binario")
+
+# Manifesto da exportação incremental, gravado na pasta de saída
+MANIFESTO_EXPORTACAO = ".manifesto_exportacao.json"
+
+# Situações de cada aba em exportar_planilhas
+SITUACAO_NOVO = "novo"
+SITUACAO_REGRAVADO = "regravado"
+SITUACAO_ACRESCENTADO = "acrescentado"
+SITUACAO_INALTERADO = "inalterado"
+
+# Resultado de cada aba em exportar_planilhas
+ResultadoExportacao = namedtuple("ResultadoExportacao", ["planilha", "caminho", "situacao", "linhas_gravadas"])
+
+
+def tabela_temperaturas(dados_planilha):
+    """
+    Monta a tabela (meses x [mínima, máxima, média]) de uma aba climática.
+
+    Args:
+        dados_planilha (carregador.DadosPlanilha): Os dados de uma aba.
+
+    Returns:
+        numpy.ndarray: Array float64 com shape (n_meses, 3).
+    """
+    linhas = [carregador.METRICA_MINIMA, carregador.METRICA_MAXIMA, carregador.METRICA_MEDIA]
+    return np.ascontiguousarray(dados_planilha.valores[linhas].T)
+
+
+def exportar_temperaturas(dados_planilha, caminho_saida, formato="txt"):
+    """
+    Grava as temperaturas de uma aba no formato intermediário escolhido.
+
+    Args:
+        dados_planilha (carregador.DadosPlanilha): Os dados de uma aba.
+        caminho_saida (str): O caminho do arquivo a ser gerado.
+        formato (str): "txt" para o texto separado por tabulação ou
+                       "binario" para o cache colunar (ver cache_binario).
+
+    Raises:
+        ValueError: Se o formato não for suportado.
+    """
+    if formato == "binario":
+        salvar_cache_binario(caminho_saida, dados_planilha.meses, COLUNAS_TEMPERATURA,
+                             tabela_temperaturas(dados_planilha))
+    elif formato == "txt":
+        _escrever_txt(dados_planilha, caminho_saida)
+    else:
+        raise ValueError(f"Formato '{formato}' inválido. Use um de: {', '.join(FORMATOS_EXPORTACAO)}.")
+
+
+def exportar_planilha(arquivo_excel, nome_planilha, caminho_saida, formato="txt", incremental=False):
+    """
+    Exporta as temperaturas de uma aba (base de gerar_arquivo_txt_de_excel
+    e gerar_arquivo_txt_com_mes).
+
+    Sem `incremental`, a exportação é completa e memorizada em disco (ver
+    cache_derivacoes): se a planilha não mudou, o arquivo é regravado a
+    partir do cache, sem reler a aba.
+
+    Args:
+        arquivo_excel (str | dict): O caminho do .xlsx ou as abas já
+                                    carregadas por carregador.carregar_planilhas_climaticas.
+        nome_planilha (str): O nome da aba.
+        caminho_saida (str): O caminho do arquivo a ser gerado.
+        formato (str): "txt" ou "binario".
+        incremental (bool): Se True, compara a aba com o manifesto da pasta
+                            de saída (ver exportar_planilhas).
+
+    Returns:
+        ResultadoExportacao | None: Com incremental=True, o que foi feito
+               com o arquivo (situacao e linhas_gravadas).
+    """
+    if incremental:
+        dados = carregador.obter_planilha(arquivo_excel, nome_planilha)
+        diretorio_saida, nome_arquivo = os.path.split(os.path.abspath(caminho_saida))
+        return exportar_planilhas({nome_planilha: dados}, diretorio_saida, formato,
+                                  {nome_planilha: nome_arquivo})[0]
+    _exportar_memorizado(arquivo_excel, nome_planilha, caminho_saida, formato)
+    return None
+
+
+def exportar_planilhas(arquivo_excel, diretorio_saida, formato="txt", nomes_arquivos=None,
+                       incremental=True):
+    """
+    Exporta as temperaturas de várias abas, regravando só o que mudou.
+
+    Um manifesto (MANIFESTO_EXPORTACAO, na pasta de saída) guarda, para cada
+    arquivo gerado, quantas linhas ele tem, um hash dessas linhas e o seu
+    tamanho. Na execução seguinte, cada aba é comparada com o manifesto:
+
+    - "inalterado": mesmas linhas; o arquivo não é tocado;
+    - "acrescentado": só entraram meses novos no fim (TXT); o arquivo é
+      regravado atomicamente (linhas_gravadas conta todas as linhas de dados
+      escritas, não só as novas);
+    - "regravado"/"novo": qualquer outra mudança (ou arquivo ausente/alterado
+      por fora); o arquivo inteiro é regravado atomicamente.
+
+    Os arquivos nunca são alterados no lugar: quem os lê (ou os tem mapeados
+    em memória) nunca vê uma versão pela metade.
+
+    Args:
+        arquivo_excel (str | dict): O caminho do .xlsx ou as abas já
+                                    carregadas por carregador.carregar_planilhas_climaticas.
+        diretorio_saida (str): A pasta dos arquivos gerados.
+        formato (str): "txt" ou "binario".
+        nomes_arquivos (dict, optional): {nome_planilha: nome do arquivo}; as
+                                         abas fora do dicionário são ignoradas.
+                                         Padrão: todas as abas, com o nome da
+                                         aba e a extensão do formato.
+        incremental (bool): Se False, regrava tudo (mas atualiza o manifesto).
+
+    Returns:
+        list: Um ResultadoExportacao por aba, na ordem do arquivo.
+
+    Raises:
+        ValueError: Se o formato não for suportado.
+    """
+    if formato not in FORMATOS_EXPORTACAO:
+        raise ValueError(f"Formato '{formato}' inválido. Use um de: {', '.join(FORMATOS_EXPORTACAO)}.")
+    planilhas = arquivo_excel
+    if not isinstance(planilhas, dict):
+        planilhas = carregador.carregar_planilhas_climaticas(arquivo_excel)
+    if nomes_arquivos is None:
+        extensao = ".txt" if formato == "txt" else EXTENSAO_CACHE_BINARIO
+        nomes_arquivos = {nome: nome + extensao for nome in planilhas}
+
+    os.makedirs(diretorio_saida, exist_ok=True)
+    caminho_manifesto = os.path.join(diretorio_saida, MANIFESTO_EXPORTACAO)
+    manifesto = _ler_manifesto(caminho_manifesto)
+
+    resultados = []
+    for nome_planilha, dados in planilhas.items():
+        if nome_planilha not in nomes_arquivos:
+            continue
+        nome_arquivo = nomes_arquivos[nome_planilha]
+        caminho = os.path.join(diretorio_saida, nome_arquivo)
+        anterior = manifesto.get(nome_arquivo) if incremental else None
+        situacao, gravadas, manifesto[nome_arquivo] = _exportar_se_mudou(dados, caminho, formato, anterior)
+        resultados.append(ResultadoExportacao(nome_planilha, caminho, situacao, gravadas))
+
+    gravar_atomicamente(caminho_manifesto,
+                        json.dumps(manifesto, ensure_ascii=False, indent=2).encode("utf-8"))
+    return resultados
+
+
+def resumir_exportacao(resultados):
+    """
+    Conta as abas por situação (ex.: {"inalterado": 48, "acrescentado": 2}).
+
+    Args:
+        resultados (list): O retorno de exportar_planilhas.
+
+    Returns:
+        dict: {situacao: quantidade de abas}.
+    """
+    resumo = {}
+    for resultado in resultados:
+        resumo[resultado.situacao] = resumo.get(resultado.situacao, 0) + 1
+    return resumo
+
+
+def _exportar_se_mudou(dados_planilha, caminho, formato, anterior):
+    # Retorna (situacao, linhas gravadas, nova entrada do manifesto)
+    if formato == "txt":
+        linhas = _linhas_txt(dados_planilha)
+    else:
+        linhas = [json.dumps(dados_planilha.meses, ensure_ascii=False),
+                  tabela_temperaturas(dados_planilha).tobytes().hex()]
+    assinaturas = _assinaturas_acumuladas(linhas)
+
+    # Entrada ausente, incompleta ou com valores inválidos: regravação completa
+    anterior = anterior if isinstance(anterior, dict) else {}
+    linhas_anteriores = anterior.get("linhas")
+    valido = (
+        anterior.get("formato") == formato
+        and isinstance(linhas_anteriores, int) and not isinstance(linhas_anteriores, bool)
+        and 0 <= linhas_anteriores <= len(linhas)
+        and anterior.get("hash") == assinaturas[linhas_anteriores]
+        and _tamanho(caminho) == anterior.get("tamanho")
+    )
+    if valido and linhas_anteriores == len(linhas):
+        situacao, gravadas = SITUACAO_INALTERADO, 0
+    elif valido and formato == "txt":
+        # Um acréscimo no fim (modo "ab") deixaria o arquivo pela metade se a
+        # escrita fosse interrompida; regravar inteiro custa pouco (as linhas
+        # já estão prontas) e mantém a troca atômica
+        _gravar_linhas_txt(linhas, caminho)
+        situacao, gravadas = SITUACAO_ACRESCENTADO, len(dados_planilha.meses)
+    else:
+        situacao = SITUACAO_NOVO if _tamanho(caminho) is None else SITUACAO_REGRAVADO
+        if formato == "txt":
+            _gravar_linhas_txt(linhas, caminho)
+        else:
+            exportar_temperaturas(dados_planilha, caminho, formato)
+        gravadas = len(dados_planilha.meses)
+
+    entrada = {"formato": formato, "linhas": len(linhas), "hash": assinaturas[-1],
+               "tamanho": _tamanho(caminho)}
+    return situacao, gravadas, entrada
+
+
+@memorizar_em_disco(argumentos_saida=("caminho_saida",), argumentos_entrada=("arquivo_excel",),
+                    dependencias=(carregador, cache_binario))
+def _exportar_memorizado(arquivo_excel, nome_planilha, caminho_saida, formato):
+    # Exportação completa, reaproveitada do cache em disco se as entradas não mudaram
+    dados = carregador.obter_planilha(arquivo_excel, nome_planilha)
+    exportar_temperaturas(dados, caminho_saida, formato)
+
+
+def _linhas_txt(dados_planilha):
+    numero = carregador.formatar_numero
+    linhas = ["Mes\t" + "\t".join(COLUNAS_TEMPERATURA) + "\n"]
+    for mes, valores in zip(dados_planilha.meses, tabela_temperaturas(dados_planilha)):
+        linhas.append(mes + "\t" + "\t".join(numero(v) for v in valores) + "\n")
+    return linhas
+
+
+def _escrever_txt(dados_planilha, caminho_saida):
+    _gravar_linhas_txt(_linhas_txt(dados_planilha), caminho_saida)
+
+
+def _gravar_linhas_txt(linhas, caminho_saida):
+    # Uma única escrita, em um temporário que substitui o arquivo atomicamente
+    with medir("escrita_txt"):
+        gravar_atomicamente(caminho_saida, "".join(linhas).encode("utf-8"))
+        registrar_linhas(len(linhas) - 1)
+
+
+def _assinaturas_acumuladas(linhas):
+    # assinaturas[k]: hash das k primeiras linhas (permite reconhecer um
+    # arquivo anterior que seja prefixo do atual)
+    resumo = hashlib.sha256()
+    assinaturas = [resumo.hexdigest()]
+    for linha in linhas:
+        resumo.update(linha.encode("utf-8"))
+        assinaturas.append(resumo.hexdigest())
+    return assinaturas
+
+
+def _tamanho(caminho):
+    try:
+        return os.path.getsize(caminho)
+    except OSError:
+        return None
+
+
+def _ler_manifesto(caminho):
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
@@ -0,0 +1,60 @@
+# importacao_tardia.py
+
+import importlib
+import sys
+
+
+class ModuloTardio:
+    """
+    Representa um módulo que só é importado no primeiro acesso a um atributo.
+
+    Usado no lugar de `import numpy as np` (e semelhantes) no topo das
+    bibliotecas: `np = modulo_tardio("numpy")` não custa nada na importação e
+    `np.array(...)` se comporta exatamente como no módulo real.
+    """
+
+    def __init__(self, nome):
+        self._nome = nome
+        self._modulo = None
+
+    def __getattr__(self, atributo):
+        modulo = self._modulo
+        if modulo is None:
+            modulo = self._modulo = importlib.import_module(self._nome)
+        valor = getattr(modulo, atributo)
+        # Guarda no próprio objeto: os próximos acessos não passam por aqui
+        setattr(self, atributo, valor)
+        return valor
+
+    def __repr__(self):
+        estado = "importado" if self._modulo is not None else "não importado"
+        return f"<módulo tardio '{self._nome}' ({estado})>"
+
+
+def modulo_tardio(nome):
+    """
+    Retorna o módulo `nome`, se já importado, ou um ModuloTardio para ele.
+
+    Args:
+        nome (str): O nome completo do módulo (ex.: "matplotlib.pyplot").
+
+    Returns:
+        module | ModuloTardio: O módulo ou o seu representante tardio.
+    """
+    return sys.modules.get(nome) or ModuloTardio(nome)
+
+
+def ja_importado(nome):
+    """
+    Retorna o módulo `nome` se ele já tiver sido importado, senão None.
+
+    Útil para testes de tipo baratos: um objeto só pode ser um numpy.ndarray
+    se o NumPy já estiver carregado.
+
+    Args:
+        nome (str): O nome completo do módulo.
+
+    Returns:
+        module | None: O módulo ou None.
+    """
+    return sys.modules.get(nome)
@@ -0,0 +1,329 @@
+# indice_mensal.py
+
+import datetime
+import unicodedata
+
+from clima_comum import carregador
+from clima_comum.exportacao import COLUNAS_TEMPERATURA, tabela_temperaturas
+from clima_comum.importacao_tardia import modulo_tardio
+
+np = modulo_tardio("numpy")
+
+NOMES_MESES = (
+    "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
+)
+
+# Ano usado na chave quando os dados não têm ano (normais climatológicas)
+SEM_ANO = 0
+
+_ANO_MAXIMO = 100_000
+
+
+def _sem_acentos(texto):
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii").strip().lower()
+
+
+# Nomes completos e abreviações de três letras (sem acento, minúsculas) -> número
+_NUMEROS_MESES = {}
+for _numero, _nome in enumerate(NOMES_MESES, start=1):
+    _NUMEROS_MESES[_sem_acentos(_nome)] = _numero
+    _NUMEROS_MESES[_sem_acentos(_nome)[:3]] = _numero
+
+
+def normalizar_mes(mes):
+    """
+    Converte um mês em (ano, número do mês).
+
+    Aceita o número (1 a 12, também como texto), o nome em português (com ou
+    sem acento, em qualquer caixa, ou abreviado: "mar", "Março", "MARCO"),
+    um rótulo "Mês AAAA" (ex.: "Julho 2001") ou uma data (date, datetime,
+    numpy.datetime64), que também fornece o ano.
+
+    Args:
+        mes (int | str | datetime.date | numpy.datetime64): O mês.
+
+    Returns:
+        tuple: (ano ou None, mês de 1 a 12).
+
+    Raises:
+        ValueError: Se o valor não puder ser interpretado como mês.
+    """
+    if isinstance(mes, np.datetime64):
+        mes = mes.astype("datetime64[D]").item()
+    if isinstance(mes, datetime.date):
+        return mes.year, mes.month
+    if isinstance(mes, (int, np.integer)) and not isinstance(mes, bool) and 1 <= mes <= 12:
+        return None, int(mes)
+    if isinstance(mes, str):
+        texto = _sem_acentos(mes)
+        if texto.isdigit() and 1 <= int(texto) <= 12:
+            return None, int(texto)
+        if texto in _NUMEROS_MESES:
+            return None, _NUMEROS_MESES[texto]
+        nome, _, ano = texto.rpartition(" ")
+        if nome in _NUMEROS_MESES and ano.isdigit():
+            return int(ano), _NUMEROS_MESES[nome]
+    raise ValueError(f"O mês de '{mes}' não foi encontrado nos dados.")
+
+
+class IndiceMensal:
+    """
+    Índice de consultas de temperatura por (estação, ano, mês).
+
+    É montado uma única vez a partir dos dados carregados. Cada registro
+    vira uma chave inteira ordenada (estação, ano, mês), o que permite:
+    consultas pontuais em O(1) (dicionário), intervalos por busca binária
+    (fatia contígua do array) e consultas em lote vetorizadas
+    (numpy.searchsorted sobre todas as chaves de uma vez).
+
+    Os meses podem ser informados por nome, número ou data (ver normalizar_mes).
+    """
+
+    def __init__(self, estacoes, anos, meses, valores, colunas=COLUNAS_TEMPERATURA):
+        """
+        Args:
+            estacoes (sequence): A estação de cada registro.
+            anos (sequence): O ano de cada registro (None para dados sem ano).
+            meses (sequence): O mês de cada registro (1 a 12).
+            valores (array-like): Array (n_registros x len(colunas)).
+            colunas (sequence): Os nomes das colunas de valores.
+
+        Raises:
+            ValueError: Se houver registros repetidos, meses fora de 1 a 12
+                        ou anos fora de 0 a _ANO_MAXIMO - 1.
+        """
+        self.colunas = tuple(colunas)
+        self.estacoes = tuple(dict.fromkeys(estacoes))
+        self._ids_estacoes = {estacao: i for i, estacao in enumerate(self.estacoes)}
+
+        ids = np.array([self._ids_estacoes[e] for e in estacoes], dtype=np.int64)
+        anos = np.array([SEM_ANO if a is None else a for a in anos], dtype=np.int64)
+        chaves = _montar_chaves(ids, anos, _validar_meses(meses))
+
+        ordem = np.argsort(chaves, kind="stable")
+        self._chaves = chaves[ordem]
+        if np.any(np.diff(self._chaves) == 0):
+            raise ValueError("Há registros repetidos para a mesma estação, ano e mês.")
+        self._valores = np.asarray(valores, dtype=np.float64).reshape(len(chaves), len(self.colunas))[ordem]
+        self._posicoes = {int(chave): i for i, chave in enumerate(self._chaves)}
+
+    def __len__(self):
+        return len(self._chaves)
+
+    @classmethod
+    def de_listas(cls, meses, minimas, maximas, medias, estacao=None):
+        """
+        Monta o índice a partir das listas de ler_dados_climaticos_de_txt.
+
+        Args:
+            meses (list): Os nomes (ou rótulos "Mês AAAA") dos meses.
+            minimas, maximas, medias (list): As temperaturas.
+            estacao (str, optional): O nome da estação.
+
+        Returns:
+            IndiceMensal: O índice.
+        """
+        normalizados = [normalizar_mes(mes) for mes in meses]
+        return cls(
+            [estacao] * len(meses),
+            [ano for ano, _ in normalizados],
+            [numero for _, numero in normalizados],
+            np.column_stack([minimas, maximas, medias])
+        )
+
+    @classmethod
+    def de_planilhas(cls, arquivo_excel):
+        """
+        Monta o índice com todas as abas Historico_Clima_* de um arquivo.
+
+        A estação de cada registro vem de carregador.nome_estacao (ex.:
+        "Rio de Janeiro"), como em analise_lib.carregar_dados_cidades.
+
+        Args:
+            arquivo_excel (str | dict): O caminho do .xlsx ou as abas já
+                                        carregadas pelo carregador.
+
+        Returns:
+            IndiceMensal: O índice.
+        """
+        planilhas = arquivo_excel if isinstance(arquivo_excel, dict) \
+            else carregador.carregar_planilhas_climaticas(arquivo_excel)
+        estacoes, anos, meses, valores = [], [], [], []
+        for nome, dados in planilhas.items():
+            normalizados = [normalizar_mes(mes) for mes in dados.meses]
+            estacao = carregador.nome_estacao(nome)
+            estacoes += [estacao] * len(normalizados)
+            anos += [ano for ano, _ in normalizados]
+            meses += [numero for _, numero in normalizados]
+            valores.append(tabela_temperaturas(dados))
+        return cls(estacoes, anos, meses, np.concatenate(valores) if valores else np.empty((0, 3)))
+
+    @classmethod
+    def de_serie_diaria(cls, serie):
+        """
+        Monta o índice com as médias mensais de uma serie_temporal.SerieDiaria.
+
+        Args:
+            serie (SerieDiaria): A série diária.
+
+        Returns:
+            IndiceMensal: O índice (uma entrada por ano e mês da série).
+        """
+        periodos = serie.resumo_mensal()["periodos"]
+        return cls(
+            [serie.estacao] * len(periodos),
+            periodos[:, 0].tolist(),
+            periodos[:, 1],
+            np.stack([serie.tabela_temperaturas(ano) for ano in np.unique(periodos[:, 0])])
+              .reshape(-1, 3)[_posicoes_no_ano(periodos)]
+        )
+
+    def consultar(self, mes, estacao=None, ano=None, coluna="Media"):
+        """
+        Retorna o valor de um mês (consulta pontual, O(1)).
+
+        Args:
+            mes (int | str | date): O mês (ver normalizar_mes); uma data
+                                    também define o ano.
+            estacao (str, optional): A estação; pode ser omitida quando o
+                                     índice tem uma só.
+            ano (int, optional): O ano; omitido para dados sem ano.
+            coluna (str): A coluna desejada (padrão: "Media").
+
+        Returns:
+            float: O valor encontrado.
+
+        Raises:
+            ValueError: Se o mês não for encontrado nos dados.
+        """
+        ano_mes, numero = normalizar_mes(mes)
+        id_estacao = self._id_estacao(estacao)
+        ano_escolhido = ano if ano is not None else ano_mes
+        posicao = self._posicoes.get(int(_montar_chaves(id_estacao, _ano_chave(ano_escolhido), numero)))
+        if posicao is None and ano is None and ano_mes is not None:
+            # Data informada para dados sem ano: usa a normal do mês
+            posicao = self._posicoes.get(int(_montar_chaves(id_estacao, SEM_ANO, numero)))
+        if posicao is None:
+            raise ValueError(f"O mês de '{mes}' não foi encontrado nos dados.")
+        return float(self._valores[posicao, self._coluna(coluna)])
+
+    def consultar_intervalo(self, inicio, fim, estacao=None, coluna="Media"):
+        """
+        Retorna todos os meses entre `inicio` e `fim` (inclusive) de uma estação.
+
+        Args:
+            inicio, fim (tuple | date | str): (ano, mês), uma data ou um mês
+                                              (sem ano, para dados sem ano).
+            estacao (str, optional): A estação.
+            coluna (str): A coluna desejada.
+
+        Returns:
+            tuple: (lista de (ano, mês), numpy.ndarray com os valores).
+        """
+        id_estacao = self._id_estacao(estacao)
+        chave_inicio = _montar_chaves(id_estacao, *_ano_e_mes(inicio))
+        chave_fim = _montar_chaves(id_estacao, *_ano_e_mes(fim))
+        a, b = np.searchsorted(self._chaves, [chave_inicio, chave_fim + 1])
+        anos, meses = divmod(self._chaves[a:b] % (_ANO_MAXIMO * 12), 12)
+        periodos = [(None if ano == SEM_ANO else int(ano), int(mes) + 1) for ano, mes in zip(anos, meses)]
+        return periodos, self._valores[a:b, self._coluna(coluna)].copy()
+
+    def consultar_lote(self, meses, estacoes=None, anos=None, coluna="Media"):
+        """
+        Consulta vários meses de uma vez (busca vetorizada).
+
+        Args:
+            meses (sequence): Os meses (ver normalizar_mes). Um array de
+                              inteiros de 1 a 12 é usado sem conversão.
+            estacoes (str | sequence, optional): Uma estação para todos ou uma
+                                                 por mês.
+            anos (int | sequence, optional): Um ano para todos ou um por mês.
+            coluna (str): A coluna desejada.
+
+        Returns:
+            numpy.ndarray: Os valores, com NaN onde o mês não existe.
+
+        Raises:
+            ValueError: Se algum mês ou ano for inválido (ex.: mês 13).
+        """
+        if isinstance(meses, np.ndarray) and np.issubdtype(meses.dtype, np.integer):
+            numeros = _validar_meses(meses)
+            anos_meses = np.full(len(numeros), SEM_ANO, dtype=np.int64)
+        else:
+            normalizados = [normalizar_mes(mes) for mes in meses]
+            numeros = np.array([n for _, n in normalizados], dtype=np.int64)
+            anos_meses = np.array([_ano_chave(a) for a, _ in normalizados], dtype=np.int64)
+
+        if anos is None:
+            anos_consulta = anos_meses
+        else:
+            anos = np.atleast_1d(anos)
+            if not np.issubdtype(anos.dtype, np.integer):
+                anos = np.array([_ano_chave(a) for a in anos], dtype=np.int64)
+            anos_consulta = np.broadcast_to(anos.astype(np.int64), numeros.shape)
+
+        if estacoes is None or isinstance(estacoes, str):
+            ids = np.full(len(numeros), self._id_estacao(estacoes), dtype=np.int64)
+        else:
+            ids = np.array([self._id_estacao(e) for e in estacoes], dtype=np.int64)
+
+        chaves = _montar_chaves(ids, anos_consulta, numeros)
+        posicoes = np.searchsorted(self._chaves, chaves).clip(max=max(len(self._chaves) - 1, 0))
+        encontrados = (self._chaves[posicoes] == chaves) if len(self._chaves) else np.zeros(len(chaves), bool)
+        resultado = np.full(len(chaves), np.nan)
+        resultado[encontrados] = self._valores[posicoes[encontrados], self._coluna(coluna)]
+        return resultado
+
+    def _id_estacao(self, estacao):
+        if estacao is None:
+            if len(self.estacoes) == 1:
+                return 0
+            raise ValueError("Informe a estação: o índice tem mais de uma.")
+        try:
+            return self._ids_estacoes[estacao]
+        except KeyError:
+            raise ValueError(f"A estação '{estacao}' não foi encontrada nos dados.")
+
+    def _coluna(self, coluna):
+        try:
+            return self.colunas.index(coluna)
+        except ValueError:
+            raise ValueError(f"Coluna '{coluna}' inválida. Use uma de: {', '.join(self.colunas)}.")
+
+
+def _montar_chaves(ids, anos, meses):
+    # Um ano fora de [0, _ANO_MAXIMO) cairia na faixa de chaves de outra estação
+    anos = np.asarray(anos, dtype=np.int64)
+    if anos.size and (anos.min() < 0 or anos.max() >= _ANO_MAXIMO):
+        raise ValueError(f"Os anos devem estar entre 0 e {_ANO_MAXIMO - 1}.")
+    return (np.asarray(ids, dtype=np.int64) * _ANO_MAXIMO + anos) * 12 + (np.asarray(meses) - 1)
+
+
+def _validar_meses(meses):
+    # Um mês 13 viraria o janeiro do ano seguinte na chave; True viraria 1
+    meses = np.asarray(meses)
+    if meses.dtype == bool or (meses.dtype == object and any(isinstance(m, bool) for m in meses.flat)):
+        raise ValueError("Os meses devem ser números de 1 a 12, não booleanos.")
+    numeros = meses.astype(np.int64)
+    if numeros.size and (numeros.min() < 1 or numeros.max() > 12):
+        raise ValueError("Os meses devem estar entre 1 e 12.")
+    return numeros
+
+
+def _ano_chave(ano):
+    return SEM_ANO if ano is None else int(ano)
+
+
+def _ano_e_mes(valor):
+    if isinstance(valor, tuple):
+        ano, mes = valor
+        return _ano_chave(ano), normalizar_mes(mes)[1]
+    ano, mes = normalizar_mes(valor)
+    return _ano_chave(ano), mes
+
+
+def _posicoes_no_ano(periodos):
+    # Posição de cada (ano, mês) nas tabelas (12 x 3) empilhadas por ano
+    anos = np.unique(periodos[:, 0])
+    return np.searchsorted(anos, periodos[:, 0]) * 12 + periodos[:, 1] - 1
@@ -0,0 +1,260 @@
+# instrumentacao.py
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import nullcontext
+
+# Estado global da instrumentação. Desativada, cada função instrumentada só
+# faz um teste de booleano antes de chamar a original.
+# "tracemalloc_proprio": o tracemalloc foi ligado por ativar() (e só então é
+# desligado por desativar(); uma sessão iniciada por quem chamou é mantida).
+_ESTADO = {"ativo": False, "memoria": False, "tracemalloc_proprio": False}
+
+# Eventos guardados para exportar_trace; acima disso, os mais antigos são
+# descartados (processos longos não acumulam memória sem limite)
+MAXIMO_EVENTOS = 200_000
+
+_TRAVA = threading.Lock()
+_LOCAL = threading.local()
+_REGISTROS = {}   # {nome: {"chamadas", "tempo_total", "cpu_total", "pico_memoria", "linhas"}}
+_EVENTOS = deque(maxlen=MAXIMO_EVENTOS)  # eventos "X" no formato Chrome Trace (chrome://tracing)
+_PILHAS = {}      # {"a;b;c": tempo próprio em µs} no formato folded do flamegraph.pl
+_INICIO = time.perf_counter()
+_NADA = nullcontext()
+
+
+def ativar(memoria=False):
+    """
+    Liga a coleta de métricas das funções instrumentadas.
+
+    Args:
+        memoria (bool): Se True, mede também o pico de memória de cada chamada
+                        com tracemalloc (mais lento).
+    """
+    _ESTADO["memoria"] = memoria
+    if memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _ESTADO["tracemalloc_proprio"] = True
+    _ESTADO["ativo"] = True
+
+
+def desativar():
+    """Desliga a coleta (as métricas já coletadas são mantidas)."""
+    _ESTADO["ativo"] = False
+    if _ESTADO["tracemalloc_proprio"] and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _ESTADO["tracemalloc_proprio"] = False
+    _ESTADO["memoria"] = False
+
+
+def esta_ativa():
+    """Retorna True se a coleta estiver ligada."""
+    return _ESTADO["ativo"]
+
+
+def limpar():
+    """Descarta todas as métricas coletadas."""
+    with _TRAVA:
+        _REGISTROS.clear()
+        _EVENTOS.clear()
+        _PILHAS.clear()
+
+
+def instrumentar(funcao=None, nome=None):
+    """
+    Decorador que registra chamadas, tempo de parede, tempo de CPU, pico de
+    memória e linhas processadas de uma função, quando a coleta está ativa.
+
+    As linhas processadas são inferidas do retorno (len do resultado, ou a
+    soma dos len dos itens de uma tupla) e podem ser informadas
+    explicitamente dentro da função com registrar_linhas().
+
+    Args:
+        funcao (callable): A função (uso como @instrumentar).
+        nome (str, optional): O nome registrado; padrão "modulo.funcao".
+
+    Returns:
+        callable: A função instrumentada.
+    """
+    if funcao is None:
+        return functools.partial(instrumentar, nome=nome)
+    nome = nome or f"{funcao.__module__}.{funcao.__qualname__}"
+
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        if not _ESTADO["ativo"]:
+            return funcao(*args, **kwargs)
+        with _Medicao(nome) as medicao:
+            resultado = funcao(*args, **kwargs)
+            if not medicao.linhas_informadas:
+                medicao.linhas = _contar_linhas(resultado)
+            return resultado
+
+    return envoltorio
+
+
+def medir(nome):
+    """
+    Context manager que mede um trecho de código (ex.: o savefig de um gráfico).
+
+    Desativada a coleta, retorna um context manager vazio.
+
+    Args:
+        nome (str): O nome do trecho.
+    """
+    return _Medicao(nome) if _ESTADO["ativo"] else _NADA
+
+
+def registrar_linhas(quantidade):
+    """
+    Soma `quantidade` às linhas processadas pela medição em andamento.
+
+    Args:
+        quantidade (int): Quantidade de linhas/registros processados.
+    """
+    if _ESTADO["ativo"]:
+        pilha = getattr(_LOCAL, "pilha", None)
+        if pilha:
+            pilha[-1].linhas += quantidade
+            pilha[-1].linhas_informadas = True
+
+
+def estatisticas():
+    """
+    Retorna as métricas por função/trecho.
+
+    Returns:
+        dict: {nome: {"chamadas", "tempo_total", "tempo_medio", "cpu_total",
+               "pico_memoria", "linhas"}}, com tempos em segundos e memória
+               em bytes (None se não medida).
+    """
+    with _TRAVA:
+        return {
+            nome: dict(registro, tempo_medio=registro["tempo_total"] / registro["chamadas"])
+            for nome, registro in _REGISTROS.items()
+        }
+
+
+def exportar_json(caminho):
+    """Grava as métricas (ver estatisticas()) em JSON."""
+    with open(caminho, mode="w", encoding="utf-8") as arquivo:
+        json.dump(estatisticas(), arquivo, ensure_ascii=False, indent=2)
+
+
+def exportar_trace(caminho):
+    """
+    Grava a linha do tempo das chamadas no formato Chrome Trace Event.
+
+    O arquivo pode ser aberto em chrome://tracing, Perfetto ou speedscope,
+    que o exibem como flame graph. Só os últimos MAXIMO_EVENTOS eventos são
+    mantidos; os totais de estatisticas() e exportar_pilhas() não têm limite.
+    """
+    with _TRAVA:
+        eventos = list(_EVENTOS)
+    with open(caminho, mode="w", encoding="utf-8") as arquivo:
+        json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, arquivo, ensure_ascii=False)
+
+
+def exportar_pilhas(caminho):
+    """
+    Grava o tempo próprio de cada pilha de chamadas no formato "folded"
+    (uma linha "a;b;c microssegundos"), aceito por flamegraph.pl e speedscope.
+    """
+    with _TRAVA:
+        linhas = [f"{pilha} {int(tempo)}" for pilha, tempo in _PILHAS.items()]
+    with open(caminho, mode="w", encoding="utf-8") as arquivo:
+        arquivo.write("\n".join(linhas) + "\n")
+
+
+class _Medicao:
+    __slots__ = ("nome", "linhas", "linhas_informadas", "_inicio", "_cpu", "_memoria",
+                 "_pico_filhos", "_tempo_filhos")
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.linhas = 0
+        self.linhas_informadas = False
+
+    def __enter__(self):
+        pilha = _LOCAL.__dict__.setdefault("pilha", [])
+        if _ESTADO["memoria"] and tracemalloc.is_tracing():
+            atual, pico = tracemalloc.get_traced_memory()
+            if pilha:
+                # O pico do pai até aqui seria perdido com o reset_peak
+                pilha[-1]._pico_filhos = max(pilha[-1]._pico_filhos, pico)
+            tracemalloc.reset_peak()
+            self._memoria = atual
+        else:
+            self._memoria = None
+        self._pico_filhos = 0
+        self._tempo_filhos = 0.0
+        pilha.append(self)
+        self._cpu = time.process_time()
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo_erro, erro, rastreamento):
+        fim = time.perf_counter()
+        duracao = fim - self._inicio
+        cpu = time.process_time() - self._cpu
+        pilha = _LOCAL.pilha
+        pilha.pop()
+
+        pico = None
+        if self._memoria is not None and tracemalloc.is_tracing():
+            pico_absoluto = max(tracemalloc.get_traced_memory()[1], self._pico_filhos)
+            pico = max(0, pico_absoluto - self._memoria)
+            if pilha:
+                pilha[-1]._pico_filhos = max(pilha[-1]._pico_filhos, pico_absoluto)
+        if pilha:
+            pilha[-1]._tempo_filhos += duracao
+
+        caminho_pilha = ";".join([m.nome for m in pilha] + [self.nome])
+        with _TRAVA:
+            registro = _REGISTROS.setdefault(self.nome, {
+                "chamadas": 0, "tempo_total": 0.0, "cpu_total": 0.0, "pico_memoria": None, "linhas": 0
+            })
+            registro["chamadas"] += 1
+            registro["tempo_total"] += duracao
+            registro["cpu_total"] += cpu
+            registro["linhas"] += self.linhas
+            if pico is not None:
+                registro["pico_memoria"] = max(registro["pico_memoria"] or 0, pico)
+            _EVENTOS.append({
+                "name": self.nome, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                "ts": (self._inicio - _INICIO) * 1e6, "dur": duracao * 1e6,
+                "args": {"linhas": self.linhas, "cpu_s": cpu, "pico_memoria": pico},
+            })
+            _PILHAS[caminho_pilha] = _PILHAS.get(caminho_pilha, 0.0) + (duracao - self._tempo_filhos) * 1e6
+        return False
+
+
+def _contar_linhas(resultado):
+    if isinstance(resultado, tuple):
+        return sum(_contar_linhas(item) for item in resultado)
+    if isinstance(resultado, (str, bytes, dict)) or not hasattr(resultado, "__len__"):
+        return 0
+    try:
+        return len(resultado)
+    except TypeError:  # ex.: array NumPy 0-d
+        return 0
+
+
+def _exportar_ao_sair(prefixo):
+    exportar_json(prefixo + ".json")
+    exportar_trace(prefixo + ".trace.json")
+    exportar_pilhas(prefixo + ".folded")
+
+
+# CLIMA_PERFIL=1 liga a coleta na importação; CLIMA_PERFIL_SAIDA=prefixo grava
+# prefixo.json, prefixo.trace.json e prefixo.folded ao final do processo.
+if os.environ.get("CLIMA_PERFIL", "") in ("1", "true", "sim", "memoria"):
+    ativar(memoria=os.environ["CLIMA_PERFIL"] == "memoria")
+    if os.environ.get("CLIMA_PERFIL_SAIDA"):
+        atexit.register(_exportar_ao_sair, os.environ["CLIMA_PERFIL_SAIDA"])
@@ -0,0 +1,161 @@
+# registro_estacao.py
+
+import sys
+from array import array
+
+from clima_comum import carregador
+from clima_comum.importacao_tardia import modulo_tardio
+
+np = modulo_tardio("numpy")
+
+# Tipo das colunas de temperatura (array.array): float32
+TIPO_VALORES = "f"
+
+# Chaves do dicionário de criar_dicionario_climatico, na ordem das colunas
+CHAVES_DICIONARIO = ("mes", "temperatura_minima", "temperatura_maxima", "temperatura_media")
+
+
+class RegistroEstacao:
+    """
+    Temperaturas mensais de uma estação em formato compacto.
+
+    Cada coluna é um array.array float32 (4 bytes por valor, contra ~32 de
+    um float em uma lista) e os nomes dos meses são internados, de modo que
+    milhares de registros compartilham as mesmas strings. O registro é
+    compatível com os formatos antigos:
+
+    - desempacota como o retorno de ler_dados_climaticos_de_txt:
+      `meses, minimas, maximas, medias = registro`;
+    - aceita as chaves de criar_dicionario_climatico: `registro["temperatura_media"]`;
+    - np.asarray(registro) dá a tabela (meses x [mínima, máxima, média]) de
+      carregar_dados_climaticos_numpy.
+
+    consultar, como_listas e como_dicionario devolvem floats com a precisão
+    do float32 (7 dígitos significativos), ex.: 24.1 e não 24.100000381469727.
+    """
+
+    __slots__ = ("estacao", "meses", "minimas", "maximas", "medias", "_posicoes")
+
+    def __init__(self, meses, minimas, maximas, medias, estacao=None):
+        """
+        Args:
+            meses (sequence): Os nomes dos meses.
+            minimas (iterable): As temperaturas mínimas.
+            maximas (iterable): As temperaturas máximas.
+            medias (iterable): As temperaturas médias.
+            estacao (str, optional): O nome da estação.
+
+        Raises:
+            ValueError: Se as colunas tiverem tamanhos diferentes.
+        """
+        self.estacao = estacao
+        self.meses = tuple(sys.intern(str(mes)) for mes in meses)
+        self.minimas = _coluna(minimas)
+        self.maximas = _coluna(maximas)
+        self.medias = _coluna(medias)
+        if not len(self.meses) == len(self.minimas) == len(self.maximas) == len(self.medias):
+            raise ValueError("As colunas do registro precisam ter o mesmo número de meses.")
+        # {mes: posição}, montado na primeira consulta (registros só
+        # carregados e exportados não pagam pelo dicionário)
+        self._posicoes = None
+
+    @classmethod
+    def de_planilha(cls, dados_planilha, estacao=None):
+        """
+        Monta o registro a partir de uma aba lida pelo carregador.
+
+        Args:
+            dados_planilha (carregador.DadosPlanilha): Os dados da aba.
+            estacao (str, optional): O nome da estação.
+
+        Returns:
+            RegistroEstacao: O registro.
+        """
+        valores = dados_planilha.valores
+        return cls(dados_planilha.meses, valores[carregador.METRICA_MINIMA],
+                   valores[carregador.METRICA_MAXIMA], valores[carregador.METRICA_MEDIA], estacao)
+
+    @property
+    def n_meses(self):
+        """int: A quantidade de meses do registro."""
+        return len(self.meses)
+
+    def __iter__(self):
+        return iter((self.meses, self.minimas, self.maximas, self.medias))
+
+    def __getitem__(self, chave):
+        try:
+            coluna = CHAVES_DICIONARIO.index(chave)
+        except ValueError:
+            raise KeyError(chave) from None
+        return (self.meses, self.minimas, self.maximas, self.medias)[coluna]
+
+    def keys(self):
+        """Retorna as chaves de criar_dicionario_climatico."""
+        return CHAVES_DICIONARIO
+
+    def __array__(self, dtype=None, copy=None):
+        tabela = self.tabela()
+        return tabela if dtype is None else tabela.astype(dtype)
+
+    def __repr__(self):
+        return f"RegistroEstacao(estacao={self.estacao!r}, n_meses={self.n_meses})"
+
+    def tabela(self):
+        """
+        Retorna as temperaturas como array NumPy float32 (meses x [mínima, máxima, média]).
+
+        Returns:
+            numpy.ndarray: Array com shape (n_meses, 3).
+        """
+        colunas = [np.frombuffer(coluna, dtype=np.float32) for coluna in (self.minimas, self.maximas, self.medias)]
+        return np.column_stack(colunas) if self.n_meses else np.empty((0, 3), dtype=np.float32)
+
+    def consultar(self, mes):
+        """
+        Retorna a temperatura média de um mês.
+
+        Args:
+            mes (str): O nome do mês.
+
+        Returns:
+            float: A temperatura média do mês.
+
+        Raises:
+            ValueError: Se o mês não for encontrado no registro.
+        """
+        if self._posicoes is None:
+            # Meses repetidos ficam com a primeira posição, como tuple.index
+            self._posicoes = {}
+            for posicao, nome in enumerate(self.meses):
+                self._posicoes.setdefault(nome, posicao)
+        posicao = self._posicoes.get(mes)
+        if posicao is None:
+            raise ValueError(f"O mês de '{mes}' não foi encontrado nos dados.")
+        return _para_float(self.medias[posicao])
+
+    def como_listas(self):
+        """Retorna (meses, minimas, maximas, medias) como listas, no formato antigo."""
+        return (list(self.meses), _para_floats(self.minimas),
+                _para_floats(self.maximas), _para_floats(self.medias))
+
+    def como_dicionario(self):
+        """Retorna o dicionário de listas de criar_dicionario_climatico."""
+        return dict(zip(CHAVES_DICIONARIO, self.como_listas()))
+
+
+def _coluna(valores):
+    if hasattr(valores, "dtype"):
+        # Arrays NumPy: conversão em bloco, sem passar valor a valor
+        return array(TIPO_VALORES, np.ascontiguousarray(valores, dtype=np.float32).tobytes())
+    return array(TIPO_VALORES, valores)
+
+
+def _para_float(valor):
+    # O float32 guarda ~7 dígitos significativos; devolve o decimal mais curto
+    # com essa precisão (24.1 em vez de 24.100000381469727)
+    return float(format(valor, ".7g"))
+
+
+def _para_floats(coluna):
+    return [_para_float(valor) for valor in coluna]
@@ -0,0 +1,280 @@
+# relatorio.py
+
+import csv
+import math
+import os
+import re
+import unicodedata
+
+from clima_comum.importacao_tardia import modulo_tardio
+
+openpyxl = modulo_tardio("openpyxl")
+
+FORMATOS_RELATORIO = ("xlsx", "csv", "parquet")
+
+# Colunas das abas de resumo (mesmos nomes do relatório original)
+COLUNAS_RESUMO = [
+    "Cidade", "Mês maior temp.", "Mês menor temp.", "Mês mais chuvoso",
+    "Mês menos chuvoso", "Chuva anual (mm)", "Umidade média (%)", "Cidade mais úmida"
+]
+COLUNAS_MEDIAS = ["Cidade", "Média Temp. (°C)", "Mínima Temp. (°C)", "Máxima Temp. (°C)"]
+
+# Chaves da análise e das médias na ordem das colunas acima
+_CHAVES_ANALISE = [
+    "mes_maior_temp", "mes_menor_temp", "mes_mais_chuvoso",
+    "mes_menos_chuvoso", "chuva_anual", "umidade_media"
+]
+_CHAVES_MEDIAS = ["Media_Temp_C", "Minima_Temp_C", "Maxima_Temp_C"]
+
+# Limite do Excel para nomes de abas
+_TAMANHO_MAXIMO_ABA = 31
+
+
+class EscritorRelatorio:
+    """
+    Grava o relatório da análise climática de forma incremental.
+
+    Os dados de cada cidade são gravados assim que a cidade é adicionada,
+    sem montar DataFrames intermediários nem manter o relatório inteiro em
+    memória; só as linhas de resumo (uma por cidade) ficam guardadas até o
+    fechamento, pois a coluna "Cidade mais úmida" depende de todas as cidades.
+
+    Formatos:
+        "xlsx": um arquivo Excel gravado em modo write-only do openpyxl, com as
+                abas Resumo_Analises, Medias_Temperaturas e Dados_<cidade>.
+        "csv": uma pasta com um .csv por aba.
+        "parquet": uma pasta com Resumo_Analises.parquet,
+                   Medias_Temperaturas.parquet e Dados.parquet (um row group
+                   por cidade, com a coluna "Cidade"). Requer o pyarrow.
+
+    Exemplo:
+        with EscritorRelatorio("relatorio.xlsx") as escritor:
+            for cidade, df_cidade in dados.items():
+                escritor.adicionar_cidade(cidade, df_cidade, medias[cidade], analises[cidade])
+    """
+
+    def __init__(self, caminho_saida, formato="xlsx"):
+        """
+        Args:
+            caminho_saida (str): O arquivo .xlsx ou, para "csv"/"parquet", a
+                                 pasta onde os arquivos serão gravados.
+            formato (str): Um de FORMATOS_RELATORIO.
+
+        Raises:
+            ValueError: Se o formato não for suportado.
+        """
+        if formato not in FORMATOS_RELATORIO:
+            raise ValueError(f"Formato '{formato}' inválido. Use um de: {', '.join(FORMATOS_RELATORIO)}.")
+        self.caminho_saida = caminho_saida
+        self.formato = formato
+        self._linhas_resumo = []
+        self._linhas_medias = []
+        self._fechado = False
+        self._colunas_dados = None
+        self._abas_dados = set()
+        self._arquivos = []
+
+        if formato == "xlsx":
+            self._workbook = openpyxl.Workbook(write_only=True)
+            # As abas de resumo são criadas primeiro para ficarem no início
+            self._aba_resumo = self._workbook.create_sheet("Resumo_Analises")
+            self._aba_medias = self._workbook.create_sheet("Medias_Temperaturas")
+        else:
+            os.makedirs(caminho_saida, exist_ok=True)
+            self._escritor_parquet = None
+
+    def adicionar_cidade(self, cidade, df_cidade, medias, analise):
+        """
+        Grava os dados de uma cidade e guarda as linhas de resumo dela.
+
+        Args:
+            cidade (str): O nome da cidade.
+            df_cidade (pd.DataFrame): Os dados da cidade (meses x colunas).
+            medias (pd.Series | dict): As médias anuais de temperatura.
+            analise (pd.Series | dict): O resultado da análise detalhada.
+        """
+        self._linhas_resumo.append([cidade] + [_valor_celula(analise[chave]) for chave in _CHAVES_ANALISE])
+        self._linhas_medias.append([cidade] + [_valor_celula(medias[chave]) for chave in _CHAVES_MEDIAS])
+
+        colunas = [str(coluna) for coluna in df_cidade.columns]
+        linhas = [
+            [mes] + [_valor_celula(valor) for valor in valores]
+            for mes, valores in zip(df_cidade.index.tolist(), df_cidade.to_numpy().tolist())
+        ]
+
+        if self.formato == "parquet":
+            self._gravar_parquet_dados(cidade, colunas, linhas,
+                                       [df_cidade.index.dtype] + list(df_cidade.dtypes))
+            return
+
+        # Nomes normalizados podem coincidir (acentos, limite de 31
+        # caracteres; no csv, também sistemas de arquivos sem distinção de
+        # maiúsculas): cada cidade recebe um nome ainda não usado
+        nome_aba = nome_aba_dados(cidade, self._abas_dados)
+        self._abas_dados.add(nome_aba.lower())
+        if self.formato == "xlsx":
+            aba = self._workbook.create_sheet(nome_aba)
+            aba.append([None] + colunas)
+            for linha in linhas:
+                aba.append(linha)
+        else:
+            self._gravar_csv(nome_aba, [""] + colunas, linhas)
+
+    def fechar(self, cidade_umida=None):
+        """
+        Grava as abas de resumo e finaliza o relatório.
+
+        Args:
+            cidade_umida (str, optional): O nome da cidade mais úmida; se
+                                          omitido, é a de maior umidade média
+                                          (entre as que têm umidade).
+        """
+        if self._fechado:
+            return
+        self._fechado = True
+
+        if cidade_umida is None:
+            # Cidades sem umidade (célula vazia) ficam fora da comparação
+            com_umidade = [linha for linha in self._linhas_resumo if linha[6] is not None]
+            if com_umidade:
+                cidade_umida = max(com_umidade, key=lambda linha: linha[6])[0]
+        linhas_resumo = [linha + [cidade_umida] for linha in self._linhas_resumo]
+
+        if self.formato == "xlsx":
+            for aba, colunas, linhas in ((self._aba_resumo, COLUNAS_RESUMO, linhas_resumo),
+                                         (self._aba_medias, COLUNAS_MEDIAS, self._linhas_medias)):
+                aba.append(colunas)
+                for linha in linhas:
+                    aba.append(linha)
+            self._workbook.save(self.caminho_saida)
+        elif self.formato == "csv":
+            self._gravar_csv("Resumo_Analises", COLUNAS_RESUMO, linhas_resumo)
+            self._gravar_csv("Medias_Temperaturas", COLUNAS_MEDIAS, self._linhas_medias)
+        else:
+            if self._escritor_parquet is not None:
+                self._escritor_parquet.close()
+            self._gravar_parquet("Resumo_Analises", COLUNAS_RESUMO, linhas_resumo)
+            self._gravar_parquet("Medias_Temperaturas", COLUNAS_MEDIAS, self._linhas_medias)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_erro, erro, rastreamento):
+        if tipo_erro is None:
+            self.fechar()
+        else:
+            self.descartar()
+
+    def descartar(self):
+        """
+        Abandona o relatório sem gravar as abas de resumo.
+
+        Usado quando ocorre um erro dentro do bloco `with`: o .xlsx não é
+        salvo e os arquivos já gravados nas pastas csv/parquet são removidos,
+        para não deixar um relatório parcial com aparência de completo.
+        """
+        if self._fechado:
+            return
+        self._fechado = True
+        if self.formato == "xlsx":
+            # Fecha as abas (arquivos temporários do openpyxl) sem salvar
+            for aba in self._workbook.worksheets:
+                aba.close()
+        elif self._escritor_parquet is not None:
+            self._escritor_parquet.close()
+        for caminho in self._arquivos:
+            try:
+                os.remove(caminho)
+            except FileNotFoundError:
+                pass
+
+    def _gravar_csv(self, nome, colunas, linhas):
+        caminho = os.path.join(self.caminho_saida, f"{nome}.csv")
+        self._arquivos.append(caminho)
+        with open(caminho, mode="w", encoding="utf-8", newline="") as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(colunas)
+            escritor.writerows(linhas)
+
+    def _gravar_parquet_dados(self, cidade, colunas, linhas, tipos):
+        pa, pq = _importar_pyarrow()
+        if self._escritor_parquet is None:
+            # Esquema declarado pelos dtypes (e não inferido dos valores): uma
+            # coluna toda vazia na primeira cidade não vira tipo null
+            self._colunas_dados = colunas
+            esquema = pa.schema([("Cidade", pa.string())] + [
+                (coluna, _tipo_arrow(pa, tipo)) for coluna, tipo in zip(["Mes"] + colunas, tipos)
+            ])
+            caminho = os.path.join(self.caminho_saida, "Dados.parquet")
+            self._arquivos.append(caminho)
+            self._escritor_parquet = pq.ParquetWriter(caminho, esquema)
+        elif colunas != self._colunas_dados:
+            raise ValueError(f"As colunas de '{cidade}' diferem das cidades anteriores.")
+        tabela = pa.table(_colunas_para_dict(["Cidade", "Mes"] + colunas,
+                                             [[cidade] + linha for linha in linhas]),
+                          schema=self._escritor_parquet.schema)
+        self._escritor_parquet.write_table(tabela)
+
+    def _gravar_parquet(self, nome, colunas, linhas):
+        pa, pq = _importar_pyarrow()
+        pq.write_table(pa.table(_colunas_para_dict(colunas, linhas)),
+                       os.path.join(self.caminho_saida, f"{nome}.parquet"))
+
+
+def nome_aba_dados(cidade, existentes=()):
+    """
+    Monta o nome da aba de dados de uma cidade no relatório (ex.: "Dados_Macae").
+
+    Acentos e caracteres não permitidos pelo Excel são removidos e o nome é
+    limitado a 31 caracteres. Se o nome já estiver em `existentes` (sem
+    diferenciar maiúsculas, como o Excel), recebe um sufixo "_2", "_3"...
+
+    Args:
+        cidade (str): O nome da cidade.
+        existentes (collection, optional): Os nomes já usados, em minúsculas.
+
+    Returns:
+        str: O nome da aba.
+    """
+    sem_acentos = unicodedata.normalize("NFKD", cidade).encode("ascii", "ignore").decode("ascii")
+    nome = ("Dados_" + re.sub(r"[\\/*?:\[\]]", "", sem_acentos).replace(" ", "_"))[:_TAMANHO_MAXIMO_ABA]
+    candidato, numero = nome, 1
+    while candidato.lower() in existentes:
+        numero += 1
+        sufixo = f"_{numero}"
+        candidato = nome[:_TAMANHO_MAXIMO_ABA - len(sufixo)] + sufixo
+    return candidato
+
+
+def _valor_celula(valor):
+    # Converte escalares NumPy para tipos nativos e NaN para célula vazia
+    if hasattr(valor, "item"):
+        valor = valor.item()
+    if isinstance(valor, float) and math.isnan(valor):
+        return None
+    return valor
+
+
+def _colunas_para_dict(colunas, linhas):
+    return {coluna: list(valores) for coluna, valores in zip(colunas, zip(*linhas))} if linhas \
+        else {coluna: [] for coluna in colunas}
+
+
+def _tipo_arrow(pa, dtype):
+    # Números e booleanos pelo tipo NumPy; o resto (object, texto) como string
+    if dtype.kind == "b":
+        return pa.bool_()
+    if dtype.kind in "iu":
+        return pa.int64()
+    if dtype.kind == "f":
+        return pa.float64()
+    return pa.string()
+
+
+def _importar_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("O formato 'parquet' requer o pacote pyarrow (pip install pyarrow).")
+    return pa, pq
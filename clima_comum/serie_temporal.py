@@ -0,0 +1,346 @@
+# serie_temporal.py
+
+import csv
+import datetime
+import math
+
+from clima_comum.importacao_tardia import modulo_tardio
+
+np = modulo_tardio("numpy")
+
+# Métricas diárias, na ordem das colunas dos arrays
+METRICAS_DIARIAS = ("minima", "maxima", "media", "chuva", "umidade")
+
+NOMES_MESES = (
+    "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
+)
+
+# Chuva diária (mm) a partir da qual o dia conta como chuvoso
+LIMIAR_DIA_CHUVOSO = 1.0
+
+_CHUVA = METRICAS_DIARIAS.index("chuva")
+_CAPACIDADE_INICIAL = 366
+
+
+class SerieDiaria:
+    """
+    Série de observações diárias de uma estação, guardada em arrays compactos.
+
+    Os dias ficam em um array int32 (ordinal da data) e as métricas em um
+    array float32 (dias x METRICAS_DIARIAS), ambos com crescimento por
+    duplicação. Cada observação acrescentada atualiza na hora os acumuladores
+    do seu mês (soma, contagem, mínimo, máximo e dias chuvosos), de modo que
+    os resumos mensais e anuais nunca precisam reler o histórico; eles são
+    montados sob demanda a partir dos acumuladores e guardados até a próxima
+    observação.
+
+    Valores ausentes podem ser informados como NaN e são ignorados nos resumos.
+    """
+
+    __slots__ = ("estacao", "_dias", "_valores", "_n", "_indice_meses", "_periodos",
+                 "_soma", "_contagem", "_minimo", "_maximo", "_dias_chuvosos",
+                 "_n_meses", "_cache")
+
+    def __init__(self, estacao=None):
+        """
+        Args:
+            estacao (str, optional): O nome da estação.
+        """
+        self.estacao = estacao
+        self._dias = np.empty(_CAPACIDADE_INICIAL, dtype=np.int32)
+        self._valores = np.empty((_CAPACIDADE_INICIAL, len(METRICAS_DIARIAS)), dtype=np.float32)
+        self._n = 0
+
+        # Acumuladores mensais; _indice_meses: {ano * 12 + mes - 1: linha}
+        self._indice_meses = {}
+        self._periodos = np.empty(16, dtype=np.int32)
+        n_metricas = len(METRICAS_DIARIAS)
+        self._soma = np.zeros((16, n_metricas))
+        self._contagem = np.zeros((16, n_metricas), dtype=np.int64)
+        self._minimo = np.full((16, n_metricas), np.inf)
+        self._maximo = np.full((16, n_metricas), -np.inf)
+        self._dias_chuvosos = np.zeros(16, dtype=np.int64)
+        self._n_meses = 0
+        self._cache = {}
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def dias(self):
+        """numpy.ndarray: As datas das observações (datetime64[D])."""
+        return (self._dias[:self._n].astype(np.int64) - _ORDINAL_EPOCA).astype("datetime64[D]")
+
+    @property
+    def valores(self):
+        """numpy.ndarray: As observações (dias x METRICAS_DIARIAS), somente leitura."""
+        visao = self._valores[:self._n]
+        visao.flags.writeable = False
+        return visao
+
+    def acrescentar(self, dia, minima=math.nan, maxima=math.nan, media=math.nan, chuva=math.nan,
+                    umidade=math.nan):
+        """
+        Acrescenta a observação de um dia, posterior a todas as já existentes.
+
+        Args:
+            dia (datetime.date | str): A data (objeto date ou "AAAA-MM-DD").
+            minima, maxima, media (float): As temperaturas do dia (°C).
+            chuva (float): A chuva do dia (mm).
+            umidade (float): A umidade relativa média do dia (0 a 1).
+
+        Raises:
+            ValueError: Se o dia não for posterior à última observação.
+        """
+        self.acrescentar_lote([dia], [[minima, maxima, media, chuva, umidade]])
+
+    def acrescentar_lote(self, dias, valores):
+        """
+        Acrescenta várias observações de uma vez (operações vetorizadas).
+
+        Args:
+            dias (sequence): As datas, em ordem estritamente crescente e
+                             posteriores à última observação existente.
+            valores (array-like): Array (len(dias) x METRICAS_DIARIAS).
+
+        Raises:
+            ValueError: Se as datas não estiverem em ordem ou se o shape dos
+                        valores não corresponder.
+        """
+        ordinais = _para_ordinais(dias)
+        valores = np.asarray(valores, dtype=np.float32).reshape(len(ordinais), len(METRICAS_DIARIAS))
+        if len(ordinais) == 0:
+            return
+        if np.any(np.diff(ordinais) <= 0) or (self._n and ordinais[0] <= self._dias[self._n - 1]):
+            raise ValueError("As observações devem ser acrescentadas em ordem cronológica, sem datas repetidas.")
+
+        self._garantir_capacidade(self._n + len(ordinais))
+        self._dias[self._n:self._n + len(ordinais)] = ordinais
+        self._valores[self._n:self._n + len(ordinais)] = valores
+        self._n += len(ordinais)
+        self._atualizar_acumuladores(ordinais, valores.astype(np.float64))
+        self._cache.clear()
+
+    def resumo_mensal(self):
+        """
+        Retorna o resumo de cada mês com observações.
+
+        Returns:
+            dict: Dicionário com as chaves:
+                  "periodos" (array (n, 2) com [ano, mes]),
+                  "media", "minimo", "maximo", "soma" (arrays n x METRICAS_DIARIAS),
+                  "contagem" (dias com valor, n x METRICAS_DIARIAS) e
+                  "dias_chuvosos" (array n).
+        """
+        if "mensal" not in self._cache:
+            n = self._n_meses
+            ordem = np.argsort(self._periodos[:n], kind="stable")
+            chaves = self._periodos[:n][ordem].astype(np.int64)
+            self._cache["mensal"] = _montar_resumo(
+                np.column_stack([chaves // 12, chaves % 12 + 1]),
+                self._soma[:n][ordem], self._contagem[:n][ordem],
+                self._minimo[:n][ordem], self._maximo[:n][ordem], self._dias_chuvosos[:n][ordem]
+            )
+        return self._cache["mensal"]
+
+    def resumo_anual(self):
+        """
+        Retorna o resumo de cada ano, combinando os acumuladores mensais.
+
+        Returns:
+            dict: As mesmas chaves de resumo_mensal, com "anos" (array n) no
+                  lugar de "periodos".
+        """
+        if "anual" not in self._cache:
+            mensal = self.resumo_mensal()
+            anos, inicio = np.unique(mensal["periodos"][:, 0], return_index=True)
+            if len(anos) == 0:
+                resumo = {chave: valor.copy() for chave, valor in mensal.items() if chave != "periodos"}
+            else:
+                com_dados = mensal["contagem"] > 0
+                resumo = _montar_resumo(
+                    None,
+                    np.add.reduceat(np.nan_to_num(mensal["soma"]), inicio),
+                    np.add.reduceat(mensal["contagem"], inicio),
+                    np.minimum.reduceat(np.where(com_dados, mensal["minimo"], np.inf), inicio),
+                    np.maximum.reduceat(np.where(com_dados, mensal["maximo"], -np.inf), inicio),
+                    np.add.reduceat(mensal["dias_chuvosos"], inicio)
+                )
+                del resumo["periodos"]
+            resumo["anos"] = anos
+            self._cache["anual"] = resumo
+        return self._cache["anual"]
+
+    def tabela_temperaturas(self, ano):
+        """
+        Monta a tabela mensal (12 x [mínima, máxima, média]) de um ano.
+
+        É o formato usado por operacoes_lib e visualizacao_lib (ex.:
+        plotar_grafico_temperaturas_cidade). Os valores são as médias mensais
+        das temperaturas diárias; meses sem dados ficam com NaN.
+
+        Args:
+            ano (int): O ano desejado.
+
+        Returns:
+            numpy.ndarray: Array float64 com shape (12, 3).
+        """
+        tabela = np.full((12, 3), np.nan)
+        mensal = self.resumo_mensal()
+        do_ano = mensal["periodos"][:, 0] == ano
+        colunas = [METRICAS_DIARIAS.index(m) for m in ("minima", "maxima", "media")]
+        tabela[mensal["periodos"][do_ano, 1] - 1] = mensal["media"][do_ano][:, colunas]
+        return tabela
+
+    def dataframe_mensal(self, ano=None):
+        """
+        Monta um DataFrame mensal no formato de analise_lib (meses x colunas).
+
+        As colunas seguem analise_lib.COLUNAS_CLIMATICAS: médias mensais das
+        temperaturas diárias, chuva acumulada no mês, umidade média e dias
+        chuvosos. O resultado pode ser usado diretamente em
+        realizar_analise_detalhada_clima, empilhar_cidades etc.
+
+        Args:
+            ano (int, optional): Restringe a um ano (índice com os nomes dos
+                                 meses). Sem ano, todos os meses da série são
+                                 incluídos, com índice "Mês AAAA".
+
+        Returns:
+            pd.DataFrame: O resumo mensal.
+        """
+        import pandas as pd
+
+        mensal = self.resumo_mensal()
+        selecao = slice(None) if ano is None else mensal["periodos"][:, 0] == ano
+        periodos = mensal["periodos"][selecao]
+        media = mensal["media"][selecao]
+        indices = {m: METRICAS_DIARIAS.index(m) for m in METRICAS_DIARIAS}
+
+        if ano is None:
+            rotulos = [f"{NOMES_MESES[mes - 1]} {a}" for a, mes in periodos]
+        else:
+            rotulos = [NOMES_MESES[mes - 1] for mes in periodos[:, 1]]
+        return pd.DataFrame({
+            "Media_Temp_C": media[:, indices["media"]],
+            "Minima_Temp_C": media[:, indices["minima"]],
+            "Maxima_Temp_C": media[:, indices["maxima"]],
+            "Chuva (mm)": mensal["soma"][selecao][:, indices["chuva"]],
+            "Umidade(%)": media[:, indices["umidade"]],
+            "Dias chuvosos (d)": mensal["dias_chuvosos"][selecao].astype(np.float64),
+        }, index=pd.Index(rotulos))
+
+    def _garantir_capacidade(self, necessario):
+        capacidade = len(self._dias)
+        if necessario <= capacidade:
+            return
+        while capacidade < necessario:
+            capacidade *= 2
+        self._dias = _redimensionar(self._dias, capacidade)
+        self._valores = _redimensionar(self._valores, capacidade)
+
+    def _atualizar_acumuladores(self, ordinais, valores):
+        datas = (ordinais.astype(np.int64) - _ORDINAL_EPOCA).astype("datetime64[D]")
+        meses_absolutos = datas.astype("datetime64[M]").astype(np.int64)  # meses desde 1970-01
+        chaves = meses_absolutos + 1970 * 12
+
+        # Uma consulta ao dicionário por mês distinto do lote, não por dia
+        unicas, inversos = np.unique(chaves, return_inverse=True)
+        mapa = np.empty(len(unicas), dtype=np.int64)
+        for posicao, chave in enumerate(unicas.tolist()):
+            linha = self._indice_meses.get(chave)
+            mapa[posicao] = self._novo_mes(chave) if linha is None else linha
+        linhas = mapa[inversos]
+
+        validos = ~np.isnan(valores)
+        np.add.at(self._soma, linhas, np.where(validos, valores, 0.0))
+        np.add.at(self._contagem, linhas, validos)
+        np.minimum.at(self._minimo, linhas, np.where(validos, valores, np.inf))
+        np.maximum.at(self._maximo, linhas, np.where(validos, valores, -np.inf))
+        np.add.at(self._dias_chuvosos, linhas, valores[:, _CHUVA] >= LIMIAR_DIA_CHUVOSO)
+
+    def _novo_mes(self, chave):
+        if self._n_meses == len(self._periodos):
+            capacidade = 2 * len(self._periodos)
+            self._periodos = _redimensionar(self._periodos, capacidade)
+            self._soma = _redimensionar(self._soma, capacidade, 0.0)
+            self._contagem = _redimensionar(self._contagem, capacidade, 0)
+            self._minimo = _redimensionar(self._minimo, capacidade, np.inf)
+            self._maximo = _redimensionar(self._maximo, capacidade, -np.inf)
+            self._dias_chuvosos = _redimensionar(self._dias_chuvosos, capacidade, 0)
+        linha = self._n_meses
+        self._periodos[linha] = chave
+        self._indice_meses[chave] = linha
+        self._n_meses += 1
+        return linha
+
+
+def ler_serie_diaria_csv(caminho, estacao=None, tamanho_lote=100_000):
+    """
+    Lê observações diárias de um CSV com cabeçalho.
+
+    O arquivo deve ter a coluna "data" (AAAA-MM-DD) e as colunas de
+    METRICAS_DIARIAS que existirem (as ausentes ficam como NaN), em ordem
+    cronológica. As linhas são acrescentadas em lotes.
+
+    Args:
+        caminho (str): O caminho do arquivo .csv.
+        estacao (str, optional): O nome da estação.
+        tamanho_lote (int): Quantidade de linhas acrescentadas por vez.
+
+    Returns:
+        SerieDiaria: A série lida.
+    """
+    serie = SerieDiaria(estacao)
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        leitor = csv.DictReader(arquivo)
+        dias, valores = [], []
+        for linha in leitor:
+            dias.append(linha["data"])
+            valores.append([_numero(linha.get(metrica)) for metrica in METRICAS_DIARIAS])
+            if len(dias) == tamanho_lote:
+                serie.acrescentar_lote(dias, valores)
+                dias, valores = [], []
+        serie.acrescentar_lote(dias, valores)
+    return serie
+
+
+# Ordinal (datetime.date.toordinal) de 1970-01-01, a origem do datetime64
+_ORDINAL_EPOCA = datetime.date(1970, 1, 1).toordinal()
+
+
+def _para_ordinais(dias):
+    datas = np.asarray(
+        [d if isinstance(d, (str, np.datetime64)) else datetime.date(d.year, d.month, d.day).isoformat()
+         for d in dias],
+        dtype="datetime64[D]"
+    )
+    return (datas.astype(np.int64) + _ORDINAL_EPOCA).astype(np.int32)
+
+
+def _montar_resumo(periodos, soma, contagem, minimo, maximo, dias_chuvosos):
+    sem_dados = contagem == 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        media = soma / contagem
+    return {
+        "periodos": periodos,
+        "media": media,
+        "minimo": np.where(sem_dados, np.nan, minimo),
+        "maximo": np.where(sem_dados, np.nan, maximo),
+        "soma": np.where(sem_dados, np.nan, soma),
+        "contagem": contagem,
+        "dias_chuvosos": dias_chuvosos,
+    }
+
+
+def _redimensionar(array, capacidade, preenchimento=None):
+    novo = np.empty((capacidade,) + array.shape[1:], dtype=array.dtype)
+    novo[:len(array)] = array
+    if preenchimento is not None:
+        novo[len(array):] = preenchimento
+    return novo
+
+
+def _numero(texto):
+    return float(texto) if texto not in (None, "") else np.nan